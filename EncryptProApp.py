@@ -4,12 +4,21 @@ import traceback
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import logging
-from algorithms import CaesarCipher, Rot13Cipher, PlayfairCipher, RailFenceCipher, RowTranspositionCipher, HillCipher, SubstitutionCipher, VigenereCipher, AESCipher, ChrisWayV1Cipher, ChrisWayV2Cipher
+from algorithms import CaesarCipher, Rot13Cipher, PlayfairCipher, RailFenceCipher, RowTranspositionCipher, HillCipher, SubstitutionCipher, VigenereCipher, AESCipher, ChrisWayV1Cipher, ChrisWayV2Cipher, ParallelCipher
+from aes_backend import AESBackend
+from aes_files import AESFileCipher
+from classical_files import ClassicalFileCipher
+from byte_ciphers import BYTE_CIPHERS, BYTE_FILE_MAGIC
+from alphabets import ALPHABETS, LATIN
 import random
 import string
 import secrets
 import math
 import base64
+import contextlib
+import itertools
+import mmap
+import numpy as np
 
 # Helper to load icons with fallback
 ICON_COLORS = {
@@ -72,6 +81,47 @@ def load_icon(name, size=24, force_letter=False):
     painter.end()
     return QtGui.QIcon(pixmap)
 
+# Input piece size when streaming a file through a cipher
+FILE_CHUNK_SIZE = 1 << 20
+
+def iter_chunks(content, chunk_size=FILE_CHUNK_SIZE):
+    """Consecutive slices of a str or bytes-like object."""
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+
+@contextlib.contextmanager
+def map_input_file(path):
+    """Read-only view of a file's bytes (an mmap, or b'' for an empty file)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield data
+    finally:
+        try:
+            data.close()
+        except BufferError:
+            # An exception traceback still holds a view; the map is released with it
+            pass
+
+# Algorithms with a bytes-native (mod 256) file mode, see byte_ciphers.py
+BYTE_MODE_ALGORITHMS = ("Caesar Cipher", "Vigenère Cipher", "Substitution Cipher",
+                        "Rail Fence", "Row Transposition", "Hill Cipher")
+
+# Algorithms that can use another alphabet than A-Z, see alphabets.py
+ALPHABET_ALGORITHMS = ("Caesar Cipher", "Vigenère Cipher", "Substitution Cipher")
+
+def text_file_content(data):
+    """
+    File content for the classical ciphers: the mapped bytes themselves when
+    they are ASCII, otherwise the UTF-8 decoded str (raises UnicodeDecodeError).
+    """
+    if len(data) == 0 or np.frombuffer(data, dtype=np.uint8).max() < 0x80:
+        return data
+    return str(data, 'utf-8')
+
 # ----------------------------------------------------------------------
 # UI Definition Class (Generated from your XML)
 # ----------------------------------------------------------------------
@@ -620,6 +670,65 @@ QPushButton.panel_action:hover {
 
         self.verticalLayout_2.addLayout(self.key_buttons_layout)
 
+        # AES options (shown only while AES is selected)
+        self.aes_options_widget = QtWidgets.QWidget(self.sidebar)
+        self.aes_options_widget.setObjectName("aes_options_widget")
+        self.aesOptionsLayout = QtWidgets.QVBoxLayout(self.aes_options_widget)
+        self.aesOptionsLayout.setContentsMargins(0, 10, 0, 0)
+        self.aesOptionsLayout.setSpacing(6)
+        self.aes_options_label = QtWidgets.QLabel(self.aes_options_widget)
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI")
+        font.setPointSize(10)
+        font.setBold(True)
+        self.aes_options_label.setFont(font)
+        self.aes_options_label.setText("AES MODE / OUTPUT")
+        self.aes_options_label.setObjectName("aes_options_label")
+        self.aesOptionsLayout.addWidget(self.aes_options_label)
+        self.aes_combos_layout = QtWidgets.QHBoxLayout()
+        self.aes_combos_layout.setObjectName("aes_combos_layout")
+        self.aes_mode_combo = QtWidgets.QComboBox(self.aes_options_widget)
+        self.aes_mode_combo.setObjectName("aes_mode_combo")
+        self.aes_mode_combo.addItems(["CBC", "GCM", "CTR"])
+        self.aes_mode_combo.setToolTip("AES mode for encryption (decryption reads it from the ciphertext)")
+        self.aes_combos_layout.addWidget(self.aes_mode_combo)
+        self.aes_format_combo = QtWidgets.QComboBox(self.aes_options_widget)
+        self.aes_format_combo.setObjectName("aes_format_combo")
+        self.aes_format_combo.addItems(["hex", "base64"])
+        self.aes_format_combo.setToolTip("Text encoding of the ciphertext")
+        self.aes_combos_layout.addWidget(self.aes_format_combo)
+        self.aesOptionsLayout.addLayout(self.aes_combos_layout)
+        self.aes_benchmark_btn = QtWidgets.QPushButton(self.aes_options_widget)
+        self.aes_benchmark_btn.setText("Benchmark Modes")
+        self.aes_benchmark_btn.setObjectName("aes_benchmark_btn")
+        self.aes_benchmark_btn.setToolTip("Measure AES speed (MB/s) per mode on this machine")
+        self.aesOptionsLayout.addWidget(self.aes_benchmark_btn)
+        self.aes_options_widget.setVisible(False)
+        self.verticalLayout_2.addWidget(self.aes_options_widget)
+
+        # Alphabet for Caesar / Vigenère / Substitution (shown only for those)
+        self.alphabet_options_widget = QtWidgets.QWidget(self.sidebar)
+        self.alphabet_options_widget.setObjectName("alphabet_options_widget")
+        self.alphabetOptionsLayout = QtWidgets.QVBoxLayout(self.alphabet_options_widget)
+        self.alphabetOptionsLayout.setContentsMargins(0, 10, 0, 0)
+        self.alphabetOptionsLayout.setSpacing(6)
+        self.alphabet_label = QtWidgets.QLabel(self.alphabet_options_widget)
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI")
+        font.setPointSize(10)
+        font.setBold(True)
+        self.alphabet_label.setFont(font)
+        self.alphabet_label.setText("ALPHABET")
+        self.alphabet_label.setObjectName("alphabet_label")
+        self.alphabetOptionsLayout.addWidget(self.alphabet_label)
+        self.alphabet_combo = QtWidgets.QComboBox(self.alphabet_options_widget)
+        self.alphabet_combo.setObjectName("alphabet_combo")
+        self.alphabet_combo.addItems(list(ALPHABETS))
+        self.alphabet_combo.setToolTip("Letters the cipher shifts within; other characters pass through unchanged")
+        self.alphabetOptionsLayout.addWidget(self.alphabet_combo)
+        self.alphabet_options_widget.setVisible(False)
+        self.verticalLayout_2.addWidget(self.alphabet_options_widget)
+
         # Add spacing before operation mode
         self.verticalLayout_2.addSpacing(20)
 
@@ -913,6 +1022,22 @@ margin: 15px 0;
         self.file_buttons_layout.addWidget(self.select_folder_btn)
         spacerItem4 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.file_buttons_layout.addItem(spacerItem4)
+        self.file_aes_mode_label = QtWidgets.QLabel(self.file_operations_panel)
+        self.file_aes_mode_label.setObjectName("file_aes_mode_label")
+        self.file_buttons_layout.addWidget(self.file_aes_mode_label)
+        self.file_aes_mode_combo = QtWidgets.QComboBox(self.file_operations_panel)
+        self.file_aes_mode_combo.addItems(["GCM", "CTR"])
+        self.file_aes_mode_combo.setToolTip("AES mode for encrypting files (GCM also authenticates them)")
+        self.file_aes_mode_combo.setObjectName("file_aes_mode_combo")
+        self.file_aes_mode_combo.setEnabled(False)
+        self.file_buttons_layout.addWidget(self.file_aes_mode_combo)
+        self.file_binary_mode_checkbox = QtWidgets.QCheckBox(self.file_operations_panel)
+        self.file_binary_mode_checkbox.setToolTip("Encrypt files as raw bytes (mod 256) instead of text; "
+                                                  "needed for binary files. Files encrypted this way are "
+                                                  "marked and always decrypted as bytes.")
+        self.file_binary_mode_checkbox.setObjectName("file_binary_mode_checkbox")
+        self.file_binary_mode_checkbox.setEnabled(False)
+        self.file_buttons_layout.addWidget(self.file_binary_mode_checkbox)
         self.batch_mode_label = QtWidgets.QLabel(self.file_operations_panel)
         self.batch_mode_label.setObjectName("batch_mode_label")
         self.file_buttons_layout.addWidget(self.batch_mode_label)
@@ -1102,6 +1227,8 @@ margin: 15px 0;
         self.file_op_title.setText(_translate("MainWindow", "File Operations"))
         self.select_files_btn.setText(_translate("MainWindow", " Select Files"))
         self.select_folder_btn.setText(_translate("MainWindow", " Select Folder"))
+        self.file_aes_mode_label.setText(_translate("MainWindow", "AES Mode:"))
+        self.file_binary_mode_checkbox.setText(_translate("MainWindow", "Binary Mode"))
         self.batch_mode_label.setText(_translate("MainWindow", "Batch Mode:"))
         self.clear_files_btn.setText(_translate("MainWindow", " Clear Files")) # Added for clear_files_btn
         self.output_dir_label.setText(_translate("MainWindow", "Output Directory:")) # Added for output_dir_label
@@ -1327,6 +1454,8 @@ class EncryptProApp(QtWidgets.QMainWindow):
 
         # Connect algorithm dropdown change event
         self.ui.algorithm_dropdown.currentIndexChanged.connect(self.algorithm_changed)
+        self.ui.aes_benchmark_btn.clicked.connect(self.run_aes_benchmark)
+        self.ui.alphabet_combo.currentIndexChanged.connect(self.algorithm_changed)
 
         # Connect toolbar buttons
         self.ui.save_result_btn.clicked.connect(self.save_output_file)
@@ -1399,7 +1528,14 @@ class EncryptProApp(QtWidgets.QMainWindow):
             self.ui.generate_key_btn_sidebar.setEnabled(True)
             
             # Update key requirements based on algorithm
-            if algo_name == "Caesar Cipher":
+            alphabet = self.selected_alphabet(algo_name)
+            if alphabet is not None and algo_name == "Caesar Cipher":
+                self.ui.key_requirements_label.setText(f"Key must be an integer from 1 to {alphabet.size - 1}.")
+            elif alphabet is not None and algo_name == "Substitution Cipher":
+                self.ui.key_requirements_label.setText(f"Key must be all {alphabet.size} letters of the {alphabet.name} alphabet without repetition.")
+            elif alphabet is not None and algo_name == "Vigenère Cipher":
+                self.ui.key_requirements_label.setText(f"Key must be letters of the {alphabet.name} alphabet.")
+            elif algo_name == "Caesar Cipher":
                 self.ui.key_requirements_label.setText("Key must be an integer from 1 to 25.")
             elif algo_name == "Playfair Cipher":
                 self.ui.key_requirements_label.setText("Key must be letters only. Creates a 5×5 matrix (I/J combined).")
@@ -1422,17 +1558,54 @@ class EncryptProApp(QtWidgets.QMainWindow):
                     self.ui.key_input_sidebar.setPlaceholderText("Enter private key (min 3 chars)")
                     self.ui.key_requirements_label.setText("Private Key: Use alphabetic characters only (min 3 chars). Click 'Generate' to create a key pair.")
             elif algo_name == "AES":
-                self.ui.key_requirements_label.setText("Key: 16/24/32 chars or hex (32/48/64 hex digits, can use '0x' prefix). Using CBC mode with PKCS5Padding and hex output.")
+                self.ui.key_requirements_label.setText("Key: 16/24/32 chars or hex (32/48/64 hex digits, can use '0x' prefix). Pick the mode and output encoding below the key; decryption detects them.")
             else:
                 self.ui.key_requirements_label.setText("Enter an appropriate key for the selected algorithm.")
                 
+        self.ui.aes_options_widget.setVisible(algo_name == "AES")
+        self.ui.alphabet_options_widget.setVisible(algo_name in ALPHABET_ALGORITHMS)
+        self.ui.file_aes_mode_combo.setEnabled(algo_name == "AES")
+        self.ui.file_binary_mode_checkbox.setEnabled(algo_name in BYTE_MODE_ALGORITHMS)
+
         # Clear any previous validation messages when changing algorithms
         self.ui.status_label.setText(f"{algo_name} selected. Ready for operation.")
+        if algo_name == "AES":
+            try:
+                self.ui.status_label.setText(f"AES selected ({AESBackend.describe()}). Ready for operation.")
+            except ImportError as e:
+                self.ui.status_label.setText(f"AES unavailable: {e}")
         
         # Update operation progress bar to show ready state
         self.ui.operation_progress.setRange(0, 100)
         self.ui.operation_progress.setValue(0)
 
+    def selected_alphabet(self, algo_name):
+        """The Alphabet chosen for algo_name, or None for the built-in A-Z ciphers."""
+        if algo_name not in ALPHABET_ALGORITHMS:
+            return None
+        alphabet = ALPHABETS[self.ui.alphabet_combo.currentText()]
+        return None if alphabet is LATIN else alphabet
+
+    def run_aes_benchmark(self):
+        """Measure AES throughput per mode on this machine and show it."""
+        self.ui.status_label.setText("Measuring AES speed per mode...")
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            rates = AESBackend.throughput()
+            backends = AESBackend.describe()
+        except ImportError as e:
+            QtWidgets.QMessageBox.warning(self, "AES Unavailable", str(e))
+            self.ui.status_label.setText(f"AES unavailable: {e}")
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        lines = "\n".join(f"{mode}: {rate:,.0f} MB/s" for mode, rate in rates.items())
+        QtWidgets.QMessageBox.information(
+            self, "AES Benchmark",
+            f"Encryption speed on this machine (1 MiB messages):\n\n{lines}\n\n{backends}")
+        fastest = max(rates, key=rates.get)
+        self.ui.status_label.setText(f"AES benchmark: {fastest} is fastest at {rates[fastest]:,.0f} MB/s.")
+
     def toggle_password_visibility_sidebar(self, checked):
         """Toggle visibility of password in sidebar key input"""
         if checked:
@@ -1557,14 +1730,18 @@ class EncryptProApp(QtWidgets.QMainWindow):
                 if algo_name == "ROT13":
                     result = cipher_class.encrypt(input_text)
                 elif algo_name == "AES":
-                    # For AES, use CBC mode and hex output format
-                    aes_mode = "CBC"  # Use CBC mode as requested
-                    result = cipher_class.encrypt(input_text, key, aes_mode, "hex")
+                    aes_mode = self.ui.aes_mode_combo.currentText()
+                    output_format = self.ui.aes_format_combo.currentText()
+                    result = cipher_class.encrypt(input_text, key, aes_mode, output_format)
+                elif algo_name in ALPHABET_ALGORITHMS:
+                    result = cipher_class.encrypt(input_text, key, alphabet=self.selected_alphabet(algo_name))
                 else:
                     result = cipher_class.encrypt(input_text, key)
             else:
                 if algo_name == "ROT13":
                     result = cipher_class.decrypt(input_text)
+                elif algo_name in ALPHABET_ALGORITHMS:
+                    result = cipher_class.decrypt(input_text, key, alphabet=self.selected_alphabet(algo_name))
                 else:
                     result = cipher_class.decrypt(input_text, key)
             self.ui.output_text_edit.setText(result)
@@ -1602,6 +1779,12 @@ class EncryptProApp(QtWidgets.QMainWindow):
         # Common validations
         if not input_text:
             return "Input text cannot be empty."
+
+        alphabet = self.selected_alphabet(algo_name)
+        if alphabet is not None:
+            if not alphabet.is_text(input_text):
+                return f"{algo_name} requires text with letters of the {alphabet.name} alphabet and spaces only."
+            return self.validate_alphabet_key(algo_name, alphabet, key)
             
         # Algorithm-specific validations
         if algo_name == "Caesar Cipher":
@@ -2085,7 +2268,7 @@ class EncryptProApp(QtWidgets.QMainWindow):
         </ul>
 
         <p>For more detailed information about specific algorithms, consult external cryptographic resources.</p>
-        <p>File operations allow batch processing of files. AES is recommended for binary files.</p>
+        <p>File operations allow batch processing of files. Binary files work with AES and, in Binary Mode (mod 256), with Caesar, Vigenère, Substitution, Rail Fence, Row Transposition and Hill. Binary Mode output is marked, so decryption picks the byte variant by itself.</p>
         """
         msg_box = QtWidgets.QMessageBox(self)
         msg_box.setWindowTitle("EncryptPro Help")
@@ -2422,8 +2605,9 @@ class EncryptProApp(QtWidgets.QMainWindow):
             self.ui.key_input_sidebar.clear()
             return
 
+        alphabet = self.selected_alphabet(algo_name) or LATIN
         if algo_name == "Caesar Cipher":
-            key = str(random.randint(1, 25))
+            key = str(random.randint(1, alphabet.size - 1))
         elif algo_name == "Playfair Cipher":
             # Generate a keyword without repeating letters, then pad if necessary
             alphabet = list(string.ascii_uppercase.replace('J', ''))  # Playfair typically omits J or treats I/J as one
@@ -2454,12 +2638,12 @@ class EncryptProApp(QtWidgets.QMainWindow):
             else:  # Placeholder for 3x3, very hard to generate random invertible
                 key = "6,24,1,13,16,10,20,17,15"  # Example known invertible 3x3
         elif algo_name == "Substitution Cipher":
-            alphabet = list(string.ascii_uppercase)
-            random.shuffle(alphabet)
-            key = ''.join(alphabet)
+            letters = list(alphabet.letters)
+            random.shuffle(letters)
+            key = ''.join(letters)
         elif algo_name == "Vigenère Cipher":
             length = random.randint(5, 15)
-            key = ''.join(secrets.choice(string.ascii_uppercase) for _ in range(length))
+            key = ''.join(secrets.choice(alphabet.letters) for _ in range(length))
         elif algo_name == "Chris Way Cipher V1":
             QtWidgets.QMessageBox.information(self, "Chris Way Cipher V1", 
                                             "Chris Way Cipher V1 does not require a key. It uses character positions for encryption.")
@@ -2642,6 +2826,13 @@ class EncryptProApp(QtWidgets.QMainWindow):
             
         # Get operation mode
         mode = "Encryption" if self.ui.encrypt_radio.isChecked() else "Decryption"
+
+        # Byte-mode (mod 256) variant for binary files, if the algorithm has one. It is
+        # used to encrypt when Binary Mode is checked, and to decrypt files that start
+        # with BYTE_FILE_MAGIC
+        byte_cipher = BYTE_CIPHERS.get(cipher_class)
+        binary_mode = byte_cipher is not None and self.ui.file_binary_mode_checkbox.isChecked()
+        alphabet = self.selected_alphabet(algo_name)
         
         # Process each file
         processed_files = 0
@@ -2669,48 +2860,6 @@ class EncryptProApp(QtWidgets.QMainWindow):
                     processed_files += 1
                     continue
                 
-                # For other algorithms, process as text
-                try:
-                    # Try to read file as text first
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        content = file.read()
-                except UnicodeDecodeError:
-                    # If it fails, warn that only AES supports binary data properly
-                    QtWidgets.QMessageBox.warning(
-                        self,
-                        "Binary File Detected",
-                        f"The file {file_name} appears to be binary. Only AES supports binary files properly."
-                    )
-                    errors += 1
-                    continue
-                
-                # Validate file content for the specific algorithm
-                content_error = self.validate_text_content(algo_name, content)
-                if content_error:
-                    QtWidgets.QMessageBox.warning(
-                        self,
-                        "File Content Error",
-                        f"File '{file_name}': {content_error}"
-                    )
-                    errors += 1
-                    continue
-                
-                # Process text content
-                if mode == "Encryption":
-                    if algo_name == "ROT13":
-                        result = cipher_class.encrypt(content)
-                    elif algo_name == "Chris Way Cipher V1":
-                        result = cipher_class.encrypt(content)
-                    else:
-                        result = cipher_class.encrypt(content, key)
-                else:  # Decryption
-                    if algo_name == "ROT13":
-                        result = cipher_class.decrypt(content)
-                    elif algo_name == "Chris Way Cipher V1":
-                        result = cipher_class.decrypt(content)
-                    else:
-                        result = cipher_class.decrypt(content, key)
-                
                 # Create output file name with appropriate extension
                 if algo_name.startswith("Chris Way Cipher"):
                     extension = ".cw1" if algo_name == "Chris Way Cipher V1" else ".cw2"
@@ -2719,10 +2868,97 @@ class EncryptProApp(QtWidgets.QMainWindow):
                     extension = ".enc" if mode == "Encryption" else ".dec"
                 
                 output_file = os.path.join(output_dir, f"{file_name}{extension}")
-                
-                # Write result to output file
-                with open(output_file, 'w', encoding='utf-8') as file:
-                    file.write(result)
+
+                # For other algorithms, map the file instead of reading it into a string
+                with map_input_file(file_path) as data:
+                    if mode == "Encryption":
+                        use_bytes = binary_mode
+                    else:
+                        use_bytes = data[:len(BYTE_FILE_MAGIC)] == BYTE_FILE_MAGIC
+                        if use_bytes and byte_cipher is None:
+                            QtWidgets.QMessageBox.warning(
+                                self,
+                                "Binary Mode File",
+                                f"The file {file_name} was encrypted in Binary Mode, which {algo_name} "
+                                f"does not have. Decrypt it with the cipher that encrypted it."
+                            )
+                            errors += 1
+                            continue
+                    if use_bytes:
+                        content = data if mode == "Encryption" else memoryview(data)[len(BYTE_FILE_MAGIC):]
+                    else:
+                        try:
+                            content = text_file_content(data)
+                        except UnicodeDecodeError:
+                            if byte_cipher is None:
+                                hint = (f"Only AES and the Binary Mode ciphers "
+                                        f"({', '.join(BYTE_MODE_ALGORITHMS)}) support binary files.")
+                            elif mode == "Encryption":
+                                hint = "Check Binary Mode to encrypt it as raw bytes."
+                            else:
+                                hint = "It was not encrypted in Binary Mode, so it cannot be decrypted as bytes."
+                            QtWidgets.QMessageBox.warning(
+                                self,
+                                "Binary File Detected",
+                                f"The file {file_name} appears to be binary. {hint}"
+                            )
+                            errors += 1
+                            continue
+
+                    # Validate file content for the specific algorithm (any bytes are valid in byte mode)
+                    content_error = None if use_bytes else self.validate_text_content(algo_name, content)
+                    if content_error:
+                        QtWidgets.QMessageBox.warning(
+                            self,
+                            "File Content Error",
+                            f"File '{file_name}': {content_error}"
+                        )
+                        errors += 1
+                        continue
+
+                    # Process the content (ASCII files stay bytes end to end)
+                    cipher_key = None if algo_name in ("ROT13", "Chris Way Cipher V1") else key
+                    if use_bytes and mode == "Encryption":
+                        # The marker goes first so decryption knows the file is bytes
+                        outputs = itertools.chain([BYTE_FILE_MAGIC],
+                                                  byte_cipher.encrypt_stream(iter_chunks(content), key))
+                    elif use_bytes:
+                        outputs = byte_cipher.decrypt_stream(iter_chunks(content), key)
+                    elif alphabet is not None:
+                        # Custom alphabets stream through their own lookup tables
+                        stream = cipher_class.encrypt_stream if mode == "Encryption" else cipher_class.decrypt_stream
+                        outputs = stream(iter_chunks(content), cipher_key, alphabet)
+                    elif ClassicalFileCipher.supports(cipher_class) and not isinstance(content, str):
+                        # Whole-message permutations run out of core, between mapped files
+                        run = ClassicalFileCipher.encrypt_file if mode == "Encryption" else ClassicalFileCipher.decrypt_file
+                        run(cipher_class, file_path, output_file, cipher_key)
+                        outputs = None
+                    elif ParallelCipher.supports(cipher_class):
+                        # Large inputs are split into chunks and run on all cores
+                        run = ParallelCipher.encrypt if mode == "Encryption" else ParallelCipher.decrypt
+                        outputs = [run(cipher_class, content, cipher_key)]
+                    else:
+                        # Stream the file so the output is written as it is produced
+                        stream = cipher_class.encrypt_stream if mode == "Encryption" else cipher_class.decrypt_stream
+                        outputs = stream(iter_chunks(content), cipher_key)
+
+                    # Write result to output file (the out-of-core engines already did)
+                    if outputs is not None:
+                        try:
+                            if isinstance(content, str):
+                                with open(output_file, 'w', encoding='utf-8') as file:
+                                    for output in outputs:
+                                        file.write(output)
+                            else:
+                                with open(output_file, 'wb') as file:
+                                    for output in outputs:
+                                        file.write(output)
+                        except Exception:
+                            # Don't leave a partial output file behind
+                            if os.path.exists(output_file):
+                                os.remove(output_file)
+                            raise
+                    del content, outputs
                     
                 processed_files += 1
                 
@@ -2758,6 +2994,10 @@ class EncryptProApp(QtWidgets.QMainWindow):
     
     def validate_key_only(self, algo_name, key):
         """Validate only the key for file operations."""
+        alphabet = self.selected_alphabet(algo_name)
+        if alphabet is not None:
+            return self.validate_alphabet_key(algo_name, alphabet, key)
+
         # Algorithm-specific key validations
         if algo_name == "Caesar Cipher":
             # Key: Integer (1-25)
@@ -2873,12 +3113,43 @@ class EncryptProApp(QtWidgets.QMainWindow):
         # Validation passed
         return None
 
+    def validate_alphabet_key(self, algo_name, alphabet, key):
+        """Key validation for Caesar / Substitution / Vigenère over a custom alphabet."""
+        if algo_name == "Caesar Cipher":
+            if not key or not key.isdigit():
+                return "Caesar Cipher requires a numeric key."
+            if not (1 <= int(key) < alphabet.size):
+                return f"Caesar Cipher key must be an integer between 1 and {alphabet.size - 1}."
+        else:
+            if not key:
+                return f"{algo_name} requires a key."
+            try:
+                positions = alphabet.positions(key)
+            except ValueError as e:
+                return f"{algo_name} key: {e}"
+            if algo_name == "Substitution Cipher" and sorted(positions.tolist()) != list(range(alphabet.size)):
+                return (f"Substitution Cipher key must contain all {alphabet.size} letters of the "
+                        f"{alphabet.name} alphabet with no repeats.")
+        return None
+
     def validate_text_content(self, algo_name, content):
         """Validate only the text content based on algorithm requirements for file operations."""
+        alphabet = self.selected_alphabet(algo_name)
+        if alphabet is not None:
+            if not alphabet.is_text(content):
+                return f"{algo_name} requires text with letters of the {alphabet.name} alphabet and spaces only."
+            return None
+
         # For algorithms that need specific content validation
         if algo_name in ["Caesar Cipher", "Substitution Cipher", "Playfair Cipher", "Hill Cipher", "Vigenère Cipher", "ROT13", "Chris Way Cipher V1", "Chris Way Cipher V2"]:
             # These algorithms require text with letters only
-            if not all(c.isalpha() or c.isspace() for c in content):
+            if isinstance(content, str):
+                letters_only = all(c.isalpha() or c.isspace() for c in content)
+            else:
+                # Mapped ASCII file: check it tile by tile, stopping at the first other byte
+                letter_count = ClassicalFileCipher.count_letters(content)
+                letters_only = letter_count is not None
+            if not letters_only:
                 return f"{algo_name} requires text with letters only (A-Z, a-z, spaces)."
                 
         # For Hill cipher, we need additional validation
@@ -2887,8 +3158,10 @@ class EncryptProApp(QtWidgets.QMainWindow):
             key = self.ui.key_input_sidebar.text()
             key_parts = key.split(',')
             n = int(len(key_parts) ** 0.5)
-            clean_text = ''.join(c for c in content if c.isalpha())
-            if len(clean_text) % n != 0:
+            if isinstance(content, str):
+                letter_count = sum(1 for c in content if c.isalpha())
+            # Mapped files were counted by the letters-only check above
+            if letter_count % n != 0:
                 return f"Hill Cipher plaintext length must be a multiple of {n} (matrix size)."
         
         # Other algorithms can handle any text
@@ -2898,57 +3171,19 @@ class EncryptProApp(QtWidgets.QMainWindow):
         """Dedicated AES file processing for robust binary handling."""
         file_name = os.path.basename(file_path)
         output_file_name_base = os.path.splitext(file_name)[0]
-        import base64
 
-        # Use CBC mode with hex output as requested
-        aes_mode = "CBC"
-        output_format = "hex"
-        
         try:
-            with open(file_path, 'rb') as f_in:
-                binary_data = f_in.read()
-
             if mode == "Encryption":
-                # The AESCipher.encrypt expects a string, so we base64 encode binary data
-                content_to_encrypt = base64.b64encode(binary_data).decode('utf-8')
-                
-                # Check if key is in hex format
-                is_hex_key = key.startswith('0x') or all(c in "0123456789ABCDEFabcdef" for c in key)
-                if is_hex_key:
-                    # For hex keys, make sure format is correct 
-                    if key.startswith('0x'):
-                        # Already correctly formatted
-                        pass
-                    else:
-                        # Add 0x prefix for clarity
-                        key = '0x' + key
-                        self.ui.status_label.setText(f"Using hex key format: {key[:8]}...")
-                
-                encrypted_data = cipher_class.encrypt(content_to_encrypt, key, aes_mode, output_format)
-                # The result is a formatted string with mode prefix, we can save directly
+                # Stream the raw bytes through AES (GCM by default) in fixed-size chunks
                 output_file_path = os.path.join(output_dir, f"{output_file_name_base}.aes.enc")
-                with open(output_file_path, 'w', encoding='utf-8') as f_out:
-                    f_out.write(encrypted_data)
+                aes_mode = self.ui.file_aes_mode_combo.currentText()
+                AESFileCipher.encrypt_file(file_path, output_file_path, key, mode=aes_mode)
             else:  # Decryption
-                # Read the encrypted data format string
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f_in_text:
-                        encrypted_data = f_in_text.read()
-                except UnicodeDecodeError:
-                    raise ValueError(
-                        f"File '{file_name}' is not a valid encrypted file format.")
-
-                # Decrypt the data
-                decrypted_data_b64 = cipher_class.decrypt(encrypted_data, key)
-                # The result should be the base64 encoded binary data
-                try:
-                    original_binary_data = base64.b64decode(decrypted_data_b64)
-                except Exception as e:
-                    raise ValueError(f"Failed to decode decrypted data: {str(e)}")
-
                 output_file_path = os.path.join(output_dir, f"{output_file_name_base}.dec")
-                with open(output_file_path, 'wb') as f_out:
-                    f_out.write(original_binary_data)
+                if AESFileCipher.is_encrypted_file(file_path):
+                    AESFileCipher.decrypt_file(file_path, output_file_path, key)
+                else:
+                    self.decrypt_legacy_aes_file(file_path, output_file_path, key, cipher_class)
                     
             # Add to history
             self.add_file_op_to_history(file_name, "AES", mode, key)
@@ -2956,6 +3191,28 @@ class EncryptProApp(QtWidgets.QMainWindow):
         except Exception as e:
             raise Exception(f"AES processing error for '{file_name}': {e}")
 
+    def decrypt_legacy_aes_file(self, file_path, output_file_path, key, cipher_class):
+        """Decrypt files written by older versions (hex text of base64-encoded content)."""
+        file_name = os.path.basename(file_path)
+        # Read the encrypted data format string
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f_in_text:
+                encrypted_data = f_in_text.read()
+        except UnicodeDecodeError:
+            raise ValueError(
+                f"File '{file_name}' is not a valid encrypted file format.")
+
+        # Decrypt the data
+        decrypted_data_b64 = cipher_class.decrypt(encrypted_data, key)
+        # The result should be the base64 encoded binary data
+        try:
+            original_binary_data = base64.b64decode(decrypted_data_b64)
+        except Exception as e:
+            raise ValueError(f"Failed to decode decrypted data: {str(e)}")
+
+        with open(output_file_path, 'wb') as f_out:
+            f_out.write(original_binary_data)
+
     def add_file_op_to_history(self, filename, algorithm, operation, key):
         import datetime
         now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,383 @@
+"""
+AES backends for EncryptPro.
+
+AES can come from two libraries: cryptography (OpenSSL) and pycryptodome.
+Both implement the same standard modes, so ciphertext written through one
+decrypts through the other; the choice only affects speed. On first use
+each available backend is timed briefly per mode and the fastest one is
+used from then on (AESBackend.select() forces a backend).
+
+Every backend hands out cipher objects (gcm, ctr, cbc) with pycryptodome's
+interface: update(aad), encrypt/decrypt(data, output=None), digest(),
+verify(tag), encrypt_and_digest() and decrypt_and_verify(); cbc_encrypt
+and cbc_decrypt add PKCS7 padding. For many short messages under one key
+they also hand out objects that keep the expanded key: aead(key) with
+cryptography's AESGCM interface, encrypt(nonce, data, aad) -> ciphertext
++ tag and decrypt(nonce, ciphertext + tag, aad), and ecb(key), a raw block
+cipher with encrypt(blocks) and decrypt(blocks). A failed tag or bad
+padding raises ValueError with either backend.
+"""
+import os
+import time
+
+try:
+    from Crypto.Cipher import AES as _PyCryptoAES
+    from Crypto.Util.Padding import pad, unpad
+except ImportError:
+    _PyCryptoAES = None
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives import padding as _padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    Cipher = None
+
+get_random_bytes = os.urandom
+
+BLOCK_SIZE = 16
+MODES = ("GCM", "CTR", "CBC")
+# Each backend encrypts this much data (with a fresh cipher per message) per timing run
+BENCHMARK_MESSAGE_SIZE = 256 << 10
+BENCHMARK_MESSAGES = 4
+# Message size for AESBackend.throughput (the in-app benchmark)
+THROUGHPUT_MESSAGE_SIZE = 1 << 20
+
+
+class _PyCryptodomeAEAD:
+    """pycryptodome GCM behind AESGCM's interface (it has no reusable GCM key object)."""
+    def __init__(self, key):
+        self._key = key
+
+    def encrypt(self, nonce, data, aad):
+        cipher = _PyCryptoAES.new(self._key, _PyCryptoAES.MODE_GCM, nonce=nonce)
+        if aad:
+            cipher.update(aad)
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        return ciphertext + tag
+
+    def decrypt(self, nonce, data, aad):
+        data = memoryview(data)
+        if len(data) < BLOCK_SIZE:
+            raise ValueError("MAC check failed")
+        cipher = _PyCryptoAES.new(self._key, _PyCryptoAES.MODE_GCM, nonce=nonce)
+        if aad:
+            cipher.update(aad)
+        return cipher.decrypt_and_verify(data[:-BLOCK_SIZE], data[-BLOCK_SIZE:])
+
+
+class _PyCryptodomeBackend:
+    name = "pycryptodome"
+    available = _PyCryptoAES is not None
+    # The C primitives are called through cffi/ctypes, which release the GIL
+    releases_gil = True
+
+    @staticmethod
+    def version():
+        import Crypto
+        return f"pycryptodome {Crypto.__version__}"
+
+    @staticmethod
+    def gcm(key, nonce):
+        return _PyCryptoAES.new(key, _PyCryptoAES.MODE_GCM, nonce=nonce)
+
+    @staticmethod
+    def ctr(key, nonce, initial_block=0):
+        return _PyCryptoAES.new(key, _PyCryptoAES.MODE_CTR, nonce=nonce,
+                                initial_value=initial_block)
+
+    @staticmethod
+    def cbc(key, iv):
+        return _PyCryptoAES.new(key, _PyCryptoAES.MODE_CBC, iv=iv)
+
+    @staticmethod
+    def aead(key):
+        return _PyCryptodomeAEAD(key)
+
+    @staticmethod
+    def ecb(key):
+        return _PyCryptoAES.new(key, _PyCryptoAES.MODE_ECB)
+
+    @staticmethod
+    def cbc_encrypt(key, iv, data):
+        return _PyCryptoAES.new(key, _PyCryptoAES.MODE_CBC, iv=iv).encrypt(pad(bytes(data), BLOCK_SIZE))
+
+    @staticmethod
+    def cbc_decrypt(key, iv, data):
+        return unpad(_PyCryptoAES.new(key, _PyCryptoAES.MODE_CBC, iv=iv).decrypt(data), BLOCK_SIZE)
+
+
+class _CryptographyCipher:
+    """A cryptography encryptor/decryptor behind pycryptodome's cipher interface."""
+    def __init__(self, key, mode, symmetric=False):
+        self._cipher = Cipher(algorithms.AES(key), mode)
+        # CTR is its own inverse, so decrypting can use the encryptor
+        self._symmetric = symmetric
+        self._context = None
+        self._aad = []
+
+    def _get_context(self, encrypting):
+        if self._context is None:
+            encrypting = encrypting or self._symmetric
+            self._context = self._cipher.encryptor() if encrypting else self._cipher.decryptor()
+            for aad in self._aad:
+                self._context.authenticate_additional_data(aad)
+        return self._context
+
+    def _process(self, encrypting, data, output):
+        context = self._get_context(encrypting)
+        if output is None:
+            return context.update(data)
+        try:
+            context.update_into(data, output)
+        except ValueError:
+            # Older cryptography releases want block_size - 1 spare bytes in the buffer
+            output[:] = context.update(data)
+        return None
+
+    def update(self, aad):
+        self._aad.append(bytes(aad))
+        return self
+
+    def encrypt(self, data, output=None):
+        return self._process(True, data, output)
+
+    def decrypt(self, data, output=None):
+        return self._process(False, data, output)
+
+    def digest(self):
+        context = self._get_context(True)
+        context.finalize()
+        return context.tag
+
+    def verify(self, tag):
+        try:
+            self._get_context(False).finalize_with_tag(bytes(tag))
+        except InvalidTag:
+            raise ValueError("MAC check failed")
+
+    def encrypt_and_digest(self, data):
+        return self.encrypt(data), self.digest()
+
+    def decrypt_and_verify(self, data, tag):
+        plaintext = self.decrypt(data)
+        self.verify(tag)
+        return plaintext
+
+
+class _CryptographyAEAD:
+    """AESGCM with pycryptodome's ValueError for a failed tag."""
+    def __init__(self, key):
+        self._aead = AESGCM(key)
+        self.encrypt = self._aead.encrypt
+
+    def decrypt(self, nonce, data, aad):
+        try:
+            return self._aead.decrypt(nonce, data, aad)
+        except InvalidTag:
+            raise ValueError("MAC check failed")
+
+
+class _CryptographyECB:
+    """A raw AES block cipher; ECB contexts keep no state between calls."""
+    def __init__(self, key):
+        cipher = Cipher(algorithms.AES(key), modes.ECB())
+        self.encrypt = cipher.encryptor().update
+        self.decrypt = cipher.decryptor().update
+
+
+class _CryptographyBackend:
+    name = "cryptography"
+    available = Cipher is not None
+    # update() keeps the GIL, so threads calling it take turns
+    releases_gil = False
+
+    @staticmethod
+    def version():
+        import cryptography
+        try:
+            from cryptography.hazmat.backends.openssl import backend
+            return f"cryptography {cryptography.__version__} ({backend.openssl_version_text()})"
+        except ImportError:
+            return f"cryptography {cryptography.__version__}"
+
+    @staticmethod
+    def gcm(key, nonce):
+        return _CryptographyCipher(key, modes.GCM(bytes(nonce)))
+
+    @staticmethod
+    def ctr(key, nonce, initial_block=0):
+        # pycryptodome's CTR counter block is the nonce followed by a big-endian counter
+        counter = bytes(nonce) + initial_block.to_bytes(BLOCK_SIZE - len(nonce), 'big')
+        return _CryptographyCipher(key, modes.CTR(counter), symmetric=True)
+
+    @staticmethod
+    def cbc(key, iv):
+        return _CryptographyCipher(key, modes.CBC(bytes(iv)))
+
+    @staticmethod
+    def aead(key):
+        return _CryptographyAEAD(key)
+
+    @staticmethod
+    def ecb(key):
+        return _CryptographyECB(key)
+
+    @staticmethod
+    def cbc_encrypt(key, iv, data):
+        padder = _padding.PKCS7(BLOCK_SIZE * 8).padder()
+        padded = padder.update(bytes(data)) + padder.finalize()
+        encryptor = Cipher(algorithms.AES(key), modes.CBC(bytes(iv))).encryptor()
+        return encryptor.update(padded) + encryptor.finalize()
+
+    @staticmethod
+    def cbc_decrypt(key, iv, data):
+        if len(data) % BLOCK_SIZE:
+            raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+        decryptor = Cipher(algorithms.AES(key), modes.CBC(bytes(iv))).decryptor()
+        padded = decryptor.update(data) + decryptor.finalize()
+        unpadder = _padding.PKCS7(BLOCK_SIZE * 8).unpadder()
+        try:
+            return unpadder.update(padded) + unpadder.finalize()
+        except ValueError:
+            raise ValueError("Padding is incorrect.")
+
+
+class AESBackend:
+    BACKENDS = {backend.name: backend
+                for backend in (_CryptographyBackend, _PyCryptodomeBackend) if backend.available}
+    _selected = {}
+    _timings = {}
+
+    @staticmethod
+    def available():
+        """Names of the installed AES backends."""
+        return list(AESBackend.BACKENDS)
+
+    @staticmethod
+    def _require():
+        if not AESBackend.BACKENDS:
+            raise ImportError("AES needs the cryptography or pycryptodome package.")
+
+    @staticmethod
+    def _encrypt_message(backend, mode, key, data):
+        if mode == "GCM":
+            backend.gcm(key, bytes(12)).encrypt_and_digest(data)
+        elif mode == "CTR":
+            backend.ctr(key, bytes(8)).encrypt(data)
+        else:
+            backend.cbc_encrypt(key, bytes(16), data)
+
+    @staticmethod
+    def _time(backend, mode):
+        """Seconds for backend to encrypt BENCHMARK_MESSAGES fresh messages in mode."""
+        key = bytes(range(16))
+        data = bytes(BENCHMARK_MESSAGE_SIZE)
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_MESSAGES):
+            AESBackend._encrypt_message(backend, mode, key, data)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def throughput(min_time=0.2, message_size=THROUGHPUT_MESSAGE_SIZE):
+        """
+        Measured encryption speed of the selected backend per mode, in MB/s.
+
+        Each mode encrypts message_size-byte messages (a fresh cipher per
+        message) for at least min_time seconds, so the whole run takes
+        about len(MODES) * min_time.
+
+        Returns:
+            dict: mode -> MB/s
+        """
+        AESBackend._require()
+        key = bytes(range(16))
+        data = bytes(message_size)
+        rates = {}
+        for mode in MODES:
+            backend = AESBackend.for_mode(mode)
+            runs = 0
+            start = time.perf_counter()
+            while True:
+                AESBackend._encrypt_message(backend, mode, key, data)
+                runs += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_time:
+                    break
+            rates[mode] = message_size * runs / elapsed / (1024 ** 2)
+        return rates
+
+    @staticmethod
+    def calibrate():
+        """Time every installed backend per mode and keep the fastest (runs once, ~30 ms)."""
+        AESBackend._require()
+        for mode in MODES:
+            timings = {name: min(AESBackend._time(backend, mode) for _ in range(2))
+                       for name, backend in AESBackend.BACKENDS.items()}
+            AESBackend._timings[mode] = timings
+            AESBackend._selected[mode] = AESBackend.BACKENDS[min(timings, key=timings.get)]
+
+    @staticmethod
+    def select(name=None):
+        """Use the named backend for every mode, or re-run the benchmark if name is None."""
+        AESBackend._selected.clear()
+        AESBackend._timings.clear()
+        if name is None:
+            AESBackend.calibrate()
+            return
+        if name not in AESBackend.BACKENDS:
+            raise ValueError(f"AES backend '{name}' is not installed "
+                             f"(available: {', '.join(AESBackend.available()) or 'none'}).")
+        for mode in MODES:
+            AESBackend._selected[mode] = AESBackend.BACKENDS[name]
+
+    @staticmethod
+    def for_mode(mode, parallel=False):
+        """
+        Backend to use for mode ("GCM", "CTR" or "CBC").
+
+        With parallel=True the backend is picked for the thread-pool file
+        engines: one that releases the GIL counts as os.cpu_count() times
+        faster, since its threads run on separate cores.
+        """
+        if not parallel:
+            backend = AESBackend._selected.get(mode)
+            if backend is not None:
+                return backend
+        if mode not in AESBackend._selected:
+            AESBackend.calibrate()
+        timings = AESBackend._timings.get(mode)
+        if parallel and timings:
+            cores = os.cpu_count() or 1
+            return min(AESBackend.BACKENDS.values(),
+                       key=lambda backend: timings[backend.name] / (cores if backend.releases_gil else 1))
+        return AESBackend._selected[mode]
+
+    @staticmethod
+    def aes_ni():
+        """True/False if the CPU's AES instructions can be detected, else None."""
+        try:
+            from Crypto.Util._cpu_features import have_aes_ni
+            return bool(have_aes_ni())
+        except ImportError:
+            pass
+        try:
+            with open('/proc/cpuinfo') as f:
+                for line in f:
+                    if line.startswith('flags'):
+                        return 'aes' in line.split()
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def describe():
+        """One-line summary of the backend used per mode and the AES-NI status."""
+        AESBackend._require()
+        names = {}
+        for mode in MODES:
+            names.setdefault(AESBackend.for_mode(mode).version(), []).append(mode)
+        backends = "; ".join(f"{'/'.join(modes_)}: {version}" for version, modes_ in names.items())
+        aes_ni = {True: "yes", False: "no", None: "unknown"}[AESBackend.aes_ni()]
+        return f"{backends}; AES-NI: {aes_ni}"
@@ -0,0 +1,613 @@
+"""
+Streaming AES file encryption for EncryptPro.
+
+Files are encrypted as raw bytes in fixed-size pieces, so memory use stays
+flat whatever the file size and the output is only a small header (plus
+the tags) larger than the input. Every file starts with an AESContainer
+header.
+
+CTR files are one continuous keystream: header, nonce, ciphertext.
+
+GCM files are chunked (AESContainer.FLAG_CHUNK_TAGS): the plaintext is cut
+into chunk_size segments and each segment is sealed on its own,
+
+    header | nonce_0 ct_0 tag_0 | nonce_1 ct_1 tag_1 | ... | nonce_last ct_last tag_last
+
+Segments are sealed under a key of their own for each file, derived with
+HKDF-SHA256 from the AES key and a random salt that the header holds in
+its nonce field (AESContainer.FLAG_SEGMENT_KEYS). Each segment has a fresh
+random 12-byte nonce stored in front of it, and its index and a
+final-segment flag are authenticated along with the header. Reordering,
+dropping or truncating segments makes a tag fail, and any byte range can
+be decrypted by reading only the segments it overlaps.
+
+Any key argument can also be an aes_kdf.Passphrase; its KDF parameters
+are then part of the header.
+"""
+import hashlib
+import hmac
+import io
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from aes_backend import BLOCK_SIZE, AESBackend, get_random_bytes
+from algorithms import AESCipher, AESContainer
+
+MODES = ("GCM", "CTR")
+CHUNK_SIZE = 1 << 20  # 1 MiB per read/encrypt/write step
+SEGMENT_SIZE = 256 << 10  # plaintext bytes per chunked GCM segment
+SEGMENT_SALT_SIZE = 16  # HKDF salt for the per-file segment key
+SEGMENT_NONCE_SIZE = AESCipher.NONCE_SIZES["GCM"]
+# Parallel engines: each work item covers about this many bytes
+PARALLEL_SEGMENT_SIZE = 64 << 20
+PARALLEL_THRESHOLD = 2 * PARALLEL_SEGMENT_SIZE
+
+_SEGMENT_SUFFIX = struct.Struct('>IB')  # segment index, final flag
+_SEGMENT_KEY_INFO = b'EncryptPro chunked GCM segment key'
+
+
+class AESFileCipher:
+    @staticmethod
+    def _new_cipher(key_bytes, mode, nonce):
+        if mode == "GCM":
+            return AESBackend.for_mode("GCM").gcm(key_bytes, nonce)
+        return AESBackend.for_mode("CTR").ctr(key_bytes, nonce)
+
+    @staticmethod
+    def _segment_key(key_bytes, container):
+        """
+        Key the segments of a chunked file are sealed under: HKDF-SHA256
+        (RFC 5869) of the AES key, salted with the header nonce and as long
+        as the AES key.
+        """
+        prk = hmac.new(container.nonce, key_bytes, hashlib.sha256).digest()
+        okm = hmac.new(prk, _SEGMENT_KEY_INFO + b'\x01', hashlib.sha256).digest()
+        return okm[:len(key_bytes)]
+
+    @staticmethod
+    def _segment_overhead(container):
+        """Bytes a sealed segment adds to its plaintext: stored nonce and tag."""
+        return SEGMENT_NONCE_SIZE + container.tag_len
+
+    @staticmethod
+    def _segment_cipher(segment_key, header, index, final, nonce, backend=None):
+        """
+        GCM cipher for segment index of a chunked file under its stored nonce.
+
+        The header, the index and the final-segment flag are the AAD.
+        """
+        cipher = (backend or AESBackend.for_mode("GCM")).gcm(segment_key, nonce)
+        cipher.update(header + _SEGMENT_SUFFIX.pack(index, final))
+        return cipher
+
+    @staticmethod
+    def _seal_segment(segment_key, header, index, data, final=False):
+        """One sealed segment of a chunked file: nonce, ciphertext and tag."""
+        nonce = get_random_bytes(SEGMENT_NONCE_SIZE)
+        cipher = AESFileCipher._segment_cipher(segment_key, header, index, final, nonce)
+        return nonce + cipher.encrypt(data) + cipher.digest()
+
+    @staticmethod
+    def _new_chunked_container(chunk_size, kdf=None):
+        return AESContainer("GCM", get_random_bytes(SEGMENT_SALT_SIZE),
+                            tag_len=AESCipher.TAG_SIZE, chunk_size=chunk_size,
+                            flags=AESContainer.FLAG_CHUNK_TAGS | AESContainer.FLAG_SEGMENT_KEYS,
+                            kdf=kdf)
+
+    @staticmethod
+    def _segment_count(plaintext_size, chunk_size):
+        # An empty file is still one (empty) final segment
+        return max(1, -(-plaintext_size // chunk_size))
+
+    @staticmethod
+    def _chunked_plaintext_size(container, body_len):
+        """Plaintext size of a chunked GCM body of body_len bytes."""
+        overhead = AESFileCipher._segment_overhead(container)
+        stored = container.chunk_size + overhead
+        n_segments = max(1, -(-body_len // stored))
+        last = body_len - (n_segments - 1) * stored - overhead
+        if last < 0:
+            raise ValueError("Encrypted file is truncated.")
+        return (n_segments - 1) * container.chunk_size + last
+
+    @staticmethod
+    def _open(path):
+        """
+        Read the container header of path.
+
+        Returns:
+            tuple: (container, header bytes, body offset, body length)
+        """
+        with open(path, 'rb') as f_in:
+            container = AESContainer.read_header(f_in)
+            body_offset = f_in.tell()
+            body_len = os.fstat(f_in.fileno()).st_size - body_offset
+        return container, container.pack_header(), body_offset, body_len
+
+    @staticmethod
+    def _is_chunked(container):
+        return bool(container.flags & AESContainer.FLAG_CHUNK_TAGS)
+
+    @staticmethod
+    def _stream(cipher_step, f_in, f_out, length, chunk_size):
+        """Run length bytes from f_in through cipher_step into f_out, chunk by chunk."""
+        in_buf = bytearray(chunk_size)
+        out_buf = bytearray(chunk_size)
+        in_view = memoryview(in_buf)
+        out_view = memoryview(out_buf)
+        remaining = length
+        while remaining is None or remaining > 0:
+            want = chunk_size if remaining is None else min(chunk_size, remaining)
+            n = f_in.readinto(in_view[:want])
+            if not n:
+                break
+            cipher_step(in_view[:n], output=out_view[:n])
+            f_out.write(out_view[:n])
+            if remaining is not None:
+                remaining -= n
+        if remaining:
+            raise ValueError("Encrypted file is truncated.")
+
+    @staticmethod
+    def _encrypt_segments(f_in, f_out, key_bytes, container, header, plaintext_size):
+        """Seal plaintext_size bytes from f_in as chunked GCM segments."""
+        segment_key = AESFileCipher._segment_key(key_bytes, container)
+        chunk_size = container.chunk_size
+        nonce_size = SEGMENT_NONCE_SIZE
+        n_segments = AESFileCipher._segment_count(plaintext_size, chunk_size)
+        in_buf = memoryview(bytearray(chunk_size))
+        out_buf = memoryview(bytearray(chunk_size))
+        for index in range(n_segments):
+            n = min(chunk_size, plaintext_size - index * chunk_size)
+            if f_in.readinto(in_buf[:n]) != n:
+                raise ValueError("Input file changed while it was being encrypted.")
+            nonce = get_random_bytes(nonce_size)
+            cipher = AESFileCipher._segment_cipher(segment_key, header, index,
+                                                   index == n_segments - 1, nonce)
+            cipher.encrypt(in_buf[:n], output=out_buf[:n])
+            f_out.write(nonce)
+            f_out.write(out_buf[:n])
+            f_out.write(cipher.digest())
+
+    @staticmethod
+    def _decrypt_segments(f_in, f_out, key_bytes, container, header, body_len):
+        """Open chunked GCM segments one by one, verifying each before it is written."""
+        segment_key = AESFileCipher._segment_key(key_bytes, container)
+        plaintext_size = AESFileCipher._chunked_plaintext_size(container, body_len)
+        chunk_size = container.chunk_size
+        nonce_size = SEGMENT_NONCE_SIZE
+        overhead = AESFileCipher._segment_overhead(container)
+        n_segments = AESFileCipher._segment_count(plaintext_size, chunk_size)
+        in_buf = memoryview(bytearray(chunk_size + overhead))
+        out_buf = memoryview(bytearray(chunk_size))
+        for index in range(n_segments):
+            n = min(chunk_size, plaintext_size - index * chunk_size)
+            if f_in.readinto(in_buf[:n + overhead]) != n + overhead:
+                raise ValueError("Encrypted file is truncated.")
+            cipher = AESFileCipher._segment_cipher(segment_key, header, index,
+                                                   index == n_segments - 1,
+                                                   bytes(in_buf[:nonce_size]))
+            cipher.decrypt(in_buf[nonce_size:nonce_size + n], output=out_buf[:n])
+            cipher.verify(in_buf[nonce_size + n:n + overhead])
+            f_out.write(out_buf[:n])
+
+    @staticmethod
+    def _run_parallel(in_path, out_path, out_header, out_length, work, items, workers=None):
+        """
+        Call work(in_view, out_view, item) for every item on a thread pool.
+
+        The output file is written with out_header and preallocated to
+        out_length bytes after it; both files are memory-mapped so workers
+        read and write their own regions in place. Callers pick a backend with
+        AESBackend.for_mode(mode, parallel=True), which releases the GIL
+        inside the cipher, so the threads run on separate cores.
+        """
+        with open(out_path, 'wb') as f_out:
+            f_out.write(out_header)
+            f_out.truncate(len(out_header) + out_length)
+
+        with open(in_path, 'rb') as f_in, open(out_path, 'r+b') as f_out, \
+                mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as in_map, \
+                mmap.mmap(f_out.fileno(), 0) as out_map:
+            in_view = memoryview(in_map)
+            out_view = memoryview(out_map)
+            try:
+                with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                    # list() re-raises the first worker error, if any
+                    list(pool.map(lambda item: work(in_view, out_view, item), items))
+                out_map.flush()
+            finally:
+                in_view.release()
+                out_view.release()
+
+    @staticmethod
+    def _ctr_parallel(in_path, in_offset, length, out_path, out_header, key_bytes, nonce,
+                      workers=None, segment_size=PARALLEL_SEGMENT_SIZE):
+        """
+        Run length bytes of in_path (from in_offset) through AES-CTR on a thread pool.
+
+        CTR keystream blocks are independent, so the input is split into
+        segments and each worker starts its own cipher at the segment's block
+        counter.
+        """
+        if segment_size % BLOCK_SIZE:
+            raise ValueError("Parallel segment size must be a multiple of the AES block size.")
+        out_offset = len(out_header)
+        backend = AESBackend.for_mode("CTR", parallel=True)
+
+        def work(in_view, out_view, start):
+            end = min(start + segment_size, length)
+            cipher = backend.ctr(key_bytes, nonce, start // BLOCK_SIZE)
+            cipher.encrypt(in_view[in_offset + start:in_offset + end],
+                           output=out_view[out_offset + start:out_offset + end])
+
+        AESFileCipher._run_parallel(in_path, out_path, out_header, length, work,
+                                    range(0, length, segment_size), workers)
+
+    @staticmethod
+    def _segment_batches(n_segments, chunk_size, batch_size=PARALLEL_SEGMENT_SIZE):
+        """Group segment indices into work items of about batch_size bytes."""
+        per_batch = max(1, batch_size // chunk_size)
+        return [range(start, min(start + per_batch, n_segments))
+                for start in range(0, n_segments, per_batch)]
+
+    @staticmethod
+    def _gcm_parallel(in_path, out_path, key_bytes, container, header, plaintext_size,
+                      encrypt, body_offset, workers=None, batch_size=PARALLEL_SEGMENT_SIZE):
+        """
+        Seal (encrypt=True) or open chunked GCM segments on a thread pool.
+
+        body_offset is where the sealed segments start in the encrypted
+        file, i.e. the size of its header.
+        """
+        segment_key = AESFileCipher._segment_key(key_bytes, container)
+        chunk_size, tag_len = container.chunk_size, container.tag_len
+        nonce_size = SEGMENT_NONCE_SIZE
+        overhead = AESFileCipher._segment_overhead(container)
+        stored = chunk_size + overhead
+        n_segments = AESFileCipher._segment_count(plaintext_size, chunk_size)
+        backend = AESBackend.for_mode("GCM", parallel=True)
+
+        def work(in_view, out_view, indices):
+            for index in indices:
+                plain = index * chunk_size
+                sealed = body_offset + index * stored
+                body = sealed + nonce_size
+                n = min(chunk_size, plaintext_size - plain)
+                final = index == n_segments - 1
+                if encrypt:
+                    nonce = get_random_bytes(nonce_size)
+                    cipher = AESFileCipher._segment_cipher(segment_key, header, index, final,
+                                                           nonce, backend)
+                    out_view[sealed:body] = nonce
+                    cipher.encrypt(in_view[plain:plain + n],
+                                   output=out_view[body:body + n])
+                    out_view[body + n:body + n + tag_len] = cipher.digest()
+                else:
+                    cipher = AESFileCipher._segment_cipher(segment_key, header, index, final,
+                                                           bytes(in_view[sealed:body]), backend)
+                    cipher.decrypt(in_view[body:body + n],
+                                   output=out_view[plain:plain + n])
+                    # Copy the tag so a failed check leaves no view of the map behind
+                    cipher.verify(bytes(in_view[body + n:body + n + tag_len]))
+
+        out_header = header if encrypt else b''
+        out_length = plaintext_size + n_segments * overhead if encrypt else plaintext_size
+        AESFileCipher._run_parallel(in_path, out_path, out_header, out_length, work,
+                                    AESFileCipher._segment_batches(n_segments, chunk_size,
+                                                                   batch_size),
+                                    workers)
+
+    @staticmethod
+    def encrypt_file_parallel(in_path, out_path, key, workers=None,
+                              segment_size=PARALLEL_SEGMENT_SIZE, mode="CTR",
+                              chunk_size=SEGMENT_SIZE):
+        """
+        Encrypt a file on all cores.
+
+        The output has the same layout as encrypt_file and is readable by
+        decrypt_file.
+
+        Args:
+            in_path (str): file to encrypt
+            out_path (str): where to write the encrypted file
+            key: AES key (text or hex, as accepted by AESCipher) or a Passphrase
+            workers (int): worker threads, defaults to the CPU count
+            segment_size (int): bytes per work item (a multiple of 16 for CTR)
+            mode (str): "CTR" or "GCM" (chunked)
+            chunk_size (int): GCM segment size
+        """
+        if mode not in MODES:
+            raise ValueError(f"Parallel file encryption supports {', '.join(MODES)} modes.")
+        length = os.path.getsize(in_path)
+        if length == 0:
+            # Nothing to split, and an empty file cannot be memory-mapped
+            AESFileCipher.encrypt_file(in_path, out_path, key, mode, chunk_size)
+            return
+        context, kdf = AESCipher.sealing_context(key)
+        key_bytes = context.key_bytes
+        try:
+            if mode == "GCM":
+                container = AESFileCipher._new_chunked_container(chunk_size, kdf)
+                header = container.pack_header()
+                AESFileCipher._gcm_parallel(in_path, out_path, key_bytes, container, header,
+                                            length, True, len(header), workers, segment_size)
+            else:
+                nonce = get_random_bytes(AESCipher.NONCE_SIZES["CTR"])
+                container = AESContainer("CTR", nonce, chunk_size=segment_size, kdf=kdf)
+                AESFileCipher._ctr_parallel(in_path, 0, length, out_path, container.pack_header(),
+                                            key_bytes, nonce, workers, segment_size)
+        except Exception:
+            # The output was preallocated to full size; don't leave it looking complete
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            raise
+
+    @staticmethod
+    def decrypt_file_parallel(in_path, out_path, key, workers=None,
+                              segment_size=PARALLEL_SEGMENT_SIZE):
+        """
+        Decrypt a CTR or chunked GCM file on all cores.
+
+        GCM segments are verified by the workers; if any tag does not match,
+        the output is removed and ValueError is raised.
+        """
+        container, header, body_offset, body_len = AESFileCipher._open(in_path)
+        key_bytes = AESCipher.opening_context(key, container).key_bytes
+        chunked = AESFileCipher._is_chunked(container)
+        if container.mode != "CTR" and not chunked:
+            raise ValueError("Parallel decryption needs a CTR or chunked GCM file.")
+        overhead = AESFileCipher._segment_overhead(container) if chunked else container.tag_len
+        if body_len <= overhead:
+            # Empty plaintext: nothing to split
+            AESFileCipher.decrypt_file(in_path, out_path, key)
+            return
+
+        try:
+            if chunked:
+                plaintext_size = AESFileCipher._chunked_plaintext_size(container, body_len)
+                AESFileCipher._gcm_parallel(in_path, out_path, key_bytes, container, header,
+                                            plaintext_size, False, body_offset,
+                                            workers, segment_size)
+            else:
+                AESFileCipher._ctr_parallel(in_path, body_offset, body_len, out_path,
+                                            b'', key_bytes, container.nonce, workers,
+                                            segment_size)
+        except Exception:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            raise
+
+    @staticmethod
+    def is_encrypted_file(path):
+        """True if path starts with the EncryptPro AES container magic."""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(AESContainer.MAGIC)) == AESContainer.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def plaintext_size(path):
+        """Size of the decrypted content of an encrypted file, from its layout alone."""
+        container, _, _, body_len = AESFileCipher._open(path)
+        if AESFileCipher._is_chunked(container):
+            return AESFileCipher._chunked_plaintext_size(container, body_len)
+        return max(0, body_len - container.tag_len)
+
+    @staticmethod
+    def encrypt_file(in_path, out_path, key, mode="GCM", chunk_size=None):
+        """
+        Encrypt a file of any size with constant memory.
+
+        Large files are handed to encrypt_file_parallel.
+
+        Args:
+            in_path (str): file to encrypt
+            out_path (str): where to write the encrypted file
+            key: AES key (text or hex, as accepted by AESCipher) or a Passphrase
+            mode (str): "GCM" (chunked, authenticated) or "CTR"
+            chunk_size (int): GCM segment size (SEGMENT_SIZE) or CTR bytes per step (CHUNK_SIZE)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Streaming file encryption supports {', '.join(MODES)} modes.")
+        if chunk_size is None:
+            chunk_size = SEGMENT_SIZE if mode == "GCM" else CHUNK_SIZE
+        length = os.path.getsize(in_path)
+        if length >= PARALLEL_THRESHOLD:
+            if mode == "GCM":
+                AESFileCipher.encrypt_file_parallel(in_path, out_path, key, mode=mode,
+                                                    chunk_size=chunk_size)
+            else:
+                AESFileCipher.encrypt_file_parallel(in_path, out_path, key)
+            return
+        context, kdf = AESCipher.sealing_context(key)
+        key_bytes = context.key_bytes
+
+        with open(in_path, 'rb') as f_in, open(out_path, 'wb') as f_out:
+            if mode == "GCM":
+                container = AESFileCipher._new_chunked_container(chunk_size, kdf)
+                header = container.pack_header()
+                f_out.write(header)
+                AESFileCipher._encrypt_segments(f_in, f_out, key_bytes, container, header, length)
+            else:
+                nonce = get_random_bytes(AESCipher.NONCE_SIZES[mode])
+                cipher = AESFileCipher._new_cipher(key_bytes, mode, nonce)
+                f_out.write(AESContainer(mode, nonce, chunk_size=chunk_size, kdf=kdf).pack_header())
+                AESFileCipher._stream(cipher.encrypt, f_in, f_out, None, chunk_size)
+
+    @staticmethod
+    def decrypt_file(in_path, out_path, key, chunk_size=CHUNK_SIZE):
+        """
+        Decrypt a file written by encrypt_file with constant memory.
+
+        Chunked GCM segments are verified before they are written; for
+        single-tag GCM files the tag is checked after the last chunk. If a
+        check fails, the partial output is removed and ValueError is raised.
+        """
+        container, header, body_offset, body_len = AESFileCipher._open(in_path)
+        key_bytes = AESCipher.opening_context(key, container).key_bytes
+        if container.mode not in MODES:
+            raise ValueError(f"Unsupported AES file layout ({container.mode}).")
+        chunked = AESFileCipher._is_chunked(container)
+        if body_len >= PARALLEL_THRESHOLD and (chunked or container.mode == "CTR"):
+            AESFileCipher.decrypt_file_parallel(in_path, out_path, key)
+            return
+
+        try:
+            with open(in_path, 'rb') as f_in, open(out_path, 'wb') as f_out:
+                f_in.seek(body_offset)
+                if chunked:
+                    AESFileCipher._decrypt_segments(f_in, f_out, key_bytes, container, header,
+                                                    body_len)
+                    return
+                body_len -= container.tag_len
+                if body_len < 0:
+                    raise ValueError("Encrypted file is truncated.")
+                cipher = AESFileCipher._new_cipher(key_bytes, container.mode, container.nonce)
+                AESFileCipher._stream(cipher.decrypt, f_in, f_out, body_len, chunk_size)
+                if container.mode == "GCM":
+                    cipher.verify(f_in.read(container.tag_len))
+        except ValueError:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            raise
+
+    @staticmethod
+    def decrypt_range(path, key, offset, length):
+        """
+        Decrypt length bytes of plaintext starting at offset.
+
+        Only the GCM segments that overlap the range are read and verified,
+        so a small read from a large file costs one or two segments. CTR
+        files are read by starting the keystream at the right block.
+
+        Args:
+            path (str): chunked GCM or CTR file
+            key: AES key (text or hex, as accepted by AESCipher) or a Passphrase
+            offset (int): plaintext offset of the first byte
+            length (int): number of bytes to read
+
+        Returns:
+            bytes: the plaintext range, shorter if it runs past the end of the file
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("Offset and length must not be negative.")
+        container, header, body_offset, body_len = AESFileCipher._open(path)
+        key_bytes = AESCipher.opening_context(key, container).key_bytes
+        chunked = AESFileCipher._is_chunked(container)
+        if container.mode != "CTR" and not chunked:
+            raise ValueError("Random access needs a CTR or chunked GCM file.")
+        size = AESFileCipher._chunked_plaintext_size(container, body_len) if chunked else body_len
+        end = min(offset + length, size)
+        if end <= offset:
+            return b''
+
+        with open(path, 'rb') as f_in:
+            if not chunked:
+                block = offset // BLOCK_SIZE
+                start = block * BLOCK_SIZE
+                f_in.seek(body_offset + start)
+                cipher = AESBackend.for_mode("CTR").ctr(key_bytes, container.nonce, block)
+                return cipher.decrypt(f_in.read(end - start))[offset - start:]
+
+            segment_key = AESFileCipher._segment_key(key_bytes, container)
+            chunk_size = container.chunk_size
+            nonce_size = SEGMENT_NONCE_SIZE
+            overhead = AESFileCipher._segment_overhead(container)
+            n_segments = AESFileCipher._segment_count(size, chunk_size)
+            first, last = offset // chunk_size, (end - 1) // chunk_size
+            f_in.seek(body_offset + first * (chunk_size + overhead))
+            pieces = []
+            for index in range(first, last + 1):
+                n = min(chunk_size, size - index * chunk_size)
+                sealed = f_in.read(n + overhead)
+                if len(sealed) != n + overhead:
+                    raise ValueError("Encrypted file is truncated.")
+                cipher = AESFileCipher._segment_cipher(segment_key, header, index,
+                                                       index == n_segments - 1,
+                                                       sealed[:nonce_size])
+                pieces.append(cipher.decrypt_and_verify(sealed[nonce_size:nonce_size + n],
+                                                        sealed[nonce_size + n:]))
+        start = offset - first * chunk_size
+        return b''.join(pieces)[start:start + end - offset]
+
+    @staticmethod
+    def _append(path, key, source):
+        """Encrypt everything read from the binary file object source onto the end of path."""
+        container, header, body_offset, body_len = AESFileCipher._open(path)
+        if container.mode == "CTR":
+            # Continuing the keystream would reuse it if two copies of a file
+            # were appended to with different data
+            raise ValueError("CTR files cannot be appended to; encrypt the file in GCM mode instead.")
+        if not AESFileCipher._is_chunked(container):
+            raise ValueError("Only chunked GCM files can be appended to; "
+                             "decrypt and encrypt this file again first.")
+        key_bytes = AESCipher.opening_context(key, container).key_bytes
+
+        segment_key = AESFileCipher._segment_key(key_bytes, container)
+        chunk_size = container.chunk_size
+        nonce_size = SEGMENT_NONCE_SIZE
+        overhead = AESFileCipher._segment_overhead(container)
+        plaintext_size = AESFileCipher._chunked_plaintext_size(container, body_len)
+        index = AESFileCipher._segment_count(plaintext_size, chunk_size) - 1
+        last_len = plaintext_size - index * chunk_size
+        position = body_offset + index * (chunk_size + overhead)
+        with open(path, 'r+b') as f_out:
+            f_out.seek(position)
+            sealed = f_out.read(last_len + overhead)
+            cipher = AESFileCipher._segment_cipher(segment_key, header, index, True,
+                                                   sealed[:nonce_size])
+            pending = bytearray(cipher.decrypt_and_verify(sealed[nonce_size:nonce_size + last_len],
+                                                          sealed[nonce_size + last_len:]))
+
+            # The old final segment is resealed (as a full segment or a longer
+            # final one); every sealed segment gets a fresh random nonce
+            f_out.seek(position)
+            buf = memoryview(bytearray(chunk_size))
+            while True:
+                n = source.readinto(buf)
+                if not n:
+                    break
+                pending += buf[:n]
+                # A segment is sealed as non-final only once more data is known to follow it
+                while len(pending) > chunk_size:
+                    f_out.write(AESFileCipher._seal_segment(segment_key, header, index,
+                                                            bytes(pending[:chunk_size])))
+                    del pending[:chunk_size]
+                    index += 1
+            f_out.write(AESFileCipher._seal_segment(segment_key, header, index,
+                                                    bytes(pending), final=True))
+
+    @staticmethod
+    def append(path, key, data):
+        """
+        Append data to an encrypted file without touching its earlier content.
+
+        Only the final GCM segment (at most one segment of plaintext) is read
+        back and resealed, so an append costs O(len(data)) rather than a full
+        decrypt and re-encrypt. The header never changes: the plaintext size
+        follows from the file length. Resealed and new segments get fresh
+        random nonces, so appending different data to copies of one file
+        never reuses a nonce.
+
+        The final segment is rewritten in place, so an interrupted append
+        leaves a file that fails verification at its end.
+
+        CTR files are refused: continuing their keystream would reuse it if
+        copies of a file were appended to with different data.
+
+        Args:
+            path (str): chunked GCM file written by encrypt_file
+            key: AES key (text or hex, as accepted by AESCipher) or a Passphrase
+            data (bytes): bytes to append
+        """
+        AESFileCipher._append(path, key, io.BytesIO(data))
+
+    @staticmethod
+    def append_file(in_path, out_path, key):
+        """Append the contents of in_path to the encrypted file out_path (see append)."""
+        with open(in_path, 'rb') as source:
+            AESFileCipher._append(out_path, key, source)
@@ -0,0 +1,233 @@
+"""
+Passphrase-derived AES keys for EncryptPro.
+
+A Passphrase can be used wherever AESCipher or AESFileCipher take a key.
+The AES key is derived from it with scrypt (default) or PBKDF2-HMAC-SHA256,
+and the KDF, salt and cost parameters are stored in the AESContainer
+header, so decryption only needs the passphrase text.
+
+Derivation is deliberately slow, so derived keys are kept in memory for
+PassphraseKDF.TTL seconds. Within that time, encryptions with the same
+Passphrase reuse one salt (each message or file still gets its own nonce).
+Decrypting everything from such a batch therefore runs the KDF once, not
+once per file. PassphraseKDF.calibrate() picks a cost that takes a target
+time on this machine.
+"""
+import hashlib
+import os
+import struct
+import time
+
+KDFS = ("scrypt", "pbkdf2")
+SALT_SIZE = 16
+# log2(N) for scrypt (r=8, p=1) and PBKDF2-HMAC-SHA256 iterations
+DEFAULT_COSTS = {"scrypt": 15, "pbkdf2": 600_000}
+SCRYPT_R = 8
+SCRYPT_P = 1
+# hashlib.scrypt refuses to use more memory than this
+SCRYPT_MAX_MEMORY = 1 << 30
+# Highest accepted costs, so a header cannot make decryption run for hours:
+# the largest scrypt cost that fits SCRYPT_MAX_MEMORY, and several seconds of PBKDF2
+MAX_COSTS = {"scrypt": 19, "pbkdf2": 10_000_000}
+
+
+def scrypt_memory(cost, r=SCRYPT_R, p=SCRYPT_P):
+    """Bytes of memory scrypt needs for log2(N) = cost."""
+    return 128 * r * ((1 << cost) + p + 2)
+
+
+class KDFParams:
+    """
+    KDF settings for one salt, as stored after the nonce in an AESContainer.
+
+    Layout (big-endian):
+
+        kdf         1 byte    1 = scrypt, 2 = PBKDF2-HMAC-SHA256
+        key_len     1 byte    derived AES key size
+        salt_len    1 byte
+        cost        4 bytes   log2(N) for scrypt, iterations for PBKDF2
+        r, p        1 byte each (scrypt; 0 for PBKDF2)
+        salt        salt_len bytes
+    """
+    IDS = {"scrypt": 1, "pbkdf2": 2}
+    NAMES = {value: name for name, value in IDS.items()}
+    FIELDS = struct.Struct('>BBBIBB')
+
+    def __init__(self, kdf, salt, cost, key_len=32, r=SCRYPT_R, p=SCRYPT_P):
+        if kdf not in KDFParams.IDS:
+            raise ValueError(f"Unknown key derivation function '{kdf}' (use {', '.join(KDFS)}).")
+        if key_len not in (16, 24, 32):
+            raise ValueError("Derived key size must be 16, 24, or 32 bytes.")
+        KDFParams.check_cost(kdf, cost)
+        self.kdf = kdf
+        self.salt = bytes(salt)
+        self.cost = cost
+        self.key_len = key_len
+        self.r, self.p = (r, p) if kdf == "scrypt" else (0, 0)
+
+    @staticmethod
+    def check_cost(kdf, cost):
+        """Raise ValueError unless cost is between 1 and MAX_COSTS[kdf]."""
+        if not 1 <= cost <= MAX_COSTS[kdf]:
+            unit = "log2(N)" if kdf == "scrypt" else "iterations"
+            raise ValueError(f"{kdf} cost must be between 1 and {MAX_COSTS[kdf]} ({unit}), "
+                             f"not {cost}.")
+        return cost
+
+    @staticmethod
+    def packed_size(salt_len=SALT_SIZE):
+        return KDFParams.FIELDS.size + salt_len
+
+    def pack(self):
+        return KDFParams.FIELDS.pack(KDFParams.IDS[self.kdf], self.key_len, len(self.salt),
+                                     self.cost, self.r, self.p) + self.salt
+
+    @staticmethod
+    def read(read):
+        """Read packed parameters with read(n), e.g. a file's read method."""
+        fields = read(KDFParams.FIELDS.size)
+        if len(fields) != KDFParams.FIELDS.size:
+            raise ValueError("Truncated key derivation parameters.")
+        kdf_id, key_len, salt_len, cost, r, p = KDFParams.FIELDS.unpack(fields)
+        if kdf_id not in KDFParams.NAMES:
+            raise ValueError(f"Unknown key derivation function id {kdf_id}.")
+        if KDFParams.NAMES[kdf_id] == "scrypt" and (r, p) != (SCRYPT_R, SCRYPT_P):
+            raise ValueError(f"Unsupported scrypt parameters r={r}, p={p} "
+                             f"(expected r={SCRYPT_R}, p={SCRYPT_P}).")
+        salt = read(salt_len)
+        if len(salt) != salt_len:
+            raise ValueError("Truncated key derivation parameters.")
+        return KDFParams(KDFParams.NAMES[kdf_id], salt, cost, key_len, r, p)
+
+    def derive(self, passphrase):
+        """Run the KDF on passphrase (bytes); this is the slow part."""
+        if self.kdf == "pbkdf2":
+            return hashlib.pbkdf2_hmac('sha256', passphrase, self.salt, self.cost, self.key_len)
+        memory = scrypt_memory(self.cost, self.r, self.p)
+        if memory > SCRYPT_MAX_MEMORY:
+            raise ValueError(f"scrypt cost 2^{self.cost} needs more than "
+                             f"{SCRYPT_MAX_MEMORY >> 20} MiB of memory.")
+        return hashlib.scrypt(passphrase, salt=self.salt, n=1 << self.cost, r=self.r, p=self.p,
+                              maxmem=memory + (1 << 20), dklen=self.key_len)
+
+
+class Passphrase:
+    """
+    A passphrase to derive the AES key from, used in place of a key.
+
+    Args:
+        text (str): the passphrase
+        kdf (str): "scrypt" or "pbkdf2"
+        cost (int): log2(N) for scrypt, iterations for PBKDF2; see PassphraseKDF.calibrate
+        key_size (int): derived AES key size in bytes (16, 24 or 32)
+    """
+    def __init__(self, text, kdf="scrypt", cost=None, key_size=32):
+        if not text:
+            raise ValueError("Passphrase must not be empty.")
+        if kdf not in KDFS:
+            raise ValueError(f"Unknown key derivation function '{kdf}' (use {', '.join(KDFS)}).")
+        self.text = text
+        self.kdf = kdf
+        self.cost = DEFAULT_COSTS[kdf] if cost is None else KDFParams.check_cost(kdf, cost)
+        self.key_size = key_size
+
+    def __repr__(self):
+        return f"Passphrase(<hidden>, kdf={self.kdf!r}, cost={self.cost}, key_size={self.key_size})"
+
+
+class PassphraseKDF:
+    TTL = 300.0
+    # fingerprint of (passphrase, parameters) -> (derived key, expiry time)
+    _derived = {}
+    # fingerprint of (passphrase, settings) -> (KDFParams, derived key, expiry time)
+    _sealing = {}
+
+    @staticmethod
+    def _fingerprint(passphrase, *parts):
+        """Cache key that does not keep the passphrase itself in memory."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part)
+        digest.update(passphrase)
+        return digest.digest()
+
+    @staticmethod
+    def _evict(now):
+        for cache in (PassphraseKDF._derived, PassphraseKDF._sealing):
+            for fingerprint in [f for f, entry in cache.items() if entry[-1] <= now]:
+                del cache[fingerprint]
+
+    @staticmethod
+    def derive(passphrase, params):
+        """
+        The AES key for passphrase (str) and params, from the cache when possible.
+
+        Returns:
+            bytes: the derived key
+        """
+        secret = passphrase.encode('utf-8')
+        fingerprint = PassphraseKDF._fingerprint(secret, params.pack())
+        now = time.monotonic()
+        entry = PassphraseKDF._derived.get(fingerprint)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        key = params.derive(secret)
+        PassphraseKDF._evict(now)
+        PassphraseKDF._derived[fingerprint] = (key, now + PassphraseKDF.TTL)
+        return key
+
+    @staticmethod
+    def sealing_key(passphrase):
+        """
+        Parameters and key for new ciphertext under a Passphrase.
+
+        The salt is reused for TTL seconds, so a batch of encryptions shares
+        one derivation both now and when it is decrypted.
+
+        Returns:
+            tuple: (KDFParams, derived key bytes)
+        """
+        secret = passphrase.text.encode('utf-8')
+        settings = f"{passphrase.kdf}:{passphrase.cost}:{passphrase.key_size}".encode('ascii')
+        fingerprint = PassphraseKDF._fingerprint(secret, settings)
+        now = time.monotonic()
+        entry = PassphraseKDF._sealing.get(fingerprint)
+        if entry is not None and entry[2] > now:
+            return entry[0], entry[1]
+        params = KDFParams(passphrase.kdf, os.urandom(SALT_SIZE), passphrase.cost,
+                           passphrase.key_size)
+        key = PassphraseKDF.derive(passphrase.text, params)
+        PassphraseKDF._sealing[fingerprint] = (params, key, now + PassphraseKDF.TTL)
+        return params, key
+
+    @staticmethod
+    def clear():
+        """Forget every cached key (e.g. when the user locks the application)."""
+        PassphraseKDF._derived.clear()
+        PassphraseKDF._sealing.clear()
+
+    @staticmethod
+    def calibrate(target=0.25, kdf="scrypt"):
+        """
+        Cost for kdf that takes about target seconds on this machine.
+
+        PBKDF2 time is linear in the iterations and scrypt time in N, so
+        one short timing run is scaled to the target. The result is capped
+        at MAX_COSTS (for scrypt, the SCRYPT_MAX_MEMORY limit).
+
+        Returns:
+            int: log2(N) for scrypt, iterations for PBKDF2 (use as Passphrase cost)
+        """
+        probe_cost = 12 if kdf == "scrypt" else 10_000
+        params = KDFParams(kdf, bytes(SALT_SIZE), probe_cost)
+        start = time.perf_counter()
+        params.derive(b'calibration')
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        scale = target / elapsed
+        if kdf == "pbkdf2":
+            return min(MAX_COSTS[kdf], max(1000, int(probe_cost * scale)))
+        cost = probe_cost
+        while scale >= 1.5 and cost < MAX_COSTS[kdf]:
+            cost += 1
+            scale /= 2
+        return cost
@@ -1,33 +1,239 @@
 import numpy as np
 import base64
+import math
+import os
 import random
-try:
-    from Crypto.Cipher import AES as _PyCryptoAES
-    from Crypto.Util.Padding import pad, unpad
-    from Crypto.Random import get_random_bytes
-except ImportError:
-    _PyCryptoAES = None
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from aes_backend import BLOCK_SIZE, AESBackend, get_random_bytes
+from aes_kdf import KDFParams, Passphrase, PassphraseKDF
+
+# Characters str.split() treats as whitespace, restricted to ASCII
+_ASCII_SPACES = np.frombuffer(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f', dtype=np.uint8)
+
+class _TranslateTable(dict):
+    """Mapping for str.translate built from a per-character function.
+
+    Each code point is computed on first use and cached, so the whole buffer
+    goes through a single C-level translate call while behaving exactly like
+    the per-character function.
+    """
+    def __init__(self, char_func):
+        super().__init__()
+        self._char_func = char_func
+        self._byte_table = None
+
+    def __missing__(self, code):
+        mapped = self._char_func(chr(code))
+        self[code] = mapped
+        return mapped
+
+    def byte_table(self):
+        """The same mapping for ASCII codes as a 128-entry uint8 lookup array."""
+        if self._byte_table is None:
+            mapped = ''.join(self[code] for code in range(128))
+            if len(mapped) != 128 or not mapped.isascii():
+                raise ValueError("This key maps ASCII letters outside ASCII; pass text as str.")
+            self._byte_table = np.frombuffer(mapped.encode('ascii'), dtype=np.uint8)
+        return self._byte_table
+
+def _ascii_codes(data):
+    """
+    ASCII text in a bytes-like object (bytes, memoryview, mmap) as a uint8 array.
+
+    The array is a view of data, so large inputs are not copied. Byte
+    input must be ASCII: other encodings have to be decoded to str.
+    """
+    codes = np.frombuffer(data, dtype=np.uint8)
+    if len(codes) and codes.max() >= 0x80:
+        raise ValueError("Byte input must be ASCII text; decode other encodings to str first.")
+    return codes
+
+def _translate(text, table):
+    """text.translate(table) for str, or the same mapping over ASCII bytes-like input."""
+    if isinstance(text, str):
+        return text.translate(table)
+    return table.byte_table()[_ascii_codes(text)].tobytes()
+
+def _shift_char(char, shift):
+    if char.isalpha():
+        base = ord('A') if char.isupper() else ord('a')
+        return chr((ord(char) - base + shift) % 26 + base)
+    return char
+
+@lru_cache(maxsize=32)
+def _shift_table(shift):
+    """Cached translate table for a Caesar shift (0-25)."""
+    return _TranslateTable(lambda char: _shift_char(char, shift))
+
+@lru_cache(maxsize=64)
+def _substitution_tables(key):
+    """Cached (encrypt, decrypt) translate tables for an upper-case substitution key."""
+    def make_table(table):
+        def sub_char(c):
+            if c.isalpha():
+                sub = table.get(c.upper())
+                if sub is None:
+                    raise ValueError(f"Substitution Cipher cannot map character {c!r}.")
+                return sub if c.isupper() else sub.lower()
+            return c
+        return _TranslateTable(sub_char)
+
+    enc = {chr(i+ord('A')): key[i] for i in range(26)}
+    dec = {key[i]: chr(i+ord('A')) for i in range(26)}
+    return make_table(enc), make_table(dec)
+
+def _text_codes(text):
+    """Code points of text as a NumPy array: uint8 for ASCII, uint32 otherwise.
+
+    text may also be ASCII bytes-like data, which is used without copying.
+    """
+    if not isinstance(text, str):
+        return _ascii_codes(text)
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+
+def _upper_letter_codes(text):
+    """Upper-cased letters of text (c.upper() for each c.isalpha()) as codes, like _text_codes."""
+    if not isinstance(text, str) or text.isascii():
+        data = _text_codes(text)
+        return data[((data | 0x20) - ord('a')) < 26] & 0xDF
+    letters = ''.join([c.upper() for c in text if c.isalpha()])
+    return _text_codes(letters).copy()
+
+def _strip_spaces(text):
+    """Text with all whitespace removed, or None if anything else is not a letter."""
+    if not isinstance(text, str):
+        codes = _ascii_codes(text)
+        stripped = codes[~np.isin(codes, _ASCII_SPACES)]
+        return stripped if _all_letters(stripped) else None
+    stripped = ''.join(text.split())
+    if stripped and not stripped.isalpha():
+        return None
+    return stripped
+
+def _all_letters(codes):
+    """True if a uint8 array holds only ASCII letters (like str.isalpha, but True when empty)."""
+    return bool((((codes | 0x20) - ord('a')) < 26).all())
+
+def _is_alpha(text):
+    """True if text is empty or all letters; bytes-like text must be ASCII."""
+    if isinstance(text, str):
+        return not text or text.isalpha()
+    return _all_letters(_ascii_codes(text))
+
+def _upper_codes(letters):
+    """Codes of letters.upper(); letters is a str or a uint8 array of ASCII letters."""
+    if isinstance(letters, str):
+        return _text_codes(letters.upper())
+    return letters & 0xDF
+
+def _shift_by_schedule(codes, schedule):
+    """
+    Add a periodic shift schedule to letter codes mod 26 and return A-Z codes.
+
+    codes may hold any letter code points; they are reduced with (code - 'A') % 26
+    exactly like the per-character formula. schedule is a uint8 array of
+    shifts (0-25) for one period and is tiled over the text.
+    """
+    if codes.dtype == np.uint8:
+        values = (codes - ord('A')) % 26
+    else:
+        values = ((codes.astype(np.int64) - ord('A')) % 26).astype(np.uint8)
+    values += np.resize(schedule, len(values))
+    values -= 26 * (values >= 26).view(np.uint8)
+    return values + ord('A')
+
+def _codes_text(codes):
+    """Inverse of _text_codes."""
+    if codes.dtype == np.uint8:
+        return codes.tobytes().decode('ascii')
+    return codes.astype('<u4', copy=False).tobytes().decode('utf-32-le', 'surrogatepass')
+
+def _codes_output(codes, source):
+    """Result codes as str, or as bytes when source (the cipher input) was bytes-like."""
+    if isinstance(source, str):
+        return _codes_text(codes)
+    return codes.tobytes()
+
+def _map_stream(chunks, func):
+    """Yield func(chunk) for ciphers that keep no state between characters."""
+    for chunk in chunks:
+        out = func(chunk)
+        if len(out):
+            yield out
+
+def _whole_message_stream(chunks, func):
+    """Collect all chunks and yield func(message) once, for ciphers that permute the whole message."""
+    chunks = [chunk for chunk in chunks if len(chunk)]
+    if not chunks:
+        return
+    out = func(''.join(chunks) if isinstance(chunks[0], str) else b''.join(chunks))
+    if len(out):
+        yield out
+
+def _chris_way_encrypt_stream(chunks, schedule):
+    """
+    Chris Way encryption over chunks: shift with a running position count,
+    then emit the shifted chunks last to first, each reversed.
+    """
+    shifted = []
+    position = 0
+    for chunk in chunks:
+        letters = _strip_spaces(chunk)
+        if letters is None:
+            raise ValueError("Input must contain only alphabetic characters and spaces.")
+        codes = _upper_codes(letters)
+        if len(codes):
+            offset = np.roll(schedule, -(position % len(schedule)))
+            shifted.append((_shift_by_schedule(codes, offset)[::-1], isinstance(chunk, str)))
+            position += len(codes)
+    for codes, is_text in reversed(shifted):
+        yield _codes_output(codes, '' if is_text else b'')
+
+def _chris_way_decrypt_stream(chunks, schedule):
+    """Chris Way decryption over chunks: read the chunks last to first, undoing the shifts."""
+    chunks = [chunk for chunk in chunks if len(chunk)]
+    for chunk in chunks:
+        if not _is_alpha(chunk):
+            raise ValueError("Ciphertext must contain only alphabetic characters.")
+    position = 0
+    for chunk in reversed(chunks):
+        codes = _text_codes(chunk)[::-1]
+        offset = np.roll(schedule, -(position % len(schedule)))
+        yield _codes_output(_shift_by_schedule(codes, offset), chunk)
+        position += len(codes)
 
 class CaesarCipher:
     @staticmethod
-    def encrypt(text, key):
+    def encrypt(text, key, alphabet=None):
+        """Shift letters by key; alphabet (an alphabets.Alphabet) replaces A-Z if given."""
         if not key or not str(key).isdigit():
             raise ValueError("Caesar Cipher requires a numeric key.")
+        if alphabet is not None:
+            return alphabet.shift(text, int(key))
         shift = int(key) % 26
-        result = ""
-        for char in text:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                result += chr((ord(char) - base + shift) % 26 + base)
-            else:
-                result += char
-        return result
+        return _translate(text, _shift_table(shift))
 
     @staticmethod
-    def decrypt(text, key):
+    def decrypt(text, key, alphabet=None):
         if not key or not str(key).isdigit():
             raise ValueError("Caesar Cipher requires a numeric key.")
-        return CaesarCipher.encrypt(text, -int(key))
+        if alphabet is not None:
+            return alphabet.shift(text, -int(key))
+        shift = -int(key) % 26
+        return _translate(text, _shift_table(shift))
+
+    @staticmethod
+    def encrypt_stream(chunks, key, alphabet=None):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        return _map_stream(chunks, lambda chunk: CaesarCipher.encrypt(chunk, key, alphabet))
+
+    @staticmethod
+    def decrypt_stream(chunks, key, alphabet=None):
+        return _map_stream(chunks, lambda chunk: CaesarCipher.decrypt(chunk, key, alphabet))
 
 class Rot13Cipher:
     @staticmethod
@@ -42,330 +248,582 @@ class Rot13Cipher:
             raise ValueError("ROT13 does not require a key.")
         return Rot13Cipher._rot13(text)
 
+    @staticmethod
+    def encrypt_stream(chunks, key=None):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        return _map_stream(chunks, lambda chunk: Rot13Cipher.encrypt(chunk, key))
+
+    @staticmethod
+    def decrypt_stream(chunks, key=None):
+        return _map_stream(chunks, lambda chunk: Rot13Cipher.decrypt(chunk, key))
+
     @staticmethod
     def _rot13(text):
-        result = ""
-        for char in text:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                result += chr((ord(char) - base + 13) % 26 + base)
-            else:
-                result += char
-        return result 
+        return _translate(text, _shift_table(13))
+
+class _PlayfairSquare:
+    """
+    Precomputed Playfair tables for one key.
+
+    Every one of the 25x25 possible digraphs is mapped once per direction,
+    so encrypting or decrypting a text is a single indexed lookup over all
+    of its digraphs.
+    """
+    def __init__(self, key):
+        self.matrix = PlayfairCipher._format_key(key)
+        letters = ''.join(self.matrix)
+        if not letters.isascii():
+            raise ValueError("Playfair Cipher key must contain only letters A-Z.")
+        self.letter_codes = np.frombuffer(letters.encode('ascii'), dtype=np.uint8)
+        # Position (0-24) of each byte in the square, 255 for bytes not in it
+        self.positions = np.full(256, 255, dtype=np.uint8)
+        self.positions[self.letter_codes] = np.arange(25, dtype=np.uint8)
+        self.encrypt_table = self._build_table(1)
+        self.decrypt_table = self._build_table(-1)
+
+    def _build_table(self, step):
+        a = np.repeat(np.arange(25), 25)
+        b = np.tile(np.arange(25), 25)
+        r1, c1 = divmod(a, 5)
+        r2, c2 = divmod(b, 5)
+        same_row = r1 == r2
+        same_col = (c1 == c2) & ~same_row
+        out_a = np.where(same_row, r1 * 5 + (c1 + step) % 5,
+                np.where(same_col, (r1 + step) % 5 * 5 + c1, r1 * 5 + c2))
+        out_b = np.where(same_row, r2 * 5 + (c2 + step) % 5,
+                np.where(same_col, (r2 + step) % 5 * 5 + c2, r2 * 5 + c1))
+        return self.letter_codes[np.stack([out_a, out_b], axis=1)]
+
+    def apply(self, first, second, table):
+        """Map digraph arrays (ASCII codes) through table and return the output codes."""
+        pos_a = self.positions[first]
+        pos_b = self.positions[second]
+        if (pos_a == 255).any() or (pos_b == 255).any():
+            raise ValueError("Playfair Cipher text contains letters that are not in the key square.")
+        return table[pos_a.astype(np.intp) * 25 + pos_b].ravel()
 
 class PlayfairCipher:
     @staticmethod
     def _format_key(key):
         key = ''.join([c.upper() for c in key if c.isalpha()])
         seen = set()
-        result = ''
+        result = []
         for c in key:
             if c == 'J': c = 'I'
             if c not in seen:
                 seen.add(c)
-                result += c
+                result.append(c)
         for c in 'ABCDEFGHIKLMNOPQRSTUVWXYZ':
             if c not in seen:
-                result += c
+                result.append(c)
+        result = ''.join(result)
         return [result[i*5:(i+1)*5] for i in range(5)]
 
     @staticmethod
-    def _find_position(matrix, char):
-        for i, row in enumerate(matrix):
-            if char in row:
-                return i, row.index(char)
-        return None
+    @lru_cache(maxsize=64)
+    def _square(key):
+        return _PlayfairSquare(key)
+
+    @staticmethod
+    def _letters(text):
+        """Upper-cased letters of text as a uint8 array of ASCII codes."""
+        letters = _upper_letter_codes(text)
+        if letters.dtype != np.uint8:
+            raise ValueError("Playfair Cipher only supports letters A-Z.")
+        return letters
+
+    @staticmethod
+    def _digraph_starts(letters):
+        """
+        Mask of the prepared letters that start a Playfair digraph.
+
+        A letter starts a digraph unless the previous letter started one and
+        paired with it. Inside a run of repeated letters every letter starts a
+        digraph (padded with 'X'); only the first letter of a run can be
+        absorbed, and that alternates along stretches of single-letter runs, so
+        the start positions come from run boundaries instead of a character
+        loop.
+        """
+        n = len(letters)
+        run_starts = np.flatnonzero(np.r_[True, letters[1:] != letters[:-1]])
+        run_lengths = np.diff(np.r_[run_starts, n])
+        # A run longer than one letter always ends with a digraph start, so the
+        # next run's first letter is absorbed; between such resets it alternates.
+        k = np.arange(len(run_starts), dtype=np.int32)
+        reset = np.r_[True, run_lengths[:-1] >= 2]
+        anchor = np.maximum.accumulate(np.where(reset, k, 0))
+        is_start = np.ones(n, dtype=bool)
+        is_start[run_starts] = ((k - anchor) & 1).astype(bool) ^ (anchor == 0)
+        return is_start
+
+    @staticmethod
+    def _digraphs(letters):
+        """
+        Split prepared letters into Playfair digraphs in one linear pass.
+
+        Args:
+            letters (np.ndarray): uint8 array of upper-case letters, J already folded to I
+
+        Returns:
+            tuple: (first, second) uint8 arrays with the letters of each digraph
+        """
+        n = len(letters)
+        if n == 0:
+            return letters, letters
+        is_start = PlayfairCipher._digraph_starts(letters)
+        # A start pairs with the next letter when that letter was absorbed
+        absorbed_next = np.r_[~is_start[1:], False]
+        second = np.where(absorbed_next, np.r_[letters[1:], ord('X')], ord('X')).astype(np.uint8)
+        return letters[is_start], second[is_start]
 
     @staticmethod
     def _process_text(text):
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        text = text.replace('J', 'I')
-        i = 0
-        result = ''
-        while i < len(text):
-            a = text[i]
-            b = text[i+1] if i+1 < len(text) else 'X'
-            if a == b:
-                result += a + 'X'
-                i += 1
-            else:
-                result += a + b
-                i += 2
-        if len(result) % 2 != 0:
-            result += 'X'
-        return result
+        letters = PlayfairCipher._letters(text)
+        letters[letters == ord('J')] = ord('I')
+        first, second = PlayfairCipher._digraphs(letters)
+        return np.stack([first, second], axis=1).tobytes().decode('ascii')
 
     @staticmethod
     def encrypt(text, key):
         if not key:
             raise ValueError("Playfair Cipher requires a key.")
-        matrix = PlayfairCipher._format_key(key)
-        text = PlayfairCipher._process_text(text)
-        result = ''
-        for i in range(0, len(text), 2):
-            a, b = text[i], text[i+1]
-            r1, c1 = PlayfairCipher._find_position(matrix, a)
-            r2, c2 = PlayfairCipher._find_position(matrix, b)
-            if r1 == r2:
-                result += matrix[r1][(c1+1)%5] + matrix[r2][(c2+1)%5]
-            elif c1 == c2:
-                result += matrix[(r1+1)%5][c1] + matrix[(r2+1)%5][c2]
-            else:
-                result += matrix[r1][c2] + matrix[r2][c1]
-        return result
+        square = PlayfairCipher._square(key)
+        letters = PlayfairCipher._letters(text)
+        letters[letters == ord('J')] = ord('I')
+        first, second = PlayfairCipher._digraphs(letters)
+        return _codes_output(square.apply(first, second, square.encrypt_table), text)
 
     @staticmethod
     def decrypt(text, key):
         if not key:
             raise ValueError("Playfair Cipher requires a key.")
-        matrix = PlayfairCipher._format_key(key)
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        result = ''
-        for i in range(0, len(text), 2):
-            a, b = text[i], text[i+1]
-            r1, c1 = PlayfairCipher._find_position(matrix, a)
-            r2, c2 = PlayfairCipher._find_position(matrix, b)
-            if r1 == r2:
-                result += matrix[r1][(c1-1)%5] + matrix[r2][(c2-1)%5]
-            elif c1 == c2:
-                result += matrix[(r1-1)%5][c1] + matrix[(r2-1)%5][c2]
+        square = PlayfairCipher._square(key)
+        letters = PlayfairCipher._letters(text)
+        if len(letters) % 2 != 0:
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+        return _codes_output(square.apply(letters[0::2], letters[1::2], square.decrypt_table), text)
+
+    @staticmethod
+    def _encrypt_stream(chunks, square):
+        """
+        Digraphs are final as soon as the letter after their start is known,
+        so only a last letter that starts a digraph is held back: whether it
+        pairs with the next letter or with a padding 'X' depends on the next chunk.
+        """
+        pending = np.empty(0, dtype=np.uint8)
+        for chunk in chunks:
+            letters = np.concatenate((pending, PlayfairCipher._letters(chunk)))
+            letters[letters == ord('J')] = ord('I')
+            if len(letters) and PlayfairCipher._digraph_starts(letters)[-1]:
+                letters, pending = letters[:-1], letters[-1:]
             else:
-                result += matrix[r1][c2] + matrix[r2][c1]
-        return result
+                pending = letters[:0]
+            if len(letters):
+                first, second = PlayfairCipher._digraphs(letters)
+                yield _codes_output(square.apply(first, second, square.encrypt_table), chunk)
+        if len(pending):
+            first, second = PlayfairCipher._digraphs(pending)
+            yield _codes_output(square.apply(first, second, square.encrypt_table), chunk)
+
+    @staticmethod
+    def _decrypt_stream(chunks, square):
+        """Decrypt whole digraphs per chunk; an odd letter waits for the next chunk."""
+        pending = np.empty(0, dtype=np.uint8)
+        for chunk in chunks:
+            letters = np.concatenate((pending, PlayfairCipher._letters(chunk)))
+            usable = len(letters) & ~1
+            letters, pending = letters[:usable], letters[usable:]
+            if usable:
+                yield _codes_output(square.apply(letters[0::2], letters[1::2], square.decrypt_table), chunk)
+        if len(pending):
+            raise ValueError("Playfair ciphertext must contain an even number of letters.")
+
+    @staticmethod
+    def encrypt_stream(chunks, key):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        if not key:
+            raise ValueError("Playfair Cipher requires a key.")
+        return PlayfairCipher._encrypt_stream(chunks, PlayfairCipher._square(key))
+
+    @staticmethod
+    def decrypt_stream(chunks, key):
+        if not key:
+            raise ValueError("Playfair Cipher requires a key.")
+        return PlayfairCipher._decrypt_stream(chunks, PlayfairCipher._square(key))
 
 class RailFenceCipher:
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _cycle_columns(rails):
+        """
+        The 2*(rails-1) columns of one zig-zag cycle in rail order:
+        0, then r and cycle-r for each middle rail r, then rails-1.
+        """
+        cycle = 2 * (rails - 1)
+        middle = np.arange(1, rails - 1, dtype=np.int32)
+        columns = np.concatenate(([0], np.column_stack((middle, cycle - middle)).ravel(), [rails - 1]))
+        columns = columns.astype(np.int32)
+        columns.flags.writeable = False
+        return columns
+
+    @staticmethod
+    def _order(length, rails):
+        """
+        Ciphertext order for a (length, rails) pair: ciphertext[k] = text[order[k]].
+
+        The zig-zag repeats every 2*(rails-1) characters, so laying the
+        positions out in rows of one cycle puts rail r in columns r and
+        cycle-r. Reading the columns rail by rail gives the permutation
+        directly, without walking the fence. Only the per-cycle column
+        order is cached; the full-length order is built for each call.
+        """
+        cycle = 2 * (rails - 1)
+        n_rows = -(-length // cycle)
+        dtype = np.int32 if length < 2**31 else np.int64
+        positions = np.arange(0, n_rows * cycle, cycle, dtype=dtype)[:, None] \
+            + RailFenceCipher._cycle_columns(rails)
+        middle = positions[:, 1:-1].reshape(n_rows, rails - 2, 2).transpose(1, 0, 2).ravel()
+        order = np.concatenate((positions[:, 0], middle, positions[:, -1]))
+        return order[order < length]
+
     @staticmethod
     def encrypt(text, key):
         if not key or not str(key).isdigit() or int(key) < 2:
             raise ValueError("Rail Fence Cipher requires a numeric key >= 2.")
-        key = int(key)
-        rails = ['' for _ in range(key)]
-        rail = 0
-        direction = 1
-        for char in text:
-            rails[rail] += char
-            rail += direction
-            if rail == 0 or rail == key-1:
-                direction *= -1
-        return ''.join(rails)
+        codes = _text_codes(text)
+        return _codes_output(codes[RailFenceCipher._order(len(codes), int(key))], text)
 
     @staticmethod
     def decrypt(text, key):
         if not key or not str(key).isdigit() or int(key) < 2:
             raise ValueError("Rail Fence Cipher requires a numeric key >= 2.")
-        key = int(key)
-        pattern = [0] * len(text)
-        rail = 0
-        direction = 1
-        for i in range(len(text)):
-            pattern[i] = rail
-            rail += direction
-            if rail == 0 or rail == key-1:
-                direction *= -1
-        rails = ['' for _ in range(key)]
-        idx = 0
-        for r in range(key):
-            for i in range(len(text)):
-                if pattern[i] == r:
-                    rails[r] += text[idx]
-                    idx += 1
-        result = ''
-        rail_indices = [0]*key
-        for i in range(len(text)):
-            r = pattern[i]
-            result += rails[r][rail_indices[r]]
-            rail_indices[r] += 1
-        return result
+        codes = _text_codes(text)
+        result = np.empty_like(codes)
+        result[RailFenceCipher._order(len(codes), int(key))] = codes
+        return _codes_output(result, text)
+
+    @staticmethod
+    def encrypt_stream(chunks, key):
+        """
+        encrypt() over an iterable of chunks. The zig-zag spans the whole
+        message, so the chunks are collected and encrypted at the end.
+        """
+        return _whole_message_stream(chunks, lambda text: RailFenceCipher.encrypt(text, key))
+
+    @staticmethod
+    def decrypt_stream(chunks, key):
+        return _whole_message_stream(chunks, lambda text: RailFenceCipher.decrypt(text, key))
 
 class RowTranspositionCipher:
     @staticmethod
-    def encrypt(text, key):
+    @lru_cache(maxsize=64)
+    def _column_order(key):
+        """Columns in reading order for a key like '3 1 2' (ties keep their position)."""
         if not key or not all(k.isdigit() for k in key.split()):
             raise ValueError("Row Transposition Cipher requires a numeric key (space-separated numbers, e.g. '3 1 2').")
         key_list = [int(k) for k in key.split()]
-        n_cols = len(key_list)
-        text = text.replace(' ', '')
-        while len(text) % n_cols != 0:
-            text += 'X'
-        matrix = [text[i:i+n_cols] for i in range(0, len(text), n_cols)]
-        result = ''
-        for k in sorted((num, idx) for idx, num in enumerate(key_list)):
-            col = k[1]
-            for row in matrix:
-                result += row[col]
-        return result
+        return np.argsort(np.array(key_list), kind='stable')
+
+    @staticmethod
+    def encrypt(text, key):
+        order = RowTranspositionCipher._column_order(key)
+        n_cols = len(order)
+        codes = _text_codes(text)
+        codes = codes[codes != ord(' ')]
+        grid = np.full(-(-len(codes) // n_cols) * n_cols, ord('X'), dtype=codes.dtype)
+        grid[:len(codes)] = codes
+        return _codes_output(grid.reshape(-1, n_cols).T[order].ravel(), text)
 
     @staticmethod
     def decrypt(text, key):
-        if not key or not all(k.isdigit() for k in key.split()):
-            raise ValueError("Row Transposition Cipher requires a numeric key (space-separated numbers, e.g. '3 1 2').")
-        key_list = [int(k) for k in key.split()]
-        n_cols = len(key_list)
-        n_rows = len(text) // n_cols
-        matrix = [['']*n_cols for _ in range(n_rows)]
-        idx = 0
-        for k in sorted((num, idx) for idx, num in enumerate(key_list)):
-            col = k[1]
-            for row in range(n_rows):
-                matrix[row][col] = text[idx]
-                idx += 1
-        result = ''.join(''.join(row) for row in matrix)
-        return result.rstrip('X')
+        order = RowTranspositionCipher._column_order(key)
+        n_cols = len(order)
+        codes = _text_codes(text)
+        n_rows = len(codes) // n_cols
+        columns = codes[:n_rows * n_cols].reshape(n_cols, n_rows)
+        grid = np.empty((n_rows, n_cols), dtype=codes.dtype)
+        grid[:, order] = columns.T
+        result = _codes_output(grid.ravel(), text)
+        return result.rstrip('X' if isinstance(result, str) else b'X')
+
+    @staticmethod
+    def encrypt_stream(chunks, key):
+        """
+        encrypt() over an iterable of chunks. Columns are read across the
+        whole message, so the chunks are collected and encrypted at the end.
+        """
+        return _whole_message_stream(chunks, lambda text: RowTranspositionCipher.encrypt(text, key))
+
+    @staticmethod
+    def decrypt_stream(chunks, key):
+        return _whole_message_stream(chunks, lambda text: RowTranspositionCipher.decrypt(text, key))
 
 class HillCipher:
+    # Blocks multiplied per NumPy pass; bounds the int64 temporaries on large inputs
+    BATCH_BLOCKS = 1 << 16
+
     @staticmethod
-    def encrypt(text, key):
+    @lru_cache(maxsize=32)
+    def _key_matrix(key):
+        """Parse a key like '3,3,2,5' into an (n, n) int64 matrix reduced mod 26."""
         if not key:
             raise ValueError("Hill Cipher requires a key (comma-separated numbers, e.g. '3,3,2,5').")
         key_nums = [int(x) for x in key.split(',') if x.strip().isdigit()]
         n = int(len(key_nums) ** 0.5)
-        if n*n != len(key_nums):
+        if n == 0 or n*n != len(key_nums):
             raise ValueError("Hill Cipher key must form a square matrix.")
-        key_matrix = np.array(key_nums).reshape((n, n))
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        while len(text) % n != 0:
-            text += 'X'
-        result = ''
-        for i in range(0, len(text), n):
-            block = [ord(c) - ord('A') for c in text[i:i+n]]
-            enc = np.dot(key_matrix, block) % 26
-            result += ''.join(chr(e + ord('A')) for e in enc)
-        return result
+        return np.array(key_nums, dtype=np.int64).reshape((n, n)) % 26
+
+    @staticmethod
+    def _inverse_mod_prime(matrix, p):
+        """Gauss-Jordan inverse of an integer matrix over GF(p), or None if singular."""
+        n = len(matrix)
+        rows = [[int(x) % p for x in row] + [int(i == j) for j in range(n)]
+                for i, row in enumerate(matrix)]
+        for col in range(n):
+            pivot = next((r for r in range(col, n) if rows[r][col]), None)
+            if pivot is None:
+                return None
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            inv = pow(rows[col][col], -1, p)
+            rows[col] = [x * inv % p for x in rows[col]]
+            for r in range(n):
+                factor = rows[r][col]
+                if r != col and factor:
+                    rows[r] = [(x - factor * y) % p for x, y in zip(rows[r], rows[col])]
+        return np.array([row[n:] for row in rows], dtype=np.int64)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _inverse_matrix(key):
+        """
+        Exact inverse of the key matrix over Z_26.
+
+        Z_26 is not a field, so the inverse is found over GF(2) and GF(13)
+        and combined with the Chinese remainder theorem
+        (x = 13a + 14b mod 26). Everything stays in integers, so any matrix
+        size works without floating point error.
+        """
+        matrix = HillCipher._key_matrix(key)
+        inv2 = HillCipher._inverse_mod_prime(matrix, 2)
+        inv13 = HillCipher._inverse_mod_prime(matrix, 13)
+        if inv2 is None or inv13 is None:
+            raise ValueError("Hill Cipher key matrix is not invertible mod 26.")
+        return (13 * inv2 + 14 * inv13) % 26
+
+    @staticmethod
+    def _multiply(matrix, letters):
+        """Multiply every n-letter block by matrix mod 26; letters and the result hold codes of A-Z."""
+        n = len(matrix)
+        values = (letters.astype(np.int64) - ord('A')) % 26
+        blocks = values.reshape(-1, n)
+        result = np.empty(blocks.shape, dtype=np.uint8)
+        for pos in range(0, len(blocks), HillCipher.BATCH_BLOCKS):
+            batch = blocks[pos:pos + HillCipher.BATCH_BLOCKS]
+            # (n, n) @ (n, blocks), transposed back to one block per row
+            result[pos:pos + len(batch)] = (matrix @ batch.T % 26).T
+        return result.ravel() + ord('A')
+
+    @staticmethod
+    def encrypt(text, key):
+        key_matrix = HillCipher._key_matrix(key)
+        n = len(key_matrix)
+        letters = _upper_letter_codes(text)
+        padded = np.full(-(-len(letters) // n) * n, ord('X'), dtype=letters.dtype)
+        padded[:len(letters)] = letters
+        return _codes_output(HillCipher._multiply(key_matrix, padded), text)
 
     @staticmethod
     def decrypt(text, key):
-        if not key:
-            raise ValueError("Hill Cipher requires a key (comma-separated numbers, e.g. '3,3,2,5').")
-        key_nums = [int(x) for x in key.split(',') if x.strip().isdigit()]
-        n = int(len(key_nums) ** 0.5)
-        if n*n != len(key_nums):
-            raise ValueError("Hill Cipher key must form a square matrix.")
-        key_matrix = np.array(key_nums).reshape((n, n))
-        det = int(round(np.linalg.det(key_matrix)))
-        det_inv = pow(det, -1, 26)
-        key_matrix_inv = (det_inv * np.round(det * np.linalg.inv(key_matrix)).astype(int) % 26)
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        result = ''
-        for i in range(0, len(text), n):
-            block = [ord(c) - ord('A') for c in text[i:i+n]]
-            dec = np.dot(key_matrix_inv, block) % 26
-            result += ''.join(chr(int(round(e)) + ord('A')) for e in dec)
-        return result
+        key_matrix_inv = HillCipher._inverse_matrix(key)
+        n = len(key_matrix_inv)
+        letters = _upper_letter_codes(text)
+        if len(letters) % n != 0:
+            raise ValueError(f"Hill Cipher ciphertext length must be a multiple of {n} (matrix size).")
+        return _codes_output(HillCipher._multiply(key_matrix_inv, letters), text)
+
+    @staticmethod
+    def _stream(chunks, matrix, pad):
+        """Multiply the complete blocks of each chunk; a partial block waits for the next chunk."""
+        n = len(matrix)
+        pending = np.empty(0, dtype=np.uint8)
+        chunk = None
+        for chunk in chunks:
+            letters = np.concatenate((pending, _upper_letter_codes(chunk)))
+            usable = len(letters) - len(letters) % n
+            letters, pending = letters[:usable], letters[usable:]
+            if usable:
+                yield _codes_output(HillCipher._multiply(matrix, letters), chunk)
+        if len(pending):
+            if not pad:
+                raise ValueError(f"Hill Cipher ciphertext length must be a multiple of {n} (matrix size).")
+            padded = np.full(n, ord('X'), dtype=pending.dtype)
+            padded[:len(pending)] = pending
+            yield _codes_output(HillCipher._multiply(matrix, padded), chunk)
+
+    @staticmethod
+    def encrypt_stream(chunks, key):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        return HillCipher._stream(chunks, HillCipher._key_matrix(key), True)
+
+    @staticmethod
+    def decrypt_stream(chunks, key):
+        return HillCipher._stream(chunks, HillCipher._inverse_matrix(key), False)
 
 class SubstitutionCipher:
     @staticmethod
-    def encrypt(text, key):
+    def encrypt(text, key, alphabet=None):
+        """Substitute letters with key; with an alphabet, key is a permutation of its letters."""
+        if alphabet is not None:
+            return alphabet.substitute(text, key)
         if not key or len(key) != 26 or not key.isalpha():
             raise ValueError("Substitution Cipher requires a 26-letter key.")
-        key = key.upper()
-        table = {chr(i+ord('A')): key[i] for i in range(26)}
-        result = ''
-        for c in text:
-            if c.isalpha():
-                up = c.isupper()
-                sub = table[c.upper()]
-                result += sub if up else sub.lower()
-            else:
-                result += c
-        return result
+        enc_table, _ = _substitution_tables(key.upper())
+        return _translate(text, enc_table)
 
     @staticmethod
-    def decrypt(text, key):
+    def decrypt(text, key, alphabet=None):
+        if alphabet is not None:
+            return alphabet.substitute(text, key, inverse=True)
         if not key or len(key) != 26 or not key.isalpha():
             raise ValueError("Substitution Cipher requires a 26-letter key.")
-        key = key.upper()
-        table = {key[i]: chr(i+ord('A')) for i in range(26)}
-        result = ''
-        for c in text:
-            if c.isalpha():
-                up = c.isupper()
-                sub = table[c.upper()]
-                result += sub if up else sub.lower()
-            else:
-                result += c
-        return result
+        _, dec_table = _substitution_tables(key.upper())
+        return _translate(text, dec_table)
+
+    @staticmethod
+    def encrypt_stream(chunks, key, alphabet=None):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        return _map_stream(chunks, lambda chunk: SubstitutionCipher.encrypt(chunk, key, alphabet))
+
+    @staticmethod
+    def decrypt_stream(chunks, key, alphabet=None):
+        return _map_stream(chunks, lambda chunk: SubstitutionCipher.decrypt(chunk, key, alphabet))
 
 class VigenereCipher:
+    # Bytes processed per NumPy pass; keeps the temporary arrays cache-sized
+    BLOCK_SIZE = 1 << 18
+
     @staticmethod
-    def encrypt(text, key):
-        if not key or not key.isalpha():
-            raise ValueError("Vigenère Cipher requires an alphabetic key.")
-        key = key.upper()
-        result = ''
-        j = 0
+    @lru_cache(maxsize=64)
+    def _key_shifts(key, sign):
+        """Per-character shifts (0-25) of an upper-case key as a uint8 array.
+
+        Decryption uses the additive inverse so both directions are a plain add.
+        """
+        return np.array([sign * (ord(k) - ord('A')) % 26 for k in key], dtype=np.uint8)
+
+    @staticmethod
+    def _shift_ascii(data, shifts, j=0):
+        """
+        Shift the ASCII letters of a uint8 array by the Vigenère key stream.
+
+        Letters are gathered with a mask, so the n-th letter always meets key
+        character (j + n) % len(key) and non-letters never advance the key.
+        Reshaping the gathered letters to (-1, len(key)) lines every row up
+        with the key, so the key stream is a broadcast add with no per-letter
+        index arithmetic.
+
+        Args:
+            data (np.ndarray): uint8 array of ASCII codes
+            shifts (np.ndarray): per-key-character shifts from _key_shifts
+            j (int): number of letters already processed before data
+
+        Returns:
+            tuple: (uint8 output array, letter count after data)
+        """
+        out = data.copy()
+        n_key = len(shifts)
+        for pos in range(0, len(data), VigenereCipher.BLOCK_SIZE):
+            chunk = data[pos:pos + VigenereCipher.BLOCK_SIZE]
+            # Lower-casing with 0x20 folds both cases; anything else wraps above 25
+            letters = ((chunk | 0x20) - ord('a')) < 26
+            vals = chunk[letters]
+            count = len(vals)
+            base = (vals & 0x20) | ord('A')
+            padded = np.zeros(count + (-count) % n_key, dtype=np.uint8)
+            padded[:count] = vals - base
+            padded.reshape(-1, n_key)[...] += np.roll(shifts, -(j % n_key))
+            padded -= 26 * (padded >= 26).view(np.uint8)
+            out[pos:pos + len(chunk)][letters] = padded[:count] + base
+            j += count
+        return out, j
+
+    @staticmethod
+    def _shift_text(text, key, sign, j=0, alphabet=None):
+        """Shift text by the key stream starting at letter j; returns (output, letter count after text)."""
+        if alphabet is not None:
+            return alphabet.vigenere(text, key, sign, j)
+        if not isinstance(text, str):
+            out, j = VigenereCipher._shift_ascii(_ascii_codes(text), VigenereCipher._key_shifts(key, sign), j)
+            return out.tobytes(), j
+        if text.isascii():
+            data = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            out, j = VigenereCipher._shift_ascii(data, VigenereCipher._key_shifts(key, sign), j)
+            return out.tobytes().decode('ascii'), j
+        # Non-ASCII letters keep the original per-character arithmetic
+        result = []
         for c in text:
             if c.isalpha():
                 shift = ord(key[j % len(key)]) - ord('A')
                 base = ord('A') if c.isupper() else ord('a')
-                result += chr((ord(c) - base + shift) % 26 + base)
+                result.append(chr((ord(c) - base + sign * shift) % 26 + base))
                 j += 1
             else:
-                result += c
-        return result
+                result.append(c)
+        return ''.join(result), j
 
     @staticmethod
-    def decrypt(text, key):
+    def _shift_stream(chunks, key, sign, alphabet=None):
+        """Shift chunks one after another, carrying the key index across chunk boundaries."""
+        j = 0
+        for chunk in chunks:
+            out, j = VigenereCipher._shift_text(chunk, key, sign, j, alphabet)
+            if len(out):
+                yield out
+
+    @staticmethod
+    def _key(key, alphabet):
+        """Checked key: upper-cased for A-Z, as given for an alphabet (which checks its own letters)."""
+        if alphabet is not None:
+            alphabet.positions(key)
+            if not key:
+                raise ValueError("Vigenère Cipher requires a key.")
+            return key
         if not key or not key.isalpha():
             raise ValueError("Vigenère Cipher requires an alphabetic key.")
-        key = key.upper()
-        result = ''
-        j = 0
-        for c in text:
-            if c.isalpha():
-                shift = ord(key[j % len(key)]) - ord('A')
-                base = ord('A') if c.isupper() else ord('a')
-                result += chr((ord(c) - base - shift) % 26 + base)
-                j += 1
-            else:
-                result += c
-        return result
+        return key.upper()
 
-class ChrisWayV1Cipher:
     @staticmethod
-    def encrypt(text, key=None):
-        if not all(c.isalpha() or c.isspace() for c in text):
-            raise ValueError("Input must contain only alphabetic characters and spaces.")
-        
-        text = ''.join(c for c in text if c.isalpha()).upper()
-        if not text:
-            return ""
-        
-        shifted = []
-        for i, char in enumerate(text):
-            base = ord('A')
-            if i % 2 == 0:
-                shift = i * 2
-            else:
-                shift = i + 3
-            shifted_char = chr((ord(char) - base + shift) % 26 + base)
-            shifted.append(shifted_char)
-        
-        # Swap characters: first with last, second with second-last, etc.
-        n = len(shifted)
-        swapped = [shifted[n - 1 - i] for i in range(n)]
-        return ''.join(swapped)
+    def encrypt(text, key, alphabet=None):
+        """Vigenère over A-Z, or over alphabet (an alphabets.Alphabet) if given."""
+        return VigenereCipher._shift_text(text, VigenereCipher._key(key, alphabet), 1, 0, alphabet)[0]
 
     @staticmethod
-    def decrypt(text, key=None):
-        if not text or not all(c.isalpha() for c in text):
-            raise ValueError("Encrypted text must contain only alphabetic characters.")
-        
-        text = text.upper()
-        # Reverse the character swap
-        n = len(text)
-        reversed_swapped = [text[n - 1 - i] for i in range(n)]
-        
-        result = []
-        for i, char in enumerate(reversed_swapped):
-            base = ord('A')
-            if i % 2 == 0:
-                shift = i * 2
-            else:
-                shift = i + 3
-            original_char = chr((ord(char) - base - shift) % 26 + base)
-            result.append(original_char)
-        
-        return ''.join(result)
+    def decrypt(text, key, alphabet=None):
+        return VigenereCipher._shift_text(text, VigenereCipher._key(key, alphabet), -1, 0, alphabet)[0]
+
+    @staticmethod
+    def encrypt_stream(chunks, key, alphabet=None):
+        """encrypt() over an iterable of str or ASCII bytes chunks, yielding output chunks."""
+        return VigenereCipher._shift_stream(chunks, VigenereCipher._key(key, alphabet), 1, alphabet)
+
+    @staticmethod
+    def decrypt_stream(chunks, key, alphabet=None):
+        return VigenereCipher._shift_stream(chunks, VigenereCipher._key(key, alphabet), -1, alphabet)
+
+class ChrisWayV1Cipher:
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _shift_schedule(sign):
+        """
+        Position shifts for one period of the V1 schedule.
+
+        Even indices shift by i * 2 and odd indices by i + 3; both repeat
+        every 26 positions mod 26. Decryption uses the additive inverse.
+        """
+        i = np.arange(26)
+        shifts = np.where(i % 2 == 0, i * 2, i + 3)
+        return (sign * shifts % 26).astype(np.uint8)
 
     @staticmethod
     def encrypt(text, key=None):
@@ -382,34 +840,18 @@ class ChrisWayV1Cipher:
         Returns:
             str: Encrypted text
         """
-        # Validate input - only alphabetic characters
-        if not all(c.isalpha() or c.isspace() for c in text):
+        # Validate input - only alphabetic characters and spaces
+        letters = _strip_spaces(text)
+        if letters is None:
             raise ValueError("Input must contain only alphabetic characters and spaces.")
         
-        # Remove spaces and convert to uppercase
-        text = ''.join(c for c in text if c.isalpha()).upper()
-        
-        if not text:
-            return ""
+        if not len(letters):
+            return "" if isinstance(text, str) else b""
             
-        # Step 1: Apply shifts based on position
-        shifted = []
-        for i, char in enumerate(text):
-            if i % 2 == 0:  # Even index
-                shift = i * 2
-            else:  # Odd index
-                shift = i + 3
-            
-            # Apply shift (ASCII of 'A' is 65)
-            shifted_val = (ord(char) - ord('A') + shift) % 26
-            shifted.append(chr(shifted_val + ord('A')))
-        
-        # Step 2: Swap characters
-        result = list(shifted)
-        for i in range(len(result) // 2):
-            result[i], result[len(result) - 1 - i] = result[len(result) - 1 - i], result[i]
-        
-        return ''.join(result)
+        # Shift by position, then swap by reversing the whole text
+        codes = _upper_codes(letters)
+        shifted = _shift_by_schedule(codes, ChrisWayV1Cipher._shift_schedule(1))
+        return _codes_output(shifted[::-1], text)
     
     @staticmethod
     def decrypt(text, key=None):
@@ -423,30 +865,28 @@ class ChrisWayV1Cipher:
         Returns:
             str: Decrypted text
         """
-        if not all(c.isalpha() for c in text):
+        if not _is_alpha(text):
             raise ValueError("Ciphertext must contain only alphabetic characters.")
             
-        if not text:
-            return ""
-            
-        # Step 1: Reverse the swaps
-        result = list(text)
-        for i in range(len(result) // 2):
-            result[i], result[len(result) - 1 - i] = result[len(result) - 1 - i], result[i]
-        
-        # Step 2: Reverse the shifts
-        decrypted = []
-        for i, char in enumerate(result):
-            if i % 2 == 0:  # Even index
-                shift = i * 2
-            else:  # Odd index
-                shift = i + 3
+        if not len(text):
+            return "" if isinstance(text, str) else b""
             
-            # Reverse the shift
-            decrypted_val = (ord(char) - ord('A') - shift) % 26
-            decrypted.append(chr(decrypted_val + ord('A')))
-        
-        return ''.join(decrypted)
+        # Undo the swap, then undo the position shifts
+        codes = _text_codes(text)[::-1]
+        return _codes_output(_shift_by_schedule(codes, ChrisWayV1Cipher._shift_schedule(-1)), text)
+
+    @staticmethod
+    def encrypt_stream(chunks, key=None):
+        """
+        encrypt() over an iterable of chunks. Shifts use a running position
+        count, but the final swap reverses the whole message, so the shifted
+        chunks are kept until the input ends.
+        """
+        return _chris_way_encrypt_stream(chunks, ChrisWayV1Cipher._shift_schedule(1))
+
+    @staticmethod
+    def decrypt_stream(chunks, key=None):
+        return _chris_way_decrypt_stream(chunks, ChrisWayV1Cipher._shift_schedule(-1))
 
 class ChrisWayV2Cipher:
     @staticmethod
@@ -458,6 +898,21 @@ class ChrisWayV2Cipher:
             raise ValueError("Key must contain only alphabetic characters.")
         if len(key) < 3:
             raise ValueError("Key should be at least 3 characters long for security.")
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _shift_schedule(key, sign):
+        """
+        Position shifts for one period of the V2 schedule of an upper-case key.
+
+        The shift at index i is (key[i % len(key)] - 'A' + i) % 26, which
+        repeats every lcm(len(key), 26) positions. Decryption uses the
+        additive inverse.
+        """
+        period = len(key) * 26 // math.gcd(len(key), 26)
+        i = np.arange(period)
+        key_shifts = np.array([ord(k) - ord('A') for k in key], dtype=np.int64)
+        return (sign * (key_shifts[i % len(key)] + i) % 26).astype(np.uint8)
     
     @staticmethod
     def encrypt(text, key):
@@ -474,37 +929,19 @@ class ChrisWayV2Cipher:
             str: Encrypted text
         """
         # Validate input
-        if not all(c.isalpha() or c.isspace() for c in text):
+        letters = _strip_spaces(text)
+        if letters is None:
             raise ValueError("Input must contain only alphabetic characters and spaces.")
         
         ChrisWayV2Cipher.validate_key(key)
         
-        # Remove spaces and convert to uppercase
-        text = ''.join(c for c in text if c.isalpha()).upper()
-        key = key.upper()
-        
-        if not text:
-            return ""
+        if not len(letters):
+            return "" if isinstance(text, str) else b""
             
-        # Step 1: Generate shifts from public key
-        shifts = []
-        for i in range(len(text)):
-            key_char = key[i % len(key)]
-            shift = (ord(key_char) - ord('A') + i) % 26
-            shifts.append(shift)
-        
-        # Step 2: Apply shifts
-        shifted = []
-        for i, char in enumerate(text):
-            shifted_val = (ord(char) - ord('A') + shifts[i]) % 26
-            shifted.append(chr(shifted_val + ord('A')))
-        
-        # Step 3: Swap characters
-        result = list(shifted)
-        for i in range(len(result) // 2):
-            result[i], result[len(result) - 1 - i] = result[len(result) - 1 - i], result[i]
-        
-        return ''.join(result)
+        # Apply the key's shift schedule, then swap by reversing the whole text
+        codes = _upper_codes(letters)
+        shifted = _shift_by_schedule(codes, ChrisWayV2Cipher._shift_schedule(key.upper(), 1))
+        return _codes_output(shifted[::-1], text)
     
     @staticmethod
     def decrypt(text, key):
@@ -519,35 +956,357 @@ class ChrisWayV2Cipher:
             str: Decrypted text
         """
         # Validate input
-        if not all(c.isalpha() for c in text):
+        if not _is_alpha(text):
             raise ValueError("Ciphertext must contain only alphabetic characters.")
         
         ChrisWayV2Cipher.validate_key(key)
         
-        if not text:
-            return ""
+        if not len(text):
+            return "" if isinstance(text, str) else b""
             
-        key = key.upper()
-        
-        # Step 1: Reverse the swaps
-        result = list(text)
-        for i in range(len(result) // 2):
-            result[i], result[len(result) - 1 - i] = result[len(result) - 1 - i], result[i]
-        
-        # Step 2: Generate shifts from private key
-        shifts = []
-        for i in range(len(text)):
-            key_char = key[i % len(key)]
-            shift = (ord(key_char) - ord('A') + i) % 26
-            shifts.append(shift)
-        
-        # Step 3: Reverse the shifts
-        decrypted = []
-        for i, char in enumerate(result):
-            decrypted_val = (ord(char) - ord('A') - shifts[i]) % 26
-            decrypted.append(chr(decrypted_val + ord('A')))
-        
-        return ''.join(decrypted)
+        # Undo the swap, then undo the key's shift schedule
+        codes = _text_codes(text)[::-1]
+        return _codes_output(_shift_by_schedule(codes, ChrisWayV2Cipher._shift_schedule(key.upper(), -1)), text)
+
+    @staticmethod
+    def encrypt_stream(chunks, key):
+        """encrypt() over an iterable of chunks; see ChrisWayV1Cipher.encrypt_stream."""
+        ChrisWayV2Cipher.validate_key(key)
+        return _chris_way_encrypt_stream(chunks, ChrisWayV2Cipher._shift_schedule(key.upper(), 1))
+
+    @staticmethod
+    def decrypt_stream(chunks, key):
+        ChrisWayV2Cipher.validate_key(key)
+        return _chris_way_decrypt_stream(chunks, ChrisWayV2Cipher._shift_schedule(key.upper(), -1))
+
+class ParallelCipher:
+    """
+    Chunk-parallel engine for the classical ciphers that only need a running
+    letter count to process any part of the text.
+
+    Caesar, ROT13 and Substitution map every character on its own. Vigenère
+    and the Chris Way ciphers depend on how many letters come before a
+    character, so a first pass counts letters per chunk and a prefix sum
+    gives every chunk its starting key index or position; the Chris Way
+    reversal then only decides where a chunk's output lands. Chunks run on
+    a thread pool (the NumPy passes release the GIL) and write into one
+    preallocated output, so the result is identical to the one-shot call.
+
+    Input is str or ASCII bytes-like data (e.g. an mmap) and the output has
+    the same type. Short or non-ASCII str input, or a single worker, goes to
+    the one-shot cipher.
+    """
+    CIPHERS = (CaesarCipher, Rot13Cipher, SubstitutionCipher, VigenereCipher,
+               ChrisWayV1Cipher, ChrisWayV2Cipher)
+    # Bytes per work item; inputs up to this size are processed in one call
+    CHUNK_SIZE = 16 << 20
+
+    @staticmethod
+    def supports(cipher):
+        return cipher in ParallelCipher.CIPHERS
+
+    @staticmethod
+    def encrypt(cipher, text, key=None, workers=None, chunk_size=None):
+        """
+        cipher.encrypt(text, key) computed chunk by chunk on a thread pool.
+
+        Args:
+            cipher: one of ParallelCipher.CIPHERS
+            text (str or bytes-like): plaintext; bytes-like input must be ASCII
+            key: the cipher's key, None for ROT13 and Chris Way V1
+            workers (int): threads to use, os.cpu_count() by default
+            chunk_size (int): bytes per work item, CHUNK_SIZE by default
+        """
+        return ParallelCipher._run(cipher, text, key, 1, workers, chunk_size)
+
+    @staticmethod
+    def decrypt(cipher, text, key=None, workers=None, chunk_size=None):
+        """cipher.decrypt(text, key) computed chunk by chunk; see encrypt."""
+        return ParallelCipher._run(cipher, text, key, -1, workers, chunk_size)
+
+    @staticmethod
+    def _run(cipher, text, key, sign, workers, chunk_size):
+        if not ParallelCipher.supports(cipher):
+            raise ValueError(f"{cipher.__name__} has no chunk-parallel engine.")
+        one_shot = cipher.encrypt if sign > 0 else cipher.decrypt
+        args = () if key is None else (key,)
+        chunk_size = chunk_size or ParallelCipher.CHUNK_SIZE
+        workers = workers or os.cpu_count() or 1
+        if (workers == 1 or len(text) <= chunk_size
+                or (isinstance(text, str) and not text.isascii())):
+            return one_shot(text, *args)
+        # Validates the key with the cipher's own checks and messages
+        one_shot(text[:0], *args)
+        codes = _text_codes(text)
+        n = len(codes)
+        chunks = [(index, start, min(start + chunk_size, n))
+                  for index, start in enumerate(range(0, n, chunk_size))]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def run(work):
+                """work(index, start, end) for every chunk; list() re-raises the first error."""
+                return list(pool.map(lambda chunk: work(*chunk), chunks))
+
+            if cipher in (CaesarCipher, Rot13Cipher, SubstitutionCipher):
+                out = ParallelCipher._translate(cipher, codes, key, sign, run)
+            elif cipher is VigenereCipher:
+                out = ParallelCipher._vigenere(codes, key, sign, run)
+            elif sign > 0:
+                out = ParallelCipher._chris_way_encrypt(cipher, codes, key, run)
+            else:
+                out = ParallelCipher._chris_way_decrypt(cipher, codes, key, run)
+        return _codes_output(out, text)
+
+    @staticmethod
+    def _translate(cipher, codes, key, sign, run):
+        if cipher is SubstitutionCipher:
+            table = _substitution_tables(key.upper())[0 if sign > 0 else 1]
+        else:
+            shift = 13 if cipher is Rot13Cipher else sign * int(key) % 26
+            table = _shift_table(shift)
+        lut = table.byte_table()
+        out = np.empty_like(codes)
+        run(lambda index, start, end: np.take(lut, codes[start:end], out=out[start:end]))
+        return out
+
+    @staticmethod
+    def _prefix_offsets(counts):
+        """Running totals before each chunk: [0, c0, c0 + c1, ...]."""
+        return np.concatenate(([0], np.cumsum(counts[:-1], dtype=np.int64))).tolist()
+
+    @staticmethod
+    def _vigenere(codes, key, sign, run):
+        shifts = VigenereCipher._key_shifts(key.upper(), sign)
+        counts = run(lambda index, start, end: np.count_nonzero(
+            ((codes[start:end] | 0x20) - ord('a')) < 26))
+        offsets = ParallelCipher._prefix_offsets(counts)
+        out = np.empty_like(codes)
+
+        def work(index, start, end):
+            out[start:end], _ = VigenereCipher._shift_ascii(codes[start:end], shifts, offsets[index])
+
+        run(work)
+        return out
+
+    @staticmethod
+    def _schedule(cipher, key, sign):
+        if cipher is ChrisWayV1Cipher:
+            return ChrisWayV1Cipher._shift_schedule(sign)
+        return ChrisWayV2Cipher._shift_schedule(key.upper(), sign)
+
+    @staticmethod
+    def _chris_way_encrypt(cipher, codes, key, run):
+        """
+        Shift the letters (whitespace removed) by position and reverse the result.
+
+        A chunk whose letters start at position p in the stripped text ends
+        up reversed at out[total - p - count:total - p].
+        """
+        schedule = ParallelCipher._schedule(cipher, key, 1)
+
+        def letters(start, end):
+            chunk = codes[start:end]
+            stripped = chunk[~np.isin(chunk, _ASCII_SPACES)]
+            if not _all_letters(stripped):
+                raise ValueError("Input must contain only alphabetic characters and spaces.")
+            return stripped
+
+        counts = run(lambda index, start, end: len(letters(start, end)))
+        offsets = ParallelCipher._prefix_offsets(counts)
+        total = sum(counts)
+        out = np.empty(total, dtype=np.uint8)
+
+        def work(index, start, end):
+            position = offsets[index]
+            shifted = _shift_by_schedule(letters(start, end) & 0xDF,
+                                         np.roll(schedule, -(position % len(schedule))))
+            out[total - position - counts[index]:total - position] = shifted[::-1]
+
+        run(work)
+        return out
+
+    @staticmethod
+    def _chris_way_decrypt(cipher, codes, key, run):
+        """
+        Reverse the ciphertext and undo the position shifts.
+
+        Input chunk [start, end) becomes output positions [n - end, n - start),
+        so each chunk only needs its schedule offset n - end.
+        """
+        schedule = ParallelCipher._schedule(cipher, key, -1)
+        n = len(codes)
+        out = np.empty_like(codes)
+
+        def work(index, start, end):
+            chunk = codes[start:end]
+            if not _all_letters(chunk):
+                raise ValueError("Ciphertext must contain only alphabetic characters.")
+            out[n - end:n - start] = _shift_by_schedule(
+                chunk[::-1], np.roll(schedule, -((n - end) % len(schedule))))
+
+        run(work)
+        return out
+
+class AESContainer:
+    """
+    Versioned binary layout for AES ciphertexts (messages and files).
+
+    Layout (big-endian):
+
+        magic       4 bytes   b'EPRO'
+        version     1 byte
+        mode        1 byte    1 = GCM, 2 = CTR, 3 = CBC
+        flags       1 byte    bit 0: one tag per chunk instead of one trailing tag
+                              bit 1: key derived from a passphrase (KDF block follows the nonce)
+                              bit 2: chunks use a per-file key and carry their own nonces
+                                     (the header nonce is the key's salt, see aes_files)
+        nonce_len   1 byte
+        tag_len     1 byte
+        chunk_size  4 bytes   plaintext bytes per chunk, 0 for a single unit
+        nonce       nonce_len bytes (the IV for CBC)
+        kdf         aes_kdf.KDFParams block, only with flag bit 1
+        body        ciphertext, followed by the tag when tag_len > 0
+    """
+    MAGIC = b'EPRO'
+    VERSION = 2
+    MODES = {"GCM": 1, "CTR": 2, "CBC": 3}
+    MODE_NAMES = {value: name for name, value in MODES.items()}
+    FLAG_CHUNK_TAGS = 0x01
+    FLAG_PASSPHRASE = 0x02
+    FLAG_SEGMENT_KEYS = 0x04
+    HEADER = struct.Struct('>4sBBBBBI')
+    # Text armor of the magic bytes, used to recognise armored containers
+    HEX_PREFIX = MAGIC.hex()
+    BASE64_PREFIX = base64.b64encode(MAGIC[:3]).decode('ascii')
+
+    def __init__(self, mode, nonce, tag_len=0, chunk_size=0, flags=0, kdf=None):
+        if mode not in AESContainer.MODES:
+            raise ValueError(f"Unknown AES mode '{mode}'.")
+        self.mode = mode
+        self.nonce = bytes(nonce)
+        self.tag_len = tag_len
+        self.chunk_size = chunk_size
+        self.kdf = kdf
+        self.flags = flags | AESContainer.FLAG_PASSPHRASE if kdf else flags & ~AESContainer.FLAG_PASSPHRASE
+
+    @property
+    def header_size(self):
+        kdf_size = KDFParams.packed_size(len(self.kdf.salt)) if self.kdf else 0
+        return AESContainer.HEADER.size + len(self.nonce) + kdf_size
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def header_prefix(mode, nonce_len, tag_len=0, chunk_size=0, flags=0):
+        """The fixed-size header fields; the nonce follows them."""
+        return AESContainer.HEADER.pack(
+            AESContainer.MAGIC, AESContainer.VERSION, AESContainer.MODES[mode],
+            flags, nonce_len, tag_len, chunk_size)
+
+    def pack_header(self):
+        header = AESContainer.header_prefix(self.mode, len(self.nonce), self.tag_len,
+                                            self.chunk_size, self.flags) + self.nonce
+        return header + self.kdf.pack() if self.kdf else header
+
+    @staticmethod
+    def _check_fields(mode_id, flags, tag_len, chunk_size):
+        """Raise ValueError for header fields that no current writer produces."""
+        mode = AESContainer.MODE_NAMES.get(mode_id)
+        if mode is None:
+            raise ValueError(f"Unknown AES mode id {mode_id}.")
+        expected_tag_len = AESCipher.TAG_SIZE if mode == "GCM" else 0
+        if tag_len != expected_tag_len:
+            raise ValueError(f"Invalid tag length {tag_len} for AES-{mode} (expected {expected_tag_len}).")
+        if flags & AESContainer.FLAG_CHUNK_TAGS:
+            if mode != "GCM":
+                raise ValueError("Only GCM containers can have a tag per chunk.")
+            if chunk_size <= 0:
+                raise ValueError("Chunked EncryptPro AES container has no chunk size.")
+            if not flags & AESContainer.FLAG_SEGMENT_KEYS:
+                raise ValueError("Chunked EncryptPro AES containers must use per-file segment keys.")
+
+    @staticmethod
+    def _from_fields(fixed, read):
+        magic, version, mode_id, flags, nonce_len, tag_len, chunk_size = \
+            AESContainer.HEADER.unpack(fixed)
+        if magic != AESContainer.MAGIC:
+            raise ValueError("Data is not an EncryptPro AES container.")
+        if version != AESContainer.VERSION:
+            raise ValueError(f"Unsupported EncryptPro AES container version {version}.")
+        AESContainer._check_fields(mode_id, flags, tag_len, chunk_size)
+        nonce = read(nonce_len)
+        if len(nonce) != nonce_len:
+            raise ValueError("Truncated EncryptPro AES container header.")
+        kdf = KDFParams.read(read) if flags & AESContainer.FLAG_PASSPHRASE else None
+        return AESContainer(AESContainer.MODE_NAMES[mode_id], nonce, tag_len, chunk_size, flags, kdf)
+
+    @staticmethod
+    def parse(data):
+        """
+        Parse a container held in memory without copying the body.
+
+        Args:
+            data: bytes-like container
+
+        Returns:
+            tuple: (AESContainer, body memoryview, tag memoryview)
+        """
+        view = memoryview(data).cast('B')
+        if (len(view) >= AESContainer.HEADER.size and view[4] == AESContainer.VERSION
+                and not view[6] & AESContainer.FLAG_PASSPHRASE):
+            # Current header: read the fields in place
+            magic, _, mode_id, flags, nonce_len, tag_len, chunk_size = \
+                AESContainer.HEADER.unpack_from(view)
+            start = AESContainer.HEADER.size + nonce_len
+            end = len(view) - tag_len
+            if magic == AESContainer.MAGIC and mode_id in AESContainer.MODE_NAMES and end >= start:
+                AESContainer._check_fields(mode_id, flags, tag_len, chunk_size)
+                container = AESContainer(AESContainer.MODE_NAMES[mode_id],
+                                         view[AESContainer.HEADER.size:start], tag_len,
+                                         chunk_size, flags)
+                return container, view[start:end], view[end:]
+        # KDF blocks and errors take the general path
+        if len(view) < AESContainer.HEADER.size:
+            raise ValueError("Data is too short to be an EncryptPro AES container.")
+        fixed = bytes(view[:AESContainer.HEADER.size])
+        position = AESContainer.HEADER.size
+
+        def read(n):
+            nonlocal position
+            field = bytes(view[position:position + n])
+            position += len(field)
+            return field
+
+        container = AESContainer._from_fields(fixed, read)
+        start = position
+        end = len(view) - container.tag_len
+        if end < start:
+            raise ValueError("EncryptPro AES container is truncated.")
+        return container, view[start:end], view[end:]
+
+    @staticmethod
+    def read_header(f):
+        """Read a container header from a binary file positioned at its start."""
+        fixed = f.read(AESContainer.HEADER.size)
+        if len(fixed) != AESContainer.HEADER.size:
+            raise ValueError("File is too short to be an EncryptPro AES file.")
+        return AESContainer._from_fields(fixed, f.read)
+
+    @staticmethod
+    def armor(container, output_format):
+        """Optional text layer over a binary container: 'base64' or 'hex'."""
+        if output_format.lower() == "hex":
+            return bytes(container).hex()
+        return base64.b64encode(container).decode('ascii')
+
+    @staticmethod
+    def is_armored(text):
+        return text.startswith(AESContainer.HEX_PREFIX) or text.startswith(AESContainer.BASE64_PREFIX)
+
+    @staticmethod
+    def unarmor(text):
+        """Decode an armored container; the encoding is known from its first characters."""
+        if text.startswith(AESContainer.HEX_PREFIX):
+            return bytes.fromhex(text)
+        return base64.b64decode(text, validate=True)
 
 class AESCipher:
     @staticmethod
@@ -587,150 +1346,568 @@ class AESCipher:
                 raise ValueError("Text key must be 16, 24, or 32 characters long")
             return key.encode('utf-8')
     
+    NONCE_SIZES = {"GCM": 12, "CTR": 8, "CBC": 16}
+    TAG_SIZE = 16
+
+    @staticmethod
+    def encrypted_size(length, mode="CBC", key=None):
+        """
+        Size of the AESContainer encrypt_into writes for length bytes of plaintext.
+
+        Pass the key when it is a Passphrase: its KDF parameters make the
+        header longer.
+        """
+        if mode not in AESContainer.MODES:
+            mode = "CBC"
+        size = AESContainer.HEADER.size + AESCipher.NONCE_SIZES[mode] + length
+        if isinstance(key, Passphrase):
+            size += KDFParams.packed_size()
+        if mode == "GCM":
+            return size + AESCipher.TAG_SIZE
+        if mode == "CBC":
+            # PKCS7 always adds 1 to 16 bytes
+            return size + BLOCK_SIZE - length % BLOCK_SIZE
+        return size
+
+    @staticmethod
+    def max_decrypted_size(data):
+        """Output buffer size decrypt_into needs for the container data (an upper bound for CBC)."""
+        _, body, _ = AESContainer.parse(data)
+        return len(body)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def context(key):
+        """The AESContext for key, from a small cache of recently used keys."""
+        return AESContext(key)
+
+    @staticmethod
+    def sealing_context(key):
+        """
+        Context to encrypt new data under key, and the KDF parameters for its header.
+
+        Returns:
+            tuple: (AESContext, KDFParams or None)
+        """
+        if isinstance(key, Passphrase):
+            params, key_bytes = PassphraseKDF.sealing_key(key)
+            # Not kept in the context cache, so the key expires with PassphraseKDF.TTL
+            return AESContext(key_bytes), params
+        return AESCipher.context(key), None
+
+    @staticmethod
+    def opening_context(key, container):
+        """
+        Context to decrypt container under key.
+
+        If the container was encrypted with a passphrase, key is that
+        passphrase (as text or a Passphrase) and the AES key is derived with
+        the KDF parameters from the header.
+        """
+        if container.kdf is not None:
+            text = key.text if isinstance(key, Passphrase) else key
+            return AESContext(PassphraseKDF.derive(text, container.kdf))
+        if isinstance(key, Passphrase):
+            raise ValueError("This data was encrypted with a key, not a passphrase.")
+        return AESCipher.context(key)
+
+    @staticmethod
+    def encrypt_into(data, key, output, mode="CBC"):
+        """
+        Encrypt bytes-like data into a caller-supplied buffer as an AESContainer.
+
+        Nothing the size of the data is allocated: the cipher reads data
+        (bytes, bytearray, memoryview, mmap) in place and writes straight
+        into output.
+
+        Args:
+            data: bytes-like plaintext
+            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars) or a Passphrase
+            output: writable buffer of at least encrypted_size(len(data), mode, key) bytes
+            mode: encryption mode (CBC, GCM, CTR)
+
+        Returns:
+            int: number of bytes written to output
+        """
+        context, kdf = AESCipher.sealing_context(key)
+        return context.encrypt_into(data, output, mode, kdf)
+
+    @staticmethod
+    def decrypt_into(data, key, output):
+        """
+        Decrypt a binary AESContainer into a caller-supplied buffer.
+
+        The header is parsed with struct and the body is sliced with
+        memoryview, so no text decoding or extra copies are involved. If
+        the tag or padding check fails, ValueError is raised and the
+        contents of output are undefined.
+
+        Args:
+            data: bytes-like container
+            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars),
+                or the passphrase it was encrypted with
+            output: writable buffer of at least max_decrypted_size(data) bytes
+
+        Returns:
+            int: number of plaintext bytes written to output
+        """
+        parsed = AESContainer.parse(data)
+        return AESCipher.opening_context(key, parsed[0])._decrypt_parsed(data, parsed, output)
+
+    @staticmethod
+    def encrypt_bytes(data, key, mode="CBC"):
+        """
+        Encrypt raw bytes into a binary AESContainer.
+
+        Args:
+            data: bytes-like plaintext
+            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars) or a Passphrase
+            mode: encryption mode (CBC, GCM, CTR)
+
+        Returns:
+            bytes: header, nonce/IV, ciphertext and tag
+        """
+        context, kdf = AESCipher.sealing_context(key)
+        return context.encrypt(data, mode, kdf)
+
+    @staticmethod
+    def _decrypt_buffer(data, key):
+        parsed = AESContainer.parse(data)
+        return AESCipher.opening_context(key, parsed[0])._decrypt_buffer(data, parsed)
+
+    @staticmethod
+    def decrypt_bytes(data, key):
+        """Decrypt a binary AESContainer back to raw bytes (see decrypt_into)."""
+        return bytes(AESCipher._decrypt_buffer(data, key))
+
+    @staticmethod
+    def encrypt_many(records, key, mode="GCM"):
+        """
+        Encrypt many short records (e.g. database fields) under one key.
+
+        Records are stored back to back in one buffer as nonce | ciphertext
+        (| tag for GCM), with no per-record header or text armor, and all
+        nonces come from a single random read.
+
+        Args:
+            records: sequence of bytes-like records
+            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars)
+            mode: "GCM" (authenticated) or "CTR"
+
+        Returns:
+            tuple: (offsets, buffer) - an int64 NumPy array of len(records) + 1
+            offsets and the bytes they index; record i is
+            buffer[offsets[i]:offsets[i + 1]]
+        """
+        return AESCipher.context(key).encrypt_many(records, mode)
+
+    @staticmethod
+    def decrypt_many(offsets, buffer, key, mode="GCM"):
+        """
+        Decrypt records packed by encrypt_many.
+
+        A GCM record that fails its tag check raises ValueError naming the
+        record.
+
+        Returns:
+            tuple: (offsets, buffer) of the plaintext records, in the same packed form
+        """
+        return AESCipher.context(key).decrypt_many(offsets, buffer, mode)
+
     @staticmethod
     def encrypt(text, key, mode="CBC", output_format="base64"):
         """
         Encrypt data using AES
         
         Args:
-            text: plaintext to encrypt
-            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars)
+            text: plaintext to encrypt (str, or bytes-like to skip the UTF-8 encoding)
+            key: encryption key (16, 24, or 32 bytes as text or 32, 48, or 64 hex chars) or a Passphrase
             mode: encryption mode (CBC, GCM, CTR)
-            output_format: 'base64' or 'hex'
+            output_format: 'base64' or 'hex' text armor, or 'binary' for the raw container
         
         Returns:
-            string: encoded IV/nonce and ciphertext in the specified format
+            string: the armored AESContainer (bytes for 'binary')
         """
-        if not _PyCryptoAES:
-            raise ImportError("pycryptodome is required for AES.")
-        
-        # Convert key to bytes (handles both text and hex formats)
-        key_bytes = AESCipher.get_key_bytes(key)
-        data = text.encode('utf-8')
-        
-        # Use different modes with appropriate parameters
-        if mode == "GCM":
-            # GCM mode with authentication tag
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_GCM)
-            ciphertext, tag = cipher.encrypt_and_digest(data)
-            
-            # Encode components based on output format
-            if output_format.lower() == "hex":
-                nonce = cipher.nonce.hex()
-                ct = ciphertext.hex()
-                tag_str = tag.hex()
-                return f"GCM:{nonce}:{ct}:{tag_str}"
-            else:  # default to base64
-                nonce = base64.b64encode(cipher.nonce).decode('utf-8')
-                ct = base64.b64encode(ciphertext).decode('utf-8')
-                tag_b64 = base64.b64encode(tag).decode('utf-8')
-                return f"GCM:{nonce}:{ct}:{tag_b64}"
-            
-        elif mode == "CTR":
-            # Counter mode
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_CTR)
-            ciphertext = cipher.encrypt(data)
-            
-            if output_format.lower() == "hex":
-                nonce = cipher.nonce.hex()
-                ct = ciphertext.hex()
-                return f"CTR:{nonce}:{ct}"
-            else:  # default to base64
-                nonce = base64.b64encode(cipher.nonce).decode('utf-8')
-                ct = base64.b64encode(ciphertext).decode('utf-8')
-                return f"CTR:{nonce}:{ct}"
-        
-        else:  # Default CBC mode
-            # CBC mode with padding (PKCS5Padding is equivalent to PKCS7Padding in PyCryptodome)
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_CBC)
-            ct_bytes = cipher.encrypt(pad(data, _PyCryptoAES.block_size))
-            
-            if output_format.lower() == "hex":
-                iv = cipher.iv.hex()
-                ct = ct_bytes.hex()
-                return f"CBC:{iv}:{ct}"
-            else:  # default to base64
-                iv = base64.b64encode(cipher.iv).decode('utf-8')
-                ct = base64.b64encode(ct_bytes).decode('utf-8')
-                return f"CBC:{iv}:{ct}"
+        data = text.encode('utf-8') if isinstance(text, str) else text
+        container = AESCipher.encrypt_bytes(data, key, mode)
+        if output_format.lower() == "binary":
+            return container
+        return AESContainer.armor(container, output_format)
+
+    @staticmethod
+    def _decode_legacy_fields(fields, nonce_size):
+        """
+        Decode the fields of a legacy 'MODE:nonce:ct[:tag]' string.
+
+        The encoding is decided once from the nonce field: hex nonces have
+        exactly twice the nonce size in hex digits, which base64 nonces of
+        that size never do.
+        """
+        nonce_field = fields[0]
+        if len(nonce_field) == 2 * nonce_size and AESCipher.is_hex(nonce_field):
+            return [bytes.fromhex(field) for field in fields]
+        return [base64.b64decode(field, validate=True) for field in fields]
 
     @staticmethod
     def decrypt(text, key):
-        if not _PyCryptoAES:
-            raise ImportError("pycryptodome is required for AES.")
+        # Binary or armored containers
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            return AESCipher._decrypt_buffer(text, key).decode('utf-8')
+        text = text.strip()
+        if AESContainer.is_armored(text):
+            return AESCipher._decrypt_buffer(AESContainer.unarmor(text), key).decode('utf-8')
         
-        # Convert key to bytes (handles both text and hex formats)
-        key_bytes = AESCipher.get_key_bytes(key)
+        key_bytes = AESCipher.context(key).key_bytes
         
-        # Parse the ciphertext format to determine mode and parameters
+        # Parse the legacy text format to determine mode and parameters
         parts = text.split(':')
         mode = parts[0]
         
         if mode == "GCM":
             if len(parts) != 4:
                 raise ValueError("Invalid GCM ciphertext format")
-                
-            # Try base64 first, fall back to hex if it fails
-            try:
-                nonce = base64.b64decode(parts[1])
-                ciphertext = base64.b64decode(parts[2])
-                tag = base64.b64decode(parts[3])
-            except:
-                # Try hex format
-                nonce = bytes.fromhex(parts[1])
-                ciphertext = bytes.fromhex(parts[2])
-                tag = bytes.fromhex(parts[3])
-            
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_GCM, nonce=nonce)
+            # Older versions used pycryptodome's default 16-byte GCM nonce
+            nonce, ciphertext, tag = AESCipher._decode_legacy_fields(parts[1:], 16)
+            cipher = AESBackend.for_mode("GCM").gcm(key_bytes, nonce)
             plaintext = cipher.decrypt_and_verify(ciphertext, tag)
             
         elif mode == "CTR":
             if len(parts) != 3:
                 raise ValueError("Invalid CTR ciphertext format")
-                
-            # Try base64 first, fall back to hex if it fails
-            try:
-                nonce = base64.b64decode(parts[1])
-                ciphertext = base64.b64decode(parts[2])
-            except:
-                # Try hex format
-                nonce = bytes.fromhex(parts[1])
-                ciphertext = bytes.fromhex(parts[2])
-            
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_CTR, nonce=nonce)
+            nonce, ciphertext = AESCipher._decode_legacy_fields(parts[1:], 8)
+            cipher = AESBackend.for_mode("CTR").ctr(key_bytes, nonce)
             plaintext = cipher.decrypt(ciphertext)
             
         elif mode == "CBC":
             if len(parts) != 3:
                 raise ValueError("Invalid CBC ciphertext format")
-                
-            # Try base64 first, fall back to hex if it fails
-            try:
-                iv = base64.b64decode(parts[1])
-                ciphertext = base64.b64decode(parts[2])
-            except:
-                # Try hex format
-                iv = bytes.fromhex(parts[1])
-                ciphertext = bytes.fromhex(parts[2])
-            
-            cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_CBC, iv=iv)
-            plaintext = unpad(cipher.decrypt(ciphertext), _PyCryptoAES.block_size)
+            iv, ciphertext = AESCipher._decode_legacy_fields(parts[1:], 16)
+            plaintext = AESBackend.for_mode("CBC").cbc_decrypt(key_bytes, iv, ciphertext)
             
         else:
             # For backward compatibility with older format
             try:
-                iv, ct = text.split(':')
-                try:
-                    iv = base64.b64decode(iv)
-                    ct = base64.b64decode(ct)
-                except:
-                    # Try hex format
-                    iv = bytes.fromhex(iv)
-                    ct = bytes.fromhex(ct)
-                    
-                cipher = _PyCryptoAES.new(key_bytes, _PyCryptoAES.MODE_CBC, iv)
-                plaintext = unpad(cipher.decrypt(ct), _PyCryptoAES.block_size)
+                iv, ct = AESCipher._decode_legacy_fields(text.split(':'), 16)
+                plaintext = AESBackend.for_mode("CBC").cbc_decrypt(key_bytes, iv, ct)
             except Exception as e:
                 raise ValueError(f"Unknown ciphertext format or decryption error: {str(e)}")
         
-        return plaintext.decode('utf-8') 
\ No newline at end of file
+        return plaintext.decode('utf-8')
+
+def _xor_bytes(a, b):
+    """a XOR b for two equal-length byte strings (fast for the short ones AESContext handles)."""
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+class AESContext:
+    """
+    An AES key parsed and validated once, for encrypting many messages.
+
+    Messages up to SMALL_MESSAGE_SIZE go through objects that keep the
+    expanded key between messages: the backend's AEAD object for GCM, and
+    its ECB block cipher for the CTR keystream and CBC decryption. Larger
+    messages get a fresh cipher each, whose setup cost is lost in the data.
+    The ciphertexts are ordinary AESContainers either way.
+
+    AESCipher.context(key) returns a cached context, so the static
+    AESCipher API pays for key parsing once per key.
+    """
+    SMALL_MESSAGE_SIZE = 4096
+    RECORD_MODES = ("GCM", "CTR")
+    # encrypt_many/decrypt_many handle CTR records in batches of about this many bytes
+    RECORD_BATCH_SIZE = 1 << 22
+
+    def __init__(self, key):
+        if isinstance(key, Passphrase):
+            raise ValueError("A passphrase needs a container header for its salt; "
+                             "use AESCipher.encrypt_bytes or AESFileCipher with it.")
+        if isinstance(key, (bytes, bytearray)):
+            if len(key) not in (16, 24, 32):
+                raise ValueError("Raw AES key must be 16, 24, or 32 bytes long")
+            self.key_bytes = bytes(key)
+        else:
+            self.key_bytes = AESCipher.get_key_bytes(key)
+        # (backend name, 'aead' or 'ecb') -> object holding the expanded key
+        self._keyed = {}
+
+    def _keyed_object(self, backend, kind):
+        keyed = self._keyed.get((backend.name, kind))
+        if keyed is None:
+            keyed = self._keyed[(backend.name, kind)] = getattr(backend, kind)(self.key_bytes)
+        return keyed
+
+    def _ctr_keystream(self, backend, nonce, length):
+        """The first length bytes of the CTR keystream for nonce, from one ECB call."""
+        counters = b''.join([nonce + i.to_bytes(BLOCK_SIZE - len(nonce), 'big')
+                             for i in range(-(-length // BLOCK_SIZE))])
+        return self._keyed_object(backend, 'ecb').encrypt(counters)[:length]
+
+    @staticmethod
+    def _unpad_length(padded):
+        """Length of the PKCS7-padded block data once the padding is removed."""
+        size = len(padded)
+        pad_len = padded[size - 1]
+        if not 1 <= pad_len <= BLOCK_SIZE or padded[size - pad_len:size] != bytes((pad_len,)) * pad_len:
+            raise ValueError("Padding is incorrect.")
+        return size - pad_len
+
+    def encrypt_into(self, data, output, mode="CBC", kdf=None):
+        """
+        Encrypt data into output as an AESContainer (see AESCipher.encrypt_into).
+
+        kdf is the KDFParams the key was derived with, for the header.
+        """
+        if mode not in AESContainer.MODES:
+            mode = "CBC"
+        backend = AESBackend.for_mode(mode)
+        data = memoryview(data).cast('B')
+        out = memoryview(output).cast('B')
+        size = AESCipher.encrypted_size(len(data), mode)
+        if kdf is not None:
+            size += KDFParams.packed_size(len(kdf.salt))
+        if len(out) < size:
+            raise ValueError(f"Output buffer is too small ({len(out)} bytes, need {size}).")
+        small = len(data) <= AESContext.SMALL_MESSAGE_SIZE
+
+        nonce = get_random_bytes(AESCipher.NONCE_SIZES[mode])
+        tag_len = AESCipher.TAG_SIZE if mode == "GCM" else 0
+        if kdf is None:
+            header = AESContainer.header_prefix(mode, len(nonce), tag_len) + nonce
+        else:
+            header = AESContainer(mode, nonce, tag_len, kdf=kdf).pack_header()
+        start = len(header)
+        end = start + len(data)
+        out[:start] = header
+
+        if mode == "GCM":
+            # GCM mode with authentication tag
+            if small:
+                out[start:size] = self._keyed_object(backend, 'aead').encrypt(nonce, data, None)
+            else:
+                cipher = backend.gcm(self.key_bytes, nonce)
+                cipher.encrypt(data, output=out[start:end])
+                out[end:size] = cipher.digest()
+        elif mode == "CTR":
+            # Counter mode
+            if small:
+                out[start:end] = _xor_bytes(data, self._ctr_keystream(backend, nonce, len(data)))
+            else:
+                backend.ctr(self.key_bytes, nonce).encrypt(data, output=out[start:end])
+        else:
+            # CBC mode with PKCS7 padding (PKCS5Padding is the same scheme for AES);
+            # only the last partial block is copied to be padded
+            cipher = backend.cbc(self.key_bytes, nonce)
+            whole = len(data) - len(data) % BLOCK_SIZE
+            pad_len = BLOCK_SIZE - (len(data) - whole)
+            if small:
+                # One call on a padded copy is cheaper than two for short messages
+                out[start:size] = cipher.encrypt(bytes(data) + bytes((pad_len,)) * pad_len)
+                return size
+            if whole:
+                cipher.encrypt(data[:whole], output=out[start:start + whole])
+            cipher.encrypt(bytes(data[whole:]) + bytes((pad_len,)) * pad_len,
+                           output=out[start + whole:size])
+        return size
+
+    def decrypt_into(self, data, output):
+        """Decrypt the AESContainer data into output (see AESCipher.decrypt_into)."""
+        return self._decrypt_parsed(data, AESContainer.parse(data), output)
+
+    def _decrypt_parsed(self, data, parsed, output):
+        container, body, tag = parsed
+        if container.flags & AESContainer.FLAG_CHUNK_TAGS:
+            raise ValueError("Chunked AES containers must be decrypted with aes_files.")
+        out = memoryview(output).cast('B')
+        size = len(body)
+        if len(out) < size:
+            raise ValueError(f"Output buffer is too small ({len(out)} bytes, need {size}).")
+        backend = AESBackend.for_mode(container.mode)
+        small = size <= AESContext.SMALL_MESSAGE_SIZE
+        nonce = container.nonce
+
+        if container.mode == "GCM":
+            if small:
+                # The tag directly follows the body, so both are one view
+                view = memoryview(data).cast('B')
+                sealed = view[len(view) - size - len(tag):]
+                out[:size] = self._keyed_object(backend, 'aead').decrypt(nonce, sealed, None)
+            else:
+                cipher = backend.gcm(self.key_bytes, nonce)
+                cipher.decrypt(body, output=out[:size])
+                cipher.verify(tag)
+            return size
+        if container.mode == "CTR":
+            if small:
+                out[:size] = _xor_bytes(body, self._ctr_keystream(backend, nonce, size))
+            else:
+                backend.ctr(self.key_bytes, nonce).decrypt(body, output=out[:size])
+            return size
+
+        if not size or size % BLOCK_SIZE:
+            raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+        if small:
+            # CBC decryption is P_i = D(C_i) XOR C_(i-1), so every block decrypts in one call
+            chained = nonce + bytes(body[:size - BLOCK_SIZE])
+            out[:size] = _xor_bytes(self._keyed_object(backend, 'ecb').decrypt(body), chained)
+        else:
+            backend.cbc(self.key_bytes, nonce).decrypt(body, output=out[:size])
+        return AESContext._unpad_length(out[:size])
+
+    def encrypt(self, data, mode="CBC", kdf=None):
+        """Encrypt bytes-like data into a binary AESContainer (bytes)."""
+        size = AESCipher.encrypted_size(len(memoryview(data).cast('B')), mode)
+        output = bytearray(size + (KDFParams.packed_size(len(kdf.salt)) if kdf else 0))
+        self.encrypt_into(data, output, mode, kdf)
+        return bytes(output)
+
+    def _decrypt_buffer(self, data, parsed=None):
+        parsed = parsed or AESContainer.parse(data)
+        output = bytearray(len(parsed[1]))
+        # Dropping the CBC padding shrinks the buffer in place
+        del output[self._decrypt_parsed(data, parsed, output):]
+        return output
+
+    def decrypt(self, data):
+        """Decrypt a binary AESContainer back to raw bytes."""
+        return bytes(self._decrypt_buffer(data))
+
+    @staticmethod
+    def record_overhead(mode):
+        """Bytes each record grows by: its nonce, plus the tag for GCM."""
+        if mode not in AESContext.RECORD_MODES:
+            raise ValueError(f"Record encryption supports {', '.join(AESContext.RECORD_MODES)} modes.")
+        return AESCipher.NONCE_SIZES[mode] + (AESCipher.TAG_SIZE if mode == "GCM" else 0)
+
+    @staticmethod
+    def _pack_offsets(lengths):
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return offsets
+
+    @staticmethod
+    def _record_batches(lengths):
+        """(first, stop) record ranges of about RECORD_BATCH_SIZE bytes each."""
+        ends = np.cumsum(lengths)
+        first = 0
+        while first < len(lengths):
+            limit = ends[first] - lengths[first] + AESContext.RECORD_BATCH_SIZE
+            stop = max(first + 1, int(np.searchsorted(ends, limit, side='right')))
+            yield first, stop
+            first = stop
+
+    def _ctr_xor(self, backend, nonces, data, lengths):
+        """
+        XOR records stored back to back in data with their CTR keystreams.
+
+        The counter blocks of every record are built with NumPy and
+        encrypted in one ECB call; each byte then picks its keystream byte
+        by index (or by row, when the records are equally long), so there
+        is no per-record Python work.
+        """
+        nonce_size = nonces.shape[1]
+        blocks = -(-lengths // BLOCK_SIZE)
+        first_block = np.cumsum(blocks) - blocks
+        n_blocks = int(blocks.sum())
+        counters = np.empty((n_blocks, BLOCK_SIZE), dtype=np.uint8)
+        counters[:, :nonce_size] = np.repeat(nonces, blocks, axis=0)
+        block_index = np.arange(n_blocks, dtype=np.int64) - np.repeat(first_block, blocks)
+        counters[:, nonce_size:] = (block_index.astype(f'>u{BLOCK_SIZE - nonce_size}')
+                                    .view(np.uint8).reshape(n_blocks, BLOCK_SIZE - nonce_size))
+        keystream = np.frombuffer(
+            self._keyed_object(backend, 'ecb').encrypt(memoryview(counters.reshape(-1))),
+            dtype=np.uint8)
+        if len(lengths) and lengths.min() == lengths.max():
+            # Equal-length records are rows of a matrix: no per-byte indices needed
+            length = int(lengths[0])
+            rows = keystream.reshape(len(lengths), -1)[:, :length]
+            return (data.reshape(len(lengths), length) ^ rows).reshape(-1)
+        starts = np.cumsum(lengths) - lengths
+        index = np.arange(len(data), dtype=np.int64) + np.repeat(first_block * BLOCK_SIZE - starts, lengths)
+        return data ^ keystream[index]
+
+    def encrypt_many(self, records, mode="GCM"):
+        """
+        Encrypt many short records in one call (see AESCipher.encrypt_many).
+
+        Returns:
+            tuple: (offsets, buffer); record i is buffer[offsets[i]:offsets[i + 1]]
+        """
+        overhead = AESContext.record_overhead(mode)
+        backend = AESBackend.for_mode(mode)
+        count = len(records)
+        nonce_size = AESCipher.NONCE_SIZES[mode]
+        nonces = get_random_bytes(nonce_size * count)
+        lengths = np.fromiter(map(len, records), dtype=np.int64, count=count)
+        offsets = AESContext._pack_offsets(lengths + overhead)
+
+        if mode == "GCM":
+            seal = self._keyed_object(backend, 'aead').encrypt
+            parts = []
+            for i, record in enumerate(records):
+                nonce = nonces[i * nonce_size:(i + 1) * nonce_size]
+                parts.append(nonce)
+                parts.append(seal(nonce, record, None))
+            return offsets, b''.join(parts)
+
+        nonces = np.frombuffer(nonces, dtype=np.uint8).reshape(count, nonce_size)
+        data = np.frombuffer(b''.join(records), dtype=np.uint8)
+        starts = np.cumsum(lengths) - lengths
+        out = np.empty(int(offsets[-1]), dtype=np.uint8)
+        for first, stop in AESContext._record_batches(lengths):
+            batch = lengths[first:stop]
+            lo, hi = starts[first], starts[first] + int(batch.sum())
+            ciphertext = self._ctr_xor(backend, nonces[first:stop], data[lo:hi], batch)
+            if batch.min() == batch.max():
+                # Equal-length records are rows of a matrix: nonce columns, then ciphertext
+                rows = out[offsets[first]:offsets[stop]].reshape(stop - first, -1)
+                rows[:, :nonce_size] = nonces[first:stop]
+                rows[:, nonce_size:] = ciphertext.reshape(stop - first, int(batch[0]))
+                continue
+            out[offsets[first:stop, None] + np.arange(nonce_size)] = nonces[first:stop]
+            # Each record's ciphertext goes after its nonce
+            shift = np.repeat(offsets[first:stop] + nonce_size - (starts[first:stop] - lo), batch)
+            out[np.arange(hi - lo, dtype=np.int64) + shift] = ciphertext
+        return offsets, out.tobytes()
+
+    def decrypt_many(self, offsets, buffer, mode="GCM"):
+        """
+        Decrypt records packed by encrypt_many (see AESCipher.decrypt_many).
+
+        Returns:
+            tuple: (offsets, buffer) of the plaintext records
+        """
+        overhead = AESContext.record_overhead(mode)
+        backend = AESBackend.for_mode(mode)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        view = memoryview(buffer).cast('B')
+        if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(view):
+            raise ValueError("Record offsets do not match the buffer.")
+        lengths = np.diff(offsets) - overhead
+        if len(lengths) and lengths.min() < 0:
+            raise ValueError("Record offsets do not match the buffer (a record is too short).")
+        nonce_size = AESCipher.NONCE_SIZES[mode]
+        out_offsets = AESContext._pack_offsets(lengths)
+
+        if mode == "GCM":
+            unseal = self._keyed_object(backend, 'aead').decrypt
+            parts = []
+            for i, (start, end) in enumerate(zip(offsets[:-1].tolist(), offsets[1:].tolist())):
+                try:
+                    parts.append(unseal(view[start:start + nonce_size], view[start + nonce_size:end], None))
+                except ValueError:
+                    raise ValueError(f"Record {i} failed authentication.") from None
+            return out_offsets, b''.join(parts)
+
+        data = np.frombuffer(view, dtype=np.uint8)
+        out = np.empty(int(out_offsets[-1]), dtype=np.uint8)
+        for first, stop in AESContext._record_batches(lengths):
+            batch = lengths[first:stop]
+            lo, hi = out_offsets[first], out_offsets[stop]
+            if batch.min() == batch.max():
+                rows = data[offsets[first]:offsets[stop]].reshape(stop - first, -1)
+                nonces, ciphertext = rows[:, :nonce_size], rows[:, nonce_size:].reshape(-1)
+            else:
+                nonces = data[offsets[first:stop, None] + np.arange(nonce_size)]
+                shift = np.repeat(offsets[first:stop] + nonce_size - (out_offsets[first:stop] - lo), batch)
+                ciphertext = data[np.arange(hi - lo, dtype=np.int64) + shift]
+            out[lo:hi] = self._ctr_xor(backend, nonces, ciphertext, batch)
+        return out_offsets, out.tobytes()
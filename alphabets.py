@@ -0,0 +1,265 @@
+"""
+Custom alphabets for the Caesar, Vigenère and Substitution ciphers.
+
+The default ciphers work on the 26 ASCII letters. An Alphabet is any
+ordered set of letters (Greek, Cyrillic, Arabic, Spanish with Ñ, ...), with
+optional lower-case forms and fold rules for variants that read as one of
+the letters (Greek final sigma, Hebrew final forms, Arabic hamza seats).
+Pass one as the alphabet argument of those ciphers:
+
+    CaesarCipher.encrypt(text, '3', alphabet=GREEK)
+
+Building an Alphabet compiles it into dense NumPy maps indexed by code
+point (letter position, case, and the letter glyphs), so every cipher is
+a few array lookups over the text's code points rather than per-character
+Python. Caesar and Substitution tables are cached per key. Characters that
+are not letters of the alphabet pass through unchanged.
+"""
+import string
+
+import numpy as np
+
+from algorithms import _ascii_codes, _codes_text
+
+# Characters processed per NumPy pass in the Vigenère key stream
+BLOCK_SIZE = 1 << 18
+# Caesar/Substitution tables kept per Alphabet (oldest dropped first)
+TABLE_CACHE_SIZE = 64
+
+
+class Alphabet:
+    """
+    An ordered set of letters the substitution-family ciphers shift within.
+
+    Args:
+        letters (str): the letters in order, upper case for cased scripts
+        lowercase (str): the matching lower-case letters, or None to use
+            str.lower() where it gives a different single character
+            (letters without one are caseless)
+        folds (dict): extra characters read as a letter, e.g. {'ς': 'σ'};
+            they are encrypted as that letter, so the fold is not undone
+        name (str): display name
+    """
+    def __init__(self, letters, lowercase=None, folds=None, name=None):
+        letters = list(letters)
+        if len(letters) < 2 or len(set(letters)) != len(letters):
+            raise ValueError("An alphabet needs at least two distinct letters.")
+        if lowercase is None:
+            lowercase = [c.lower() if len(c.lower()) == 1 else c for c in letters]
+        lowercase = list(lowercase)
+        if len(lowercase) != len(letters):
+            raise ValueError("An alphabet needs one lower-case form per letter.")
+        self.letters = ''.join(letters)
+        self.lowercase = ''.join(lowercase)
+        self.name = name or self.letters
+        self.size = len(letters)
+
+        # Every character the alphabet reads -> (position, 0 for upper/caseless or 1 for lower)
+        reads = {}
+        for position, (upper, lower) in enumerate(zip(letters, lowercase)):
+            for char, row in ((upper, 0), (lower, 1)):
+                if char in reads and reads[char] != (position, 0):
+                    raise ValueError(f"Alphabet character {char!r} appears more than once.")
+                reads.setdefault(char, (position, row))
+        for char, target in (folds or {}).items():
+            if char in reads or target not in reads:
+                raise ValueError(f"Cannot fold {char!r} into {target!r}.")
+            reads[char] = reads[target]
+        self._reads = reads
+
+        # Dense maps are built over the code point range of the text's array (see _encode)
+        self._limit = max(map(ord, reads)) + 1
+        self._read_codes = np.array([ord(c) for c in reads], dtype=np.int64)
+        self._read_positions = np.array([p for p, _ in reads.values()], dtype=np.int64)
+        self._read_rows = np.array([r for _, r in reads.values()], dtype=np.int64)
+        self._glyphs = np.array([[ord(c) for c in self.letters], [ord(c) for c in self.lowercase]],
+                                dtype=np.uint32)
+        # Built on first use: map size -> _maps() result, (permutation, size) -> _table() result
+        self._map_cache = {}
+        self._table_cache = {}
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {self.size} letters)"
+
+    def __len__(self):
+        return self.size
+
+    def _encode(self, text):
+        """
+        Code points of text in the narrowest array every letter fits in, and
+        the codec that turns the array back into str (None for bytes input).
+
+        Latin-1 and UTF-16 arrays are covered by 256 / 65536-entry maps, so
+        no code point needs range checks. UTF-16 surrogates lie above every
+        letter of a BMP alphabet and pass through as they are.
+        """
+        if not isinstance(text, str):
+            return _ascii_codes(text), None
+        if self._limit <= 0x100:
+            try:
+                return np.frombuffer(text.encode('latin-1'), dtype=np.uint8), 'latin-1'
+            except UnicodeEncodeError:
+                pass
+        if self._limit <= 0xD800:
+            return np.frombuffer(text.encode('utf-16-le', 'surrogatepass'), dtype='<u2'), 'utf-16-le'
+        return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4'), 'utf-32-le'
+
+    def _decode(self, out, encoding):
+        if encoding is not None:
+            return out.tobytes().decode(encoding, 'surrogatepass')
+        if len(out) and out.max() >= 0x80:
+            raise ValueError(f"The {self.name} alphabet maps ASCII letters outside ASCII; pass text as str.")
+        return out.astype(np.uint8, copy=False).tobytes()
+
+    def _size(self, codes):
+        """Entries in the dense maps for codes: the whole dtype range, or up to the last letter."""
+        if codes.dtype.itemsize <= 2:
+            return 1 << (8 * codes.dtype.itemsize)
+        return self._limit + 1
+
+    def _slots(self, codes, size):
+        """Index of each code point into maps of size entries (slot size-1 stands for everything above)."""
+        if size > np.iinfo(codes.dtype).max:
+            return codes
+        return np.minimum(codes, codes.dtype.type(size - 1))
+
+    def _out_dtype(self, size):
+        return np.min_scalar_type(max(size, self._limit) - 1)
+
+    def _maps(self, size):
+        """
+        Alphabet position (or -1) of every code point below size, and the
+        offset of its case row in the flattened glyph table.
+        """
+        maps = self._map_cache.get(size)
+        if maps is None:
+            inside = self._read_codes < min(size, self._limit)
+            position = np.full(size, -1, dtype=np.int32)
+            position[self._read_codes[inside]] = self._read_positions[inside]
+            row_offset = np.zeros(size, dtype=np.int32)
+            row_offset[self._read_codes[inside]] = self._read_rows[inside] * self.size
+            maps = self._map_cache[size] = (position, row_offset)
+        return maps
+
+    def positions(self, key):
+        """Alphabet position of each character of key (either case, or a fold)."""
+        try:
+            return np.array([self._reads[c][0] for c in key], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} is not a letter of the {self.name} alphabet.") from None
+
+    def is_text(self, text):
+        """True if text holds only letters of this alphabet and whitespace."""
+        codes, _ = self._encode(text)
+        size = self._size(codes)
+        others = codes[self._maps(size)[0][self._slots(codes, size)] < 0]
+        if not len(others):
+            return True
+        return _codes_text(others.astype(np.uint32)).isspace()
+
+    def _table(self, permutation, size):
+        """Dense lookup table (size entries) sending the letter at position p to position permutation[p]."""
+        table = self._table_cache.get((permutation, size))
+        if table is None:
+            table = np.arange(size, dtype=self._out_dtype(size))
+            inside = self._read_codes < min(size, self._limit)
+            moved = np.asarray(permutation)[self._read_positions[inside]]
+            table[self._read_codes[inside]] = self._glyphs[self._read_rows[inside], moved]
+            if len(self._table_cache) >= TABLE_CACHE_SIZE:
+                del self._table_cache[next(iter(self._table_cache))]
+            self._table_cache[(permutation, size)] = table
+        return table
+
+    def _apply(self, text, permutation):
+        codes, encoding = self._encode(text)
+        size = self._size(codes)
+        table = self._table(permutation, size)
+        if table.dtype == np.uint8:
+            # One byte per character: bytes.translate is a single C loop,
+            # several times faster than a NumPy gather
+            out = codes.tobytes().translate(table.tobytes())
+            if encoding is not None:
+                return out.decode(encoding)
+            if not out.isascii():
+                raise ValueError(f"The {self.name} alphabet maps ASCII letters outside ASCII; pass text as str.")
+            return out
+        out = table[self._slots(codes, size)]
+        if size <= np.iinfo(codes.dtype).max:
+            # Code points above the last letter all shared one slot; restore them
+            above = codes >= size - 1
+            if above.any():
+                out = out.astype(np.uint32)
+                out[above] = codes[above]
+        return self._decode(out, encoding)
+
+    def shift(self, text, shift):
+        """Caesar shift of every letter by shift positions (mod the alphabet size)."""
+        shift %= self.size
+        return self._apply(text, tuple(((np.arange(self.size) + shift) % self.size).tolist()))
+
+    def substitute(self, text, key, inverse=False):
+        """
+        Substitution with key, a permutation of the alphabet's letters: the
+        letter at position p becomes key[p] (in the case of the input letter).
+        """
+        if len(key) != self.size:
+            raise ValueError(f"Substitution key must have {self.size} letters for the {self.name} alphabet.")
+        positions = self.positions(key)
+        if len(set(positions.tolist())) != self.size:
+            raise ValueError(f"Substitution key must use every letter of the {self.name} alphabet once.")
+        permutation = np.argsort(positions) if inverse else positions
+        return self._apply(text, tuple(permutation.tolist()))
+
+    def vigenere(self, text, key, sign, j=0):
+        """
+        Shift the n-th letter of text by key letter (j + n) % len(key).
+
+        Non-letters pass through and do not advance the key.
+
+        Returns:
+            tuple: (output, letter count after text)
+        """
+        shifts = (sign * self.positions(key) % self.size).astype(np.int32)
+        n_key = len(shifts)
+        if not n_key:
+            raise ValueError("Vigenère Cipher requires a key.")
+        codes, encoding = self._encode(text)
+        size = self._size(codes)
+        position, row_offset = self._maps(size)
+        glyphs = self._glyphs.ravel()
+        out = np.empty(len(codes), dtype=np.promote_types(codes.dtype, self._out_dtype(size)))
+        for pos in range(0, len(codes), BLOCK_SIZE):
+            chunk = codes[pos:pos + BLOCK_SIZE]
+            slots = self._slots(chunk, size)
+            letter_positions = position[slots]
+            letters = letter_positions >= 0
+            count = int(np.count_nonzero(letters))
+            # Rows of len(key) letters line up with the key, as in VigenereCipher._shift_ascii
+            padded = np.zeros(count + (-count) % n_key, dtype=np.int32)
+            padded[:count] = letter_positions[letters]
+            padded.reshape(-1, n_key)[...] += np.roll(shifts, -(j % n_key))
+            padded -= self.size * (padded >= self.size)
+            block = out[pos:pos + len(chunk)]
+            block[...] = chunk
+            block[letters] = glyphs[row_offset[slots[letters]] + padded[:count]]
+            j += count
+        return self._decode(out, encoding), j
+
+
+LATIN = Alphabet(string.ascii_uppercase, name="Latin (A-Z)")
+SPANISH = Alphabet("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ", name="Spanish (A-Z with Ñ)")
+GREEK = Alphabet("ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ", name="Greek",
+                 folds={'ς': 'σ',
+                        'ά': 'α', 'έ': 'ε', 'ή': 'η', 'ί': 'ι', 'ό': 'ο', 'ύ': 'υ', 'ώ': 'ω',
+                        'ϊ': 'ι', 'ϋ': 'υ', 'ΐ': 'ι', 'ΰ': 'υ',
+                        'Ά': 'Α', 'Έ': 'Ε', 'Ή': 'Η', 'Ί': 'Ι', 'Ό': 'Ο', 'Ύ': 'Υ', 'Ώ': 'Ω',
+                        'Ϊ': 'Ι', 'Ϋ': 'Υ'})
+RUSSIAN = Alphabet("АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ", name="Russian")
+ARABIC = Alphabet("ابتثجحخدذرزسشصضطظعغفقكلمنهوي", name="Arabic",
+                  folds={'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ة': 'ه', 'ى': 'ي',
+                         'ؤ': 'و', 'ئ': 'ي'})
+HEBREW = Alphabet("אבגדהוזחטיכלמנסעפצקרשת", name="Hebrew",
+                  folds={'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'})
+
+# Built-in alphabets by display name
+ALPHABETS = {alphabet.name: alphabet for alphabet in (LATIN, SPANISH, GREEK, RUSSIAN, ARABIC, HEBREW)}
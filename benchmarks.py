@@ -0,0 +1,287 @@
+"""
+Throughput benchmarks for the EncryptPro cipher engines.
+
+Run from the project root:
+
+    python benchmarks.py                 # all benchmarks, default sizes
+    python benchmarks.py --sizes 1K 1M   # custom input sizes
+
+Each benchmark prints MB/s for the current implementation and, where it
+exists, for the previous character-by-character implementation kept below
+as a reference.
+"""
+import argparse
+import os
+import random
+import string
+import time
+
+from algorithms import (CaesarCipher, Rot13Cipher, SubstitutionCipher, VigenereCipher,
+                        PlayfairCipher, RailFenceCipher, RowTranspositionCipher, HillCipher,
+                        ChrisWayV1Cipher, ChrisWayV2Cipher, AESCipher, ParallelCipher)
+from aes_backend import AESBackend
+from byte_ciphers import BYTE_CIPHERS
+from alphabets import GREEK
+
+SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+DEFAULT_SIZES = ['1K', '1M', '100M']
+SUBSTITUTION_KEY = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+VIGENERE_KEY = 'LEMONADE'
+PLAYFAIR_KEY = 'PLAYFAIR EXAMPLE'
+RAIL_FENCE_KEY = '20'
+ROW_TRANSPOSITION_KEY = '4 3 1 2 5 6 7'
+HILL_KEY = '6,24,1,13,16,10,20,17,15'
+CHRIS_WAY_KEY = 'SECRETKEY'
+RECORD_COUNT = 1_000_000
+RECORD_SIZE = 64
+
+# ----------------------------------------------------------------------
+# Reference implementations (per-character loops, before the table engines)
+# ----------------------------------------------------------------------
+def legacy_caesar_encrypt(text, key):
+    shift = int(key) % 26
+    result = ""
+    for char in text:
+        if char.isalpha():
+            base = ord('A') if char.isupper() else ord('a')
+            result += chr((ord(char) - base + shift) % 26 + base)
+        else:
+            result += char
+    return result
+
+def legacy_rot13(text):
+    return legacy_caesar_encrypt(text, 13)
+
+def legacy_substitution_encrypt(text, key):
+    key = key.upper()
+    table = {chr(i+ord('A')): key[i] for i in range(26)}
+    result = ''
+    for c in text:
+        if c.isalpha():
+            up = c.isupper()
+            sub = table[c.upper()]
+            result += sub if up else sub.lower()
+        else:
+            result += c
+    return result
+
+def legacy_vigenere_encrypt(text, key):
+    key = key.upper()
+    result = ''
+    j = 0
+    for c in text:
+        if c.isalpha():
+            shift = ord(key[j % len(key)]) - ord('A')
+            base = ord('A') if c.isupper() else ord('a')
+            result += chr((ord(c) - base + shift) % 26 + base)
+            j += 1
+        else:
+            result += c
+    return result
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+def parse_size(size):
+    """Parse sizes such as '1K', '1M' or '100M' into a byte count."""
+    size = size.strip().upper()
+    if size[-1] in SIZE_UNITS:
+        return int(size[:-1]) * SIZE_UNITS[size[-1]]
+    return int(size)
+
+def make_text(n_bytes, seed=1234, alphabet=string.ascii_letters + ' .,\n'):
+    """Generate n_bytes of ASCII text from alphabet (letters, spaces and punctuation by default)."""
+    rng = random.Random(seed)
+    sample = ''.join(rng.choice(alphabet) for _ in range(64 * 1024))
+    repeats = n_bytes // len(sample) + 1
+    return (sample * repeats)[:n_bytes]
+
+def measure(func, n_bytes, min_time=0.2):
+    """Return the throughput of func() in MB/s."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return n_bytes * runs / elapsed / (1024 ** 2)
+
+def report(name, sizes, current, legacy=None, prepare=None, alphabet=None):
+    """Print before/after throughput; prepare(text) builds the input, e.g. a ciphertext."""
+    print(f"\n{name}")
+    print(f"  {'size':>8}  {'before MB/s':>12}  {'after MB/s':>12}  {'speedup':>8}")
+    for size in sizes:
+        n_bytes = parse_size(size)
+        text = make_text(n_bytes, alphabet=alphabet) if alphabet else make_text(n_bytes)
+        if prepare is not None:
+            text = prepare(text)
+        after = measure(lambda: current(text), n_bytes)
+        if legacy is not None:
+            before = measure(lambda: legacy(text), n_bytes)
+            print(f"  {size:>8}  {before:12.1f}  {after:12.1f}  {after / before:7.1f}x")
+        else:
+            print(f"  {size:>8}  {'-':>12}  {after:12.1f}  {'-':>8}")
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+def bench_translate_ciphers(sizes):
+    report("Caesar Cipher (shift 3)", sizes,
+           lambda text: CaesarCipher.encrypt(text, '3'),
+           lambda text: legacy_caesar_encrypt(text, '3'))
+    report("ROT13", sizes,
+           lambda text: Rot13Cipher.encrypt(text),
+           legacy_rot13)
+    report("Substitution Cipher", sizes,
+           lambda text: SubstitutionCipher.encrypt(text, SUBSTITUTION_KEY),
+           lambda text: legacy_substitution_encrypt(text, SUBSTITUTION_KEY))
+
+def bench_vigenere(sizes):
+    report("Vigenère Cipher (key LEMONADE)", sizes,
+           lambda text: VigenereCipher.encrypt(text, VIGENERE_KEY),
+           lambda text: legacy_vigenere_encrypt(text, VIGENERE_KEY))
+
+def bench_playfair(sizes):
+    report("Playfair Cipher (encrypt)", sizes,
+           lambda text: PlayfairCipher.encrypt(text, PLAYFAIR_KEY))
+    report("Playfair Cipher (decrypt)", sizes,
+           lambda text: PlayfairCipher.decrypt(text, PLAYFAIR_KEY),
+           prepare=lambda text: PlayfairCipher.encrypt(text, PLAYFAIR_KEY))
+
+def bench_copy(sizes):
+    report("Baseline: plain copy (str.encode)", sizes,
+           lambda text: text.encode('ascii'))
+
+def bench_rail_fence(sizes):
+    report("Rail Fence (20 rails, encrypt)", sizes,
+           lambda text: RailFenceCipher.encrypt(text, RAIL_FENCE_KEY))
+    report("Rail Fence (20 rails, decrypt)", sizes,
+           lambda text: RailFenceCipher.decrypt(text, RAIL_FENCE_KEY))
+
+def bench_row_transposition(sizes):
+    report("Row Transposition (7 columns, encrypt)", sizes,
+           lambda text: RowTranspositionCipher.encrypt(text, ROW_TRANSPOSITION_KEY))
+    report("Row Transposition (7 columns, decrypt)", sizes,
+           lambda text: RowTranspositionCipher.decrypt(text, ROW_TRANSPOSITION_KEY))
+
+def bench_hill(sizes):
+    report("Hill Cipher (3x3, encrypt)", sizes,
+           lambda text: HillCipher.encrypt(text, HILL_KEY))
+    report("Hill Cipher (3x3, decrypt)", sizes,
+           lambda text: HillCipher.decrypt(text, HILL_KEY),
+           prepare=lambda text: HillCipher.encrypt(text, HILL_KEY))
+
+def bench_chris_way(sizes):
+    letters = string.ascii_letters + ' '
+    report("Chris Way V1 (encrypt)", sizes,
+           lambda text: ChrisWayV1Cipher.encrypt(text), alphabet=letters)
+    report("Chris Way V1 (decrypt)", sizes,
+           lambda text: ChrisWayV1Cipher.decrypt(text),
+           prepare=ChrisWayV1Cipher.encrypt, alphabet=letters)
+    report("Chris Way V2 (encrypt)", sizes,
+           lambda text: ChrisWayV2Cipher.encrypt(text, CHRIS_WAY_KEY), alphabet=letters)
+    report("Chris Way V2 (decrypt)", sizes,
+           lambda text: ChrisWayV2Cipher.decrypt(text, CHRIS_WAY_KEY),
+           prepare=lambda text: ChrisWayV2Cipher.encrypt(text, CHRIS_WAY_KEY), alphabet=letters)
+
+def bench_parallel(sizes):
+    """One-shot call ('before') vs the chunk-parallel engine on all cores ('after')."""
+    letters = string.ascii_letters + ' '
+    for cipher, key, alphabet in ((CaesarCipher, '3', None),
+                                  (SubstitutionCipher, SUBSTITUTION_KEY, None),
+                                  (VigenereCipher, VIGENERE_KEY, None),
+                                  (ChrisWayV2Cipher, CHRIS_WAY_KEY, letters)):
+        report(f"{cipher.__name__} (chunk-parallel, {os.cpu_count()} threads)", sizes,
+               lambda text: ParallelCipher.encrypt(cipher, text, key),
+               lambda text: cipher.encrypt(text, key), alphabet=alphabet)
+
+def bench_bytes(sizes):
+    """Text cipher on ASCII bytes ('before') vs its mod 256 byte-mode variant ('after')."""
+    keys = {CaesarCipher: '3', VigenereCipher: VIGENERE_KEY, SubstitutionCipher: SUBSTITUTION_KEY,
+            RailFenceCipher: RAIL_FENCE_KEY, RowTranspositionCipher: ROW_TRANSPOSITION_KEY,
+            HillCipher: HILL_KEY}
+    for cipher, byte_cipher in BYTE_CIPHERS.items():
+        key = keys[cipher]
+        report(f"{byte_cipher.__name__} (mod 256, encrypt)", sizes,
+               lambda data: byte_cipher.encrypt(data, key),
+               lambda data: cipher.encrypt(data, key),
+               prepare=lambda text: text.encode('ascii'))
+
+def bench_alphabets(sizes):
+    """Greek text through the A-Z ciphers ('before') vs the Greek alphabet engine ('after')."""
+    greek = GREEK.letters + GREEK.lowercase + ' '
+    substitution_key = GREEK.letters[3:] + GREEK.letters[:3]
+    report("Caesar Cipher (Greek text, shift 3)", sizes,
+           lambda text: CaesarCipher.encrypt(text, '3', alphabet=GREEK),
+           lambda text: CaesarCipher.encrypt(text, '3'), alphabet=greek)
+    report("Vigenère Cipher (Greek text)", sizes,
+           lambda text: VigenereCipher.encrypt(text, 'ΚΛΕΙΔΙ', alphabet=GREEK),
+           lambda text: VigenereCipher.encrypt(text, VIGENERE_KEY), alphabet=greek)
+    report("Substitution Cipher (Greek alphabet)", sizes,
+           lambda text: SubstitutionCipher.encrypt(text, substitution_key, alphabet=GREEK), alphabet=greek)
+
+def bench_aes_backends(sizes):
+    print(f"\nAES backends ({AESBackend.describe()})")
+    print(f"  {'size':>8}  {'mode':>4}  " + "  ".join(f"{name:>14}" for name in AESBackend.available()))
+    key = bytes(range(16))
+    for size in sizes:
+        data = bytes(parse_size(size))
+        for mode in ("GCM", "CTR", "CBC"):
+            rates = []
+            for backend in AESBackend.BACKENDS.values():
+                if mode == "GCM":
+                    run = lambda: backend.gcm(key, bytes(12)).encrypt_and_digest(data)
+                elif mode == "CTR":
+                    run = lambda: backend.ctr(key, bytes(8)).encrypt(data)
+                else:
+                    run = lambda: backend.cbc_encrypt(key, bytes(16), data)
+                rates.append(measure(run, len(data)))
+            print(f"  {size:>8}  {mode:>4}  " + "  ".join(f"{rate:14.1f}" for rate in rates))
+
+def bench_aes_records(sizes, count=RECORD_COUNT, record_size=RECORD_SIZE):
+    """Many short records under one key: a loop over encrypt_bytes vs encrypt_many."""
+    print(f"\nAES records ({count:,} records of {record_size} bytes, one key)")
+    print(f"  {'mode':>4}  {'per-record loop':>16}  {'encrypt_many':>13}  {'decrypt_many':>13}  {'speedup':>8}")
+    records = [os.urandom(record_size) for _ in range(count)]
+    n_bytes = count * record_size
+    key = 'k' * 16
+    for mode in ("GCM", "CTR"):
+        loop = measure(lambda: [AESCipher.encrypt_bytes(record, key, mode) for record in records], n_bytes)
+        many = measure(lambda: AESCipher.encrypt_many(records, key, mode), n_bytes)
+        offsets, buffer = AESCipher.encrypt_many(records, key, mode)
+        unpack = measure(lambda: AESCipher.decrypt_many(offsets, buffer, key, mode), n_bytes)
+        print(f"  {mode:>4}  {loop:11.1f} MB/s  {many:8.1f} MB/s  {unpack:8.1f} MB/s  {many / loop:7.1f}x")
+
+BENCHMARKS = {
+    'copy': bench_copy,
+    'translate': bench_translate_ciphers,
+    'vigenere': bench_vigenere,
+    'playfair': bench_playfair,
+    'railfence': bench_rail_fence,
+    'rowtransposition': bench_row_transposition,
+    'hill': bench_hill,
+    'chrisway': bench_chris_way,
+    'parallel': bench_parallel,
+    'bytes': bench_bytes,
+    'alphabets': bench_alphabets,
+    'aes': bench_aes_backends,
+    'records': bench_aes_records,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="EncryptPro cipher throughput benchmarks")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="input sizes, e.g. 1K 1M 100M")
+    parser.add_argument('--only', choices=sorted(BENCHMARKS),
+                        help="run a single benchmark group")
+    args = parser.parse_args()
+
+    for name, bench in BENCHMARKS.items():
+        if args.only and name != args.only:
+            continue
+        bench(args.sizes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Out-of-core file engines for the classical ciphers that permute the whole
+message.
+
+Rail Fence, Row Transposition and the Chris Way ciphers move every
+character, so the one-shot ciphers need the full text in memory. Here the output position of every
+input byte comes from a closed form instead: the zig-zag repeats every
+2 * (rails - 1) characters and a transposition grid every len(key)
+characters, so each tile of complete cycles (or rows) maps to one
+contiguous run per rail (or column) of the output. The input is read
+through mmap and the output is written into a preallocated memory-mapped
+file, tile by tile, so memory use stays at a few tiles whatever the file
+size. Finished tiles are dropped from the process with madvise (where
+available), so the resident set stays bounded too, not just the heap.
+The output equals the one-shot cipher on the same (ASCII) bytes.
+
+The Chris Way ciphers shift by position and then reverse the whole text.
+Their input is read from the end in blocks: each block is shifted by the
+original index of its first letter, reversed and appended to the output,
+so the output is written sequentially.
+"""
+import mmap
+import os
+
+import numpy as np
+
+from algorithms import (RailFenceCipher, RowTranspositionCipher, ChrisWayV1Cipher, ChrisWayV2Cipher,
+                        _ASCII_SPACES, _shift_by_schedule)
+
+# Input bytes per tile
+TILE_SIZE = 16 << 20
+# Byte classes for the Chris Way input check: letter, whitespace, anything else
+_LETTER, _SPACE, _OTHER = 0, 1, 2
+_BYTE_CLASS = np.full(256, _OTHER, dtype=np.uint8)
+_BYTE_CLASS[_ASCII_SPACES] = _SPACE
+_BYTE_CLASS[np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz', dtype=np.uint8)] = _LETTER
+
+
+class ClassicalFileCipher:
+    CIPHERS = (RailFenceCipher, RowTranspositionCipher, ChrisWayV1Cipher, ChrisWayV2Cipher)
+
+    @staticmethod
+    def supports(cipher):
+        return cipher in ClassicalFileCipher.CIPHERS
+
+    @staticmethod
+    def count_letters(data, tile_size=TILE_SIZE):
+        """
+        Number of ASCII letters in bytes-like data that holds only letters and
+        whitespace, or None as soon as a tile contains any other byte.
+
+        Each tile is looked up in the 256-entry class table, so a large
+        mapped file is checked with one small temporary per tile.
+        """
+        codes = np.frombuffer(data, dtype=np.uint8)
+        letters = 0
+        for start in range(0, len(codes), tile_size):
+            classes = _BYTE_CLASS[codes[start:start + tile_size]]
+            if classes.max() > _SPACE:
+                return None
+            letters += len(classes) - int(np.count_nonzero(classes))
+        return letters
+
+    @staticmethod
+    def encrypt_file(cipher, in_path, out_path, key, tile_size=TILE_SIZE):
+        """
+        Encrypt an ASCII text file of any size with bounded memory.
+
+        Args:
+            cipher: one of ClassicalFileCipher.CIPHERS
+            in_path (str): file to encrypt
+            out_path (str): where to write the result
+            key: the cipher's key
+            tile_size (int): input bytes handled per step
+        """
+        ClassicalFileCipher._run(cipher, in_path, out_path, key, 1, tile_size)
+
+    @staticmethod
+    def decrypt_file(cipher, in_path, out_path, key, tile_size=TILE_SIZE):
+        """Decrypt a file written by encrypt_file (or the one-shot cipher); see encrypt_file."""
+        ClassicalFileCipher._run(cipher, in_path, out_path, key, -1, tile_size)
+
+    @staticmethod
+    def _run(cipher, in_path, out_path, key, sign, tile_size):
+        if not ClassicalFileCipher.supports(cipher):
+            raise ValueError(f"{cipher.__name__} has no out-of-core file engine.")
+        # Validates the key with the cipher's own checks and messages
+        (cipher.encrypt if sign > 0 else cipher.decrypt)(b'', key)
+        if cipher in (ChrisWayV1Cipher, ChrisWayV2Cipher):
+            ClassicalFileCipher._chris_way(cipher, in_path, out_path, key, sign, tile_size)
+            return
+        if cipher is RailFenceCipher:
+            plan = ClassicalFileCipher._rail_fence(int(key), sign, tile_size)
+        else:
+            plan = ClassicalFileCipher._row_transposition(key, sign, tile_size)
+        ClassicalFileCipher._map_files(in_path, out_path, plan)
+
+    @staticmethod
+    def _map_files(in_path, out_path, plan):
+        """
+        Run a permutation between memory-mapped files.
+
+        plan(src, release) returns (output length, work); work(src, dst, release)
+        fills the preallocated output and returns the final length (the
+        output is truncated to it) or None. work calls release(start, end,
+        output) for byte ranges of the input (or output) it is done with.
+        On error the partial output is removed.
+        """
+        in_map = out_map = None
+        try:
+            with open(in_path, 'rb') as f_in:
+                if os.fstat(f_in.fileno()).st_size:
+                    in_map = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+            src = np.frombuffer(in_map, dtype=np.uint8) if in_map is not None else np.empty(0, np.uint8)
+            out_length, work = plan(src, lambda start, end: ClassicalFileCipher._release(in_map, start, end))
+            with open(out_path, 'wb') as f_out:
+                f_out.truncate(out_length)
+            final_length = None
+            if out_length:
+                with open(out_path, 'r+b') as f_out:
+                    out_map = mmap.mmap(f_out.fileno(), 0)
+                dst = np.frombuffer(out_map, dtype=np.uint8)
+
+                def release(start, end, output=False):
+                    ClassicalFileCipher._release(out_map if output else in_map, start, end)
+
+                final_length = work(src, dst, release)
+                del dst
+                out_map.flush()
+            del src
+            if final_length is not None and final_length != out_length:
+                ClassicalFileCipher._close(out_map)
+                out_map = None
+                with open(out_path, 'r+b') as f_out:
+                    f_out.truncate(final_length)
+        except BaseException:
+            ClassicalFileCipher._close(out_map)
+            out_map = None
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            raise
+        finally:
+            ClassicalFileCipher._close(in_map)
+            ClassicalFileCipher._close(out_map)
+
+    @staticmethod
+    def _release(data, start, end):
+        """
+        Drop mapped pages in [start, end) from the process, rounded out to
+        whole pages. Both maps are shared file mappings, so written pages
+        stay in the page cache and are still written back.
+        """
+        if data is None or not hasattr(mmap, 'MADV_DONTNEED') or end <= start:
+            return
+        start -= start % mmap.PAGESIZE
+        end = min(len(data), end + (-end) % mmap.PAGESIZE)
+        data.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    @staticmethod
+    def _close(data):
+        if data is None:
+            return
+        try:
+            data.close()
+        except BufferError:
+            # A pending exception still holds a view; the map is released with it
+            pass
+
+    @staticmethod
+    def _check_ascii(codes):
+        if len(codes) and codes.max() >= 0x80:
+            raise ValueError("Byte input must be ASCII text; decode other encodings to str first.")
+
+    # ------------------------------------------------------------------
+    # Rail Fence
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _rail_columns(rails, length):
+        """
+        Columns of one zig-zag cycle that lie on each rail.
+
+        Rail 0 and the bottom rail take one column per cycle, the others
+        two (r and cycle - r). Rails that no position reaches are left out.
+        """
+        cycle = 2 * (rails - 1)
+        columns = [np.array([0])]
+        for r in range(1, min(rails - 1, length)):
+            columns.append(np.array([r, cycle - r]))
+        if rails - 1 < length:
+            columns.append(np.array([rails - 1]))
+        return cycle, columns
+
+    @staticmethod
+    def _rail_fence(rails, sign, tile_size):
+        def plan(src, release):
+            length = len(src)
+            cycle, columns = ClassicalFileCipher._rail_columns(rails, length)
+            full_rows, rest = divmod(length, cycle)
+            # Ciphertext is rail 0, rail 1, ...; each rail gets len(cols) bytes per full cycle
+            tails = [cols[cols < rest] for cols in columns]
+            counts = [full_rows * len(cols) + len(tail) for cols, tail in zip(columns, tails)]
+            offsets = np.concatenate(([0], np.cumsum(counts[:-1], dtype=np.int64))).tolist()
+            rows_per_tile = max(1, tile_size // cycle)
+
+            def work(src, dst, release):
+                plain, cipher = (src, dst) if sign > 0 else (dst, src)
+                for row0 in range(0, full_rows, rows_per_tile):
+                    row1 = min(row0 + rows_per_tile, full_rows)
+                    tile = plain[row0 * cycle:row1 * cycle].reshape(-1, cycle)
+                    if sign > 0:
+                        ClassicalFileCipher._check_ascii(tile)
+                    for cols, offset in zip(columns, offsets):
+                        width = len(cols)
+                        start, end = offset + row0 * width, offset + row1 * width
+                        run = cipher[start:end].reshape(-1, width)
+                        # One strided copy per column; 2-D fancy indexing is much slower
+                        for i, col in enumerate(cols.tolist()):
+                            if sign > 0:
+                                run[:, i] = tile[:, col]
+                            else:
+                                tile[:, col] = run[:, i]
+                        release(start, end, sign > 0)
+                    if sign < 0:
+                        ClassicalFileCipher._check_ascii(tile)
+                    release(row0 * cycle, row1 * cycle, sign < 0)
+                # The last, partial cycle
+                tail = plain[full_rows * cycle:]
+                for cols, offset, count in zip(tails, offsets, counts):
+                    run = cipher[offset + count - len(cols):offset + count]
+                    if sign > 0:
+                        run[:] = tail[cols]
+                    else:
+                        tail[cols] = run
+                ClassicalFileCipher._check_ascii(tail)
+
+            return length, work
+        return plan
+
+    # ------------------------------------------------------------------
+    # Row Transposition
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row_transposition(key, sign, tile_size):
+        order = RowTranspositionCipher._column_order(key)
+        n_cols = len(order)
+        return (ClassicalFileCipher._row_encrypt_plan if sign > 0
+                else ClassicalFileCipher._row_decrypt_plan)(order, n_cols, tile_size)
+
+    @staticmethod
+    def _row_encrypt_plan(order, n_cols, tile_size):
+        """
+        Spaces are dropped before the grid is filled, so a first pass counts
+        them to size the grid; the second pass fills whole rows tile by tile
+        and writes column order[j] of rows [r0, r1) to dst[j * n_rows + r0:].
+        """
+        def plan(src, release):
+            spaces = 0
+            for pos in range(0, len(src), tile_size):
+                tile = src[pos:pos + tile_size]
+                ClassicalFileCipher._check_ascii(tile)
+                spaces += int(np.count_nonzero(tile == ord(' ')))
+                release(pos, pos + tile_size)
+            n_rows = -(-(len(src) - spaces) // n_cols)
+
+            def write_rows(dst, rows, row0, release):
+                for j, col in enumerate(order):
+                    start = j * n_rows + row0
+                    dst[start:start + len(rows)] = rows[:, col]
+                    release(start, start + len(rows), True)
+
+            def work(src, dst, release):
+                pending = np.empty(0, dtype=np.uint8)
+                row0 = 0
+                for pos in range(0, len(src), tile_size):
+                    tile = src[pos:pos + tile_size]
+                    letters = np.concatenate((pending, tile[tile != ord(' ')]))
+                    usable = len(letters) - len(letters) % n_cols
+                    pending = letters[usable:]
+                    rows = letters[:usable].reshape(-1, n_cols)
+                    write_rows(dst, rows, row0, release)
+                    row0 += len(rows)
+                    release(pos, pos + tile_size)
+                if len(pending):
+                    last = np.full(n_cols, ord('X'), dtype=np.uint8)
+                    last[:len(pending)] = pending
+                    write_rows(dst, last.reshape(1, n_cols), row0, release)
+
+            return n_rows * n_cols, work
+        return plan
+
+    @staticmethod
+    def _row_decrypt_plan(order, n_cols, tile_size):
+        """
+        Column k of the ciphertext is src[k * n_rows:(k + 1) * n_rows] and
+        lands in grid column order[k], so rows [r0, r1) of the plaintext are
+        filled from one slice per column. Trailing 'X' padding is cut off by
+        truncating the output file.
+        """
+        def plan(src, release):
+            n_rows = len(src) // n_cols
+            rows_per_tile = max(1, tile_size // n_cols)
+
+            def work(src, dst, release):
+                for row0 in range(0, n_rows, rows_per_tile):
+                    row1 = min(row0 + rows_per_tile, n_rows)
+                    grid = dst[row0 * n_cols:row1 * n_cols].reshape(-1, n_cols)
+                    for k, col in enumerate(order):
+                        grid[:, col] = src[k * n_rows + row0:k * n_rows + row1]
+                        release(k * n_rows + row0, k * n_rows + row1)
+                    ClassicalFileCipher._check_ascii(grid)
+                    release(row0 * n_cols, row1 * n_cols, True)
+                # rstrip('X'): scan back from the end a tile at a time
+                end = len(dst)
+                while end:
+                    tile = dst[max(0, end - tile_size):end]
+                    kept = np.flatnonzero(tile != ord('X'))
+                    if len(kept):
+                        return end - len(tile) + int(kept[-1]) + 1
+                    end -= len(tile)
+                return 0
+
+            return n_rows * n_cols, work
+        return plan
+
+    # ------------------------------------------------------------------
+    # Chris Way
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _chris_way(cipher, in_path, out_path, key, sign, tile_size):
+        """
+        Shift and reverse, reading in_path backwards one tile at a time.
+
+        Encryption drops whitespace first, so a first pass counts the
+        letters: a block whose letters are followed by `written` more
+        letters starts at stripped index total - written - count. For
+        decryption, input block [start, end) becomes output positions
+        [n - end, n - start).
+        """
+        if cipher is ChrisWayV1Cipher:
+            schedule = ChrisWayV1Cipher._shift_schedule(sign)
+        else:
+            schedule = ChrisWayV2Cipher._shift_schedule(key.upper(), sign)
+        in_map = None
+        try:
+            with open(in_path, 'rb') as f_in:
+                if os.fstat(f_in.fileno()).st_size:
+                    in_map = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+            src = np.frombuffer(in_map, dtype=np.uint8) if in_map is not None else np.empty(0, np.uint8)
+            n = len(src)
+
+            def classify(block):
+                """Byte classes of block, after checking it holds only letters (and whitespace)."""
+                classes = _BYTE_CLASS[block]
+                if classes.max(initial=_LETTER) > (_SPACE if sign > 0 else _LETTER):
+                    raise ValueError("Input must contain only alphabetic characters and spaces." if sign > 0
+                                     else "Ciphertext must contain only alphabetic characters.")
+                return classes
+
+            total = n
+            if sign > 0:
+                for start in range(0, n, tile_size):
+                    total -= int(np.count_nonzero(classify(src[start:start + tile_size])))
+                    ClassicalFileCipher._release(in_map, start, start + tile_size)
+
+            with open(out_path, 'wb') as f_out:
+                written = 0
+                for end in range(n, 0, -tile_size):
+                    start = max(0, end - tile_size)
+                    letters = src[start:end]
+                    classes = classify(letters)
+                    if sign > 0:
+                        letters = letters[classes == _LETTER]
+                        position = total - written - len(letters)
+                        shifted = _shift_by_schedule(letters & 0xDF,
+                                                     np.roll(schedule, -(position % len(schedule))))[::-1]
+                    else:
+                        position = n - end
+                        shifted = _shift_by_schedule(letters[::-1],
+                                                     np.roll(schedule, -(position % len(schedule))))
+                    f_out.write(shifted.tobytes())
+                    written += len(letters)
+                    ClassicalFileCipher._release(in_map, start, end)
+            del src
+        except BaseException:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            raise
+        finally:
+            ClassicalFileCipher._close(in_map)
@@ -0,0 +1,223 @@
+import os
+
+import pytest
+
+from aes_files import SEGMENT_NONCE_SIZE, AESFileCipher
+from aes_kdf import Passphrase
+from algorithms import AESCipher, AESContainer
+
+KEY = "0123456789abcdef0123456789abcdef"
+CHUNK = 64
+OVERHEAD = SEGMENT_NONCE_SIZE + AESCipher.TAG_SIZE
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def encrypt(tmp_path, data, key=KEY, chunk_size=CHUNK):
+    plain = write(tmp_path / "plain", data)
+    sealed = str(tmp_path / "plain.enc")
+    AESFileCipher.encrypt_file(plain, sealed, key, "GCM", chunk_size)
+    return sealed
+
+
+def decrypt(path, key=KEY):
+    out = path + ".dec"
+    AESFileCipher.decrypt_file(path, out, key)
+    return read(out)
+
+
+def header_size(path):
+    with open(path, 'rb') as f:
+        AESContainer.read_header(f)
+        return f.tell()
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK + 5])
+def test_round_trip(tmp_path, size):
+    data = os.urandom(size)
+    sealed = encrypt(tmp_path, data)
+    segments = max(1, -(-size // CHUNK))
+    assert os.path.getsize(sealed) == header_size(sealed) + size + segments * OVERHEAD
+    assert AESFileCipher.plaintext_size(sealed) == size
+    assert decrypt(sealed) == data
+
+
+def test_round_trip_passphrase(tmp_path):
+    data = os.urandom(5 * CHUNK)
+    sealed = encrypt(tmp_path, data, Passphrase("correct horse", kdf="pbkdf2", cost=1000))
+    assert decrypt(sealed, "correct horse") == data
+
+
+def test_parallel_round_trip(tmp_path):
+    data = os.urandom(40 * CHUNK + 7)
+    plain = write(tmp_path / "plain", data)
+    sealed = str(tmp_path / "plain.enc")
+    AESFileCipher.encrypt_file_parallel(plain, sealed, KEY, workers=3, segment_size=4 * CHUNK,
+                                        mode="GCM", chunk_size=CHUNK)
+    assert decrypt(sealed) == data
+    out = str(tmp_path / "parallel.dec")
+    AESFileCipher.decrypt_file_parallel(sealed, out, KEY, workers=3, segment_size=4 * CHUNK)
+    assert read(out) == data
+
+
+def test_files_get_their_own_segment_keys(tmp_path):
+    data = bytes(CHUNK)
+    first = read(encrypt(tmp_path, data))
+    second = read(encrypt(tmp_path, data))
+    assert first[AESContainer.HEADER.size:] != second[AESContainer.HEADER.size:]
+    container = AESContainer.parse(first)[0]
+    assert container.flags & AESContainer.FLAG_SEGMENT_KEYS
+    key_bytes = AESCipher.context(KEY).key_bytes
+    assert AESFileCipher._segment_key(key_bytes, container) != key_bytes
+
+
+@pytest.mark.parametrize("where", ["salt", "nonce", "ciphertext", "tag", "last tag"])
+def test_tampering_is_detected(tmp_path, where):
+    data = os.urandom(3 * CHUNK + 5)
+    sealed = encrypt(tmp_path, data)
+    start = header_size(sealed)
+    offset = {"salt": AESContainer.HEADER.size,
+              "nonce": start,
+              "ciphertext": start + SEGMENT_NONCE_SIZE + 1,
+              "tag": start + SEGMENT_NONCE_SIZE + CHUNK,
+              "last tag": os.path.getsize(sealed) - 1}[where]
+    blob = bytearray(read(sealed))
+    blob[offset] ^= 0x01
+    write(sealed, bytes(blob))
+    with pytest.raises(ValueError):
+        decrypt(sealed)
+    assert not os.path.exists(sealed + ".dec")
+
+
+def test_swapped_segments_are_detected(tmp_path):
+    sealed = encrypt(tmp_path, os.urandom(3 * CHUNK))
+    start, stored = header_size(sealed), CHUNK + OVERHEAD
+    blob = read(sealed)
+    first, second = blob[start:start + stored], blob[start + stored:start + 2 * stored]
+    write(sealed, blob[:start] + second + first + blob[start + 2 * stored:])
+    with pytest.raises(ValueError):
+        decrypt(sealed)
+
+
+def test_truncation_at_segment_boundary(tmp_path):
+    sealed = encrypt(tmp_path, os.urandom(3 * CHUNK))
+    blob = read(sealed)
+    # Dropping the final segment leaves a file of whole segments whose last one is not final
+    write(sealed, blob[:-(CHUNK + OVERHEAD)])
+    with pytest.raises(ValueError):
+        decrypt(sealed)
+    with pytest.raises(ValueError):
+        AESFileCipher.decrypt_range(sealed, KEY, CHUNK, 10)
+
+
+@pytest.mark.parametrize("offset, length", [(0, 10), (CHUNK - 3, 6), (CHUNK, CHUNK),
+                                            (10, 3 * CHUNK), (3 * CHUNK, 100), (500, 1)])
+def test_range_reads(tmp_path, offset, length):
+    data = os.urandom(3 * CHUNK + 5)
+    sealed = encrypt(tmp_path, data)
+    assert AESFileCipher.decrypt_range(sealed, KEY, offset, length) == data[offset:offset + length]
+
+
+def test_other_container_versions_are_rejected(tmp_path):
+    sealed = encrypt(tmp_path, os.urandom(CHUNK))
+    blob = bytearray(read(sealed))
+    for version in (1, AESContainer.VERSION + 1):
+        blob[4] = version
+        write(sealed, bytes(blob))
+        with pytest.raises(ValueError):
+            decrypt(sealed)
+        with pytest.raises(ValueError):
+            AESContainer.parse(blob)
+
+
+def test_chunked_header_without_segment_keys_is_rejected(tmp_path):
+    sealed = encrypt(tmp_path, os.urandom(CHUNK))
+    blob = bytearray(read(sealed))
+    blob[6] &= ~AESContainer.FLAG_SEGMENT_KEYS
+    write(sealed, bytes(blob))
+    with pytest.raises(ValueError):
+        decrypt(sealed)
+    with pytest.raises(ValueError):
+        AESContainer.parse(blob)
+
+
+def test_append(tmp_path):
+    data = os.urandom(2 * CHUNK + 5)
+    sealed = encrypt(tmp_path, data)
+    extra = os.urandom(CHUNK + 20)
+    AESFileCipher.append(sealed, KEY, extra)
+    assert decrypt(sealed) == data + extra
+
+
+def test_append_to_copies_never_reuses_a_nonce(tmp_path):
+    data = os.urandom(CHUNK + 5)
+    sealed = encrypt(tmp_path, data)
+    copy = write(tmp_path / "copy.enc", read(sealed))
+    AESFileCipher.append(sealed, KEY, b'a' * 10)
+    AESFileCipher.append(copy, KEY, b'b' * 10)
+    start, stored = header_size(sealed), CHUNK + OVERHEAD
+    assert read(sealed)[start + stored:][:SEGMENT_NONCE_SIZE] != \
+        read(copy)[start + stored:][:SEGMENT_NONCE_SIZE]
+    assert decrypt(sealed) == data + b'a' * 10
+    assert decrypt(copy) == data + b'b' * 10
+
+
+def test_append_refuses_ctr_files(tmp_path):
+    plain = write(tmp_path / "plain", b'data')
+    ctr = str(tmp_path / "ctr.enc")
+    AESFileCipher.encrypt_file(plain, ctr, KEY, "CTR")
+    before = read(ctr)
+    with pytest.raises(ValueError):
+        AESFileCipher.append(ctr, KEY, b'more')
+    assert read(ctr) == before
+
+
+@pytest.mark.parametrize("field, value", [("mode", 9), ("tag_len", 0), ("tag_len", 255),
+                                          ("chunk_size", 0)])
+def test_invalid_header_fields_are_rejected(tmp_path, field, value):
+    sealed = encrypt(tmp_path, os.urandom(3 * CHUNK))
+    blob = bytearray(read(sealed))
+    offset = {"mode": 5, "tag_len": 8}.get(field)
+    if offset is None:
+        blob[9:13] = value.to_bytes(4, 'big')
+    else:
+        blob[offset] = value
+    write(sealed, bytes(blob))
+    for call in (lambda: decrypt(sealed), lambda: AESFileCipher.decrypt_range(sealed, KEY, 0, 10),
+                 lambda: AESFileCipher.plaintext_size(sealed), lambda: AESContainer.parse(blob)):
+        with pytest.raises(ValueError):
+            call()
+
+
+def test_ctr_header_with_a_tag_is_rejected(tmp_path):
+    plain = write(tmp_path / "plain", b'data')
+    ctr = str(tmp_path / "ctr.enc")
+    AESFileCipher.encrypt_file(plain, ctr, KEY, "CTR")
+    blob = bytearray(read(ctr))
+    blob[8] = AESCipher.TAG_SIZE
+    write(ctr, bytes(blob))
+    with pytest.raises(ValueError):
+        decrypt(ctr)
+
+
+def test_failed_parallel_encryption_removes_output(tmp_path, monkeypatch):
+    plain = write(tmp_path / "plain", os.urandom(40 * CHUNK))
+    sealed = str(tmp_path / "plain.enc")
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(AESFileCipher, "_segment_cipher", staticmethod(fail))
+    with pytest.raises(OSError):
+        AESFileCipher.encrypt_file_parallel(plain, sealed, KEY, segment_size=4 * CHUNK,
+                                            mode="GCM", chunk_size=CHUNK)
+    assert not os.path.exists(sealed)
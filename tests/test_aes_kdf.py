@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from aes_kdf import (MAX_COSTS, SCRYPT_MAX_MEMORY, SCRYPT_P, SCRYPT_R, KDFParams, Passphrase,
+                     PassphraseKDF, scrypt_memory)
+
+SALT = bytes(16)
+
+
+def packed(kdf_id, cost, r=SCRYPT_R, p=SCRYPT_P):
+    return KDFParams.FIELDS.pack(kdf_id, 32, len(SALT), cost, r, p) + SALT
+
+
+def test_read_round_trip():
+    params = KDFParams("scrypt", SALT, 14)
+    read = KDFParams.read(io.BytesIO(params.pack()).read)
+    assert (read.kdf, read.cost, read.r, read.p) == ("scrypt", 14, SCRYPT_R, SCRYPT_P)
+    assert read.salt == SALT
+
+
+@pytest.mark.parametrize("r, p", [(1, 1), (16, 1), (8, 2), (255, 255)])
+def test_read_rejects_other_scrypt_parameters(r, p):
+    with pytest.raises(ValueError):
+        KDFParams.read(io.BytesIO(packed(1, 14, r, p)).read)
+
+
+@pytest.mark.parametrize("kdf_id, cost", [(1, 0), (2, 0), (1, MAX_COSTS["scrypt"] + 1),
+                                          (1, 0xFFFFFFFF), (2, MAX_COSTS["pbkdf2"] + 1),
+                                          (2, 0xFFFFFFFF)])
+def test_read_rejects_costs_out_of_range(kdf_id, cost):
+    with pytest.raises(ValueError):
+        KDFParams.read(io.BytesIO(packed(kdf_id, cost)).read)
+
+
+def test_passphrase_rejects_costs_out_of_range():
+    with pytest.raises(ValueError):
+        Passphrase("secret", "pbkdf2", 0)
+    with pytest.raises(ValueError):
+        Passphrase("secret", "scrypt", MAX_COSTS["scrypt"] + 1)
+
+
+def test_max_scrypt_cost_fits_memory_limit():
+    assert scrypt_memory(MAX_COSTS["scrypt"]) <= SCRYPT_MAX_MEMORY < \
+        scrypt_memory(MAX_COSTS["scrypt"] + 1)
+
+
+@pytest.mark.parametrize("kdf", ["scrypt", "pbkdf2"])
+def test_calibrate_stays_within_ceiling(kdf):
+    assert 1 <= PassphraseKDF.calibrate(1e9, kdf) <= MAX_COSTS[kdf]
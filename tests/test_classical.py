@@ -0,0 +1,124 @@
+import hashlib
+import random
+import string
+
+import pytest
+
+from algorithms import (CaesarCipher, ChrisWayV1Cipher, ChrisWayV2Cipher, HillCipher,
+                        PlayfairCipher, RailFenceCipher, Rot13Cipher, RowTranspositionCipher,
+                        SubstitutionCipher, VigenereCipher)
+
+HILL_3X3 = "6,24,1,13,16,10,20,17,15"
+SUBSTITUTION_KEY = "QWERTYUIOPASDFGHJKLZXCVBNM"
+
+# (cipher, key, plaintext, ciphertext, decrypted ciphertext), as produced by
+# the original string-at-a-time implementations. Playfair decryption keeps
+# its X padding, Row Transposition drops spaces, Hill keeps letters only.
+VECTORS = [
+    (CaesarCipher, '3', 'Hello, World!', 'Khoor, Zruog!', 'Hello, World!'),
+    (CaesarCipher, '29', 'xyz XYZ 123', 'abc ABC 123', 'xyz XYZ 123'),
+    (Rot13Cipher, None, 'Why did the chicken cross the road?',
+     'Jul qvq gur puvpxra pebff gur ebnq?', 'Why did the chicken cross the road?'),
+    (PlayfairCipher, 'PLAYFAIR EXAMPLE', 'Hide the gold in the tree stump',
+     'BMODZBXDNABEKUDMUIXMMOUVIF', 'HIDETHEGOLDINTHETREXESTUMP'),
+    (PlayfairCipher, 'monarchy', 'BALLOON', 'IBSUPMNA', 'BALXLOON'),
+    (PlayfairCipher, 'monarchy', 'HELLO', 'CFSUPM', 'HELXLO'),
+    (PlayfairCipher, 'Jumping', 'joke', 'GVLF', 'IOKE'),
+    (RailFenceCipher, '2', 'Hello, World!', 'Hlo ol!el,Wrd', 'Hello, World!'),
+    (RailFenceCipher, '3', 'WE ARE DISCOVERED. FLEE AT ONCE',
+     'WRIVDLANEAEDSOEE.FE TOC  CR E E', 'WE ARE DISCOVERED. FLEE AT ONCE'),
+    (RailFenceCipher, '5', 'abc', 'abc', 'abc'),
+    (RowTranspositionCipher, '3 1 2', 'attack at dawn', 'tctwtkdnaaaa', 'attackatdawn'),
+    (RowTranspositionCipher, '4 3 1 2 5 6 7', 'attack postponed until two am',
+     'ttnaaptmtsuoaodwcoiXknlXpetX', 'attackpostponeduntiltwoam'),
+    (HillCipher, '3,3,2,5', 'HELP', 'HIAT', 'HELP'),
+    (HillCipher, '3,3,2,5', 'Hello', 'HIOZHN', 'HELLOX'),
+    (HillCipher, HILL_3X3, 'act', 'POH', 'ACT'),
+    (HillCipher, HILL_3X3, 'Attack at dawn!', 'HAKGCCRWEVOX', 'ATTACKATDAWN'),
+    (HillCipher, HILL_3X3, 'go', 'FMB', 'GOX'),
+    (SubstitutionCipher, SUBSTITUTION_KEY, 'Hello, World!', 'Itssg, Vgksr!', 'Hello, World!'),
+    (VigenereCipher, 'LEMON', 'Attack at Dawn!', 'Lxfopv ef Rnhr!', 'Attack at Dawn!'),
+    (VigenereCipher, 'key', 'The quick brown fox, 1 lazy dog.',
+     'Dlc aygmo zbsux jmh, 1 pyjc byk.', 'The quick brown fox, 1 lazy dog.'),
+    (ChrisWayV1Cipher, None, 'Hello World', 'PBBAEWRPIH', 'HELLOWORLD'),
+    (ChrisWayV1Cipher, None, 'abc', 'GFA', 'ABC'),
+    (ChrisWayV2Cipher, 'SECRET', 'Hello World', 'DVCMUWFPJZ', 'HELLOWORLD'),
+    (ChrisWayV2Cipher, 'abc', 'meet me at noon', 'AZXXBGLRWIGM', 'MEETMEATNOON'),
+]
+
+PRINTABLE = string.ascii_letters + string.digits + " .,;!?'-\n\t"
+LETTERS = string.ascii_letters + "  "
+
+# SHA-256 of the original implementations' output for text(alphabet)
+DIGESTS = [
+    (CaesarCipher, '7', PRINTABLE,
+     '82d7fccc3e7289743b6f54ff702f989d3b5abfe8b124e6b3f1a5b67a18774cc4'),
+    (Rot13Cipher, None, PRINTABLE,
+     'd52d3fa1bb0a342533a5ac76f91bf9ce9a8caa1f4db37e905bf59df876f17a57'),
+    (PlayfairCipher, 'monarchy', PRINTABLE,
+     'c30a988d6d4d291f1858ca93e9a565187e234355ae4f3683600f812b6cd11cbe'),
+    (RailFenceCipher, '7', PRINTABLE,
+     '37add6b6dd92193677ee4b314d08c220bf5e59bd277e05a82b7078a7003d0bdc'),
+    (RowTranspositionCipher, '4 3 1 2 5', PRINTABLE,
+     '58a381109c9fe28b3e1f52f29719b5689e24bedc19be561d9d9615f40097aabf'),
+    (HillCipher, HILL_3X3, PRINTABLE,
+     'ecdfd22fcc2f58a3a085e6fd0687842cb3407b3e446e00493d46aba17eefc880'),
+    (SubstitutionCipher, SUBSTITUTION_KEY, PRINTABLE,
+     '74b41dbb8f172b5ed9e39c738fb50e3a530f07e998a07b7cd8e46eb95854e731'),
+    (VigenereCipher, 'LEMON', PRINTABLE,
+     '929d528d3db6775a56376778abd0053d3e57185da0d040e4a820b903fc63559a'),
+    (ChrisWayV1Cipher, None, LETTERS,
+     '8e982b54e0133a12d334f7a3bb1e177bf4cc7a26c99b84e3689dbd6d7e1dd0c7'),
+    (ChrisWayV2Cipher, 'SECRET', LETTERS,
+     '1272ef186f79a75f67f15ad40546b0b69ef0bf48baf01bd3fa1a79fd39e337b5'),
+]
+
+CIPHERS = [(cipher, key, alphabet) for cipher, key, alphabet, _ in DIGESTS]
+
+
+def text(alphabet, size=4999, seed=2024):
+    return ''.join(random.Random(seed).choices(alphabet, k=size))
+
+
+def split(data, seed, pieces=6):
+    """data cut at random points, including empty pieces."""
+    rng = random.Random(seed)
+    cuts = sorted(rng.randrange(len(data) + 1) for _ in range(pieces - 1))
+    return [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+
+
+def name(value):
+    return getattr(value, '__name__', None)
+
+
+@pytest.mark.parametrize("cipher, key, plain, sealed, opened", VECTORS, ids=name)
+def test_known_answers(cipher, key, plain, sealed, opened):
+    assert cipher.encrypt(plain, key) == sealed
+    assert cipher.decrypt(sealed, key) == opened
+
+
+@pytest.mark.parametrize("cipher, key, alphabet, digest", DIGESTS, ids=name)
+def test_known_answer_digests(cipher, key, alphabet, digest):
+    sealed = cipher.encrypt(text(alphabet), key)
+    assert hashlib.sha256(sealed.encode('ascii')).hexdigest() == digest
+
+
+@pytest.mark.parametrize("cipher, key, plain, sealed, opened", VECTORS, ids=name)
+def test_bytes_match_str(cipher, key, plain, sealed, opened):
+    assert cipher.encrypt(plain.encode('ascii'), key) == sealed.encode('ascii')
+    assert cipher.decrypt(sealed.encode('ascii'), key) == opened.encode('ascii')
+
+
+@pytest.mark.parametrize("cipher, key, alphabet", CIPHERS, ids=name)
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 17, 1000])
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_stream_matches_one_shot(cipher, key, alphabet, size, as_bytes):
+    plain = text(alphabet, size, seed=size)
+    sealed = cipher.encrypt(plain, key)
+    opened = cipher.decrypt(sealed, key)
+    if as_bytes:
+        plain, sealed, opened = (s.encode('ascii') for s in (plain, sealed, opened))
+    empty = plain[:0]
+    for seed in range(5):
+        assert empty.join(cipher.encrypt_stream(split(plain, seed), key)) == sealed
+        assert empty.join(cipher.decrypt_stream(split(sealed, seed), key)) == opened